@@ -0,0 +1,320 @@
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import tempfile
+import multiprocessing
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape
+
+import openpyxl
+
+import main
+
+
+# Words used to build source and target text, per Unicode script
+script_words = {
+    "latin": ["account", "name", "contact", "opportunity", "amount", "stage", "close", "date", "owner", "status",
+              "région", "müller", "straße", "niño", "façade", "código", "über", "crème", "déjà", "smørrebrød"],
+    "cyrillic": ["счёт", "имя", "контакт", "сделка", "сумма", "этап", "дата", "владелец", "статус", "клиент"],
+    "greek": ["λογαριασμός", "όνομα", "επαφή", "ευκαιρία", "ποσό", "στάδιο", "ημερομηνία", "κατάσταση"],
+    "arabic": ["حساب", "اسم", "جهة", "فرصة", "مبلغ", "مرحلة", "تاريخ", "مالك", "حالة", "عميل"],
+    "hebrew": ["חשבון", "שם", "איש", "הזדמנות", "סכום", "שלב", "תאריך", "בעלים", "מצב", "לקוח"],
+    "cjk": ["取引先", "名前", "商談", "金額", "段階", "日付", "所有者", "状況", "客户", "联系人", "계정", "이름"],
+    "thai": ["บัญชี", "ชื่อ", "ผู้ติดต่อ", "โอกาส", "จำนวน", "ขั้นตอน", "วันที่", "สถานะ"],
+}
+
+# Salesforce metadata types used to build trans-unit IDs
+id_prefixes = ["CustomField", "CustomLabel", "CustomTab", "PicklistValue", "ValidationFormula", "WebLink",
+               "RecordType", "LayoutSection", "QuickAction", "ButtonOrLink"]
+
+# Operations that can be benchmarked, in the order they are run
+benchmark_operations = ["xliff_to_excel", "excel_to_xliff", "compare_xliffs", "feedback", "create_package"]
+
+
+# Function to build a random text of roughly text_length characters from the words of the given scripts
+def random_text(rng, scripts, text_length):
+    words = script_words[rng.choice(scripts)]
+    parts = []
+    length = 0
+    while length < text_length:
+        word = rng.choice(words)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts).capitalize()
+
+
+# Function to write one trans-unit in the layout of a Salesforce export; an empty target is written as <target/>
+def write_trans_unit(f, unit_id, max_width, elements):
+    unit_id = escape(unit_id, {'"': "&quot;"})
+    f.write(f'            <trans-unit id="{unit_id}" maxwidth="{max_width}" size-unit="char">\n')
+    for tag, text in elements:
+        if text:
+            f.write(f"                <{tag}>{escape(text)}</{tag}>\n")
+        else:
+            f.write(f"                <{tag}/>\n")
+    f.write("            </trans-unit>\n")
+
+
+# Function to generate a deterministic Salesforce-style XLIFF file.
+# The XML is written directly rather than through main.XliffWriter, so the inputs don't change with the code
+# being measured.
+# variant > 0 produces a later "version" of the same file: some sources and targets change,
+# and some units are removed or added, which is what compare_xliffs has to detect.
+def generate_xliff(path, units, target_language="fr", text_length=30, note_ratio=0.3, empty_ratio=0.1,
+                   scripts=("latin",), seed=1, variant=0):
+    rng = random.Random(seed)
+    variant_rng = random.Random(seed * 1000 + variant)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<xliff version="1.2">\n')
+        f.write(f'    <file original="Salesforce" source-language="en_US" target-language="{target_language}" '
+                f'translation-type="metadata" datatype="xml">\n')
+        f.write("        <body>\n")
+        for index in range(units):
+            prefix = id_prefixes[index % len(id_prefixes)]
+            unit_id = f"{prefix}.Object{index // 50}.Item{index}"
+            max_width = rng.choice(["40", "80", "255", "765"])
+            source = random_text(rng, ("latin",), text_length)
+            target = "" if rng.random() < empty_ratio else random_text(rng, scripts, text_length)
+            note = random_text(rng, ("latin",), text_length // 2) if rng.random() < note_ratio else ""
+
+            if variant:
+                change = variant_rng.random()
+                if change < 0.02:
+                    continue  # Removed in the new version
+                if change < 0.07:
+                    source = random_text(variant_rng, ("latin",), text_length)
+                elif change < 0.12:
+                    target = random_text(variant_rng, scripts, text_length)
+
+            elements = [("source", source), ("target", target)]
+            if note:
+                elements.append(("note", note))
+            write_trans_unit(f, unit_id, max_width, elements)
+
+            if variant and variant_rng.random() < 0.02:
+                write_trans_unit(f, f"{unit_id}.Added{variant}", max_width,
+                                 [("source", random_text(variant_rng, ("latin",), text_length)), ("target", "")])
+        f.write("        </body>\n    </file>\n</xliff>\n")
+    return path
+
+
+# Function to generate a deterministic workbook with one sheet per language in the excel_headers layout
+def generate_workbook(path, units_per_sheet, languages=("fr", "de", "ja"), text_length=30, note_ratio=0.3,
+                      empty_ratio=0.1, seed=1):
+    wb = openpyxl.Workbook(write_only=True)
+    for sheet_index, language in enumerate(languages):
+        rng = random.Random(seed + sheet_index)
+        scripts = ("cjk",) if language in ("ja", "zh_CN", "ko") else ("latin",)
+        ws = wb.create_sheet(language)
+        ws.append(main.excel_headers)
+        for index in range(units_per_sheet):
+            ws.append([
+                f"{id_prefixes[index % len(id_prefixes)]}.Object{index // 50}.Item{index}",
+                rng.choice([40, 80, 255]),
+                "char",
+                random_text(rng, ("latin",), text_length),
+                random_text(rng, scripts, text_length) if rng.random() > empty_ratio else None,
+                random_text(rng, ("latin",), text_length // 2) if rng.random() < note_ratio else None,
+            ])
+    wb.save(path)
+    return path
+
+
+# Function to generate a deterministic set of <Object>-<language>.objectTranslation files
+def generate_object_translations(folder, objects, languages=("fr", "de", "ja", "es"), fields_per_object=20,
+                                 seed=1):
+    os.makedirs(folder, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for object_index in range(objects):
+        object_name = f"Object{object_index}__c"
+        for language in languages:
+            path = os.path.join(folder, f"{object_name}-{language}.objectTranslation")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                        '<CustomObjectTranslation xmlns="http://soap.sforce.com/2006/04/metadata">\n')
+                f.write(f"    <caseValues>\n        <plural>false</plural>\n"
+                        f"        <value>{random_text(rng, ('latin',), 15)}</value>\n    </caseValues>\n")
+                for field_index in range(fields_per_object):
+                    f.write(f"    <fields>\n        <help>{random_text(rng, ('latin',), 60)}</help>\n"
+                            f"        <label>{random_text(rng, ('latin',), 15)}</label>\n"
+                            f"        <name>Field{field_index}__c</name>\n    </fields>\n")
+                f.write("    <layouts>\n        <layout>Layout</layout>\n        <sections>\n"
+                        "            <label>Information</label>\n            <section>Information</section>\n"
+                        "        </sections>\n    </layouts>\n")
+                f.write(f"    <nameFieldLabel>{random_text(rng, ('latin',), 15)}</nameFieldLabel>\n")
+                f.write("    <validationRules>\n        <errorMessage>Required</errorMessage>\n"
+                        "        <name>Rule1</name>\n    </validationRules>\n")
+                f.write("    <webLinks>\n        <label>Link</label>\n        <name>Link1</name>\n    </webLinks>\n")
+                f.write("    <fieldSets>\n        <label>Set</label>\n        <name>Set1</name>\n    </fieldSets>\n")
+                f.write("    <startsWith>Consonant</startsWith>\n</CustomObjectTranslation>\n")
+            paths.append(path)
+    return paths
+
+
+# Function to create (or reuse) the generated inputs for one operation and size.
+# The folder name includes the generator settings, so inputs made with other settings are never reused.
+def prepare_inputs(operation, units, work_dir, scripts, text_length=30, note_ratio=0.3, empty_ratio=0.1):
+    folder = os.path.join(work_dir, f"{operation}_{units}_{'-'.join(scripts)}_{text_length}_{note_ratio}_{empty_ratio}")
+    os.makedirs(folder, exist_ok=True)
+    options = {"text_length": text_length, "note_ratio": note_ratio, "empty_ratio": empty_ratio}
+
+    def cached(name, generate):
+        path = os.path.join(folder, name)
+        if not os.path.exists(path):
+            logging.info(f"Generating {path}...")
+            generate(path)
+        return path
+
+    if operation == "xliff_to_excel":
+        return {"xliff": cached("fr.xlf", lambda path: generate_xliff(path, units, scripts=scripts, **options))}
+    if operation == "excel_to_xliff":
+        return {"workbook": cached("workbook.xlsx", lambda path: generate_workbook(path, units, ("fr",), **options))}
+    if operation == "compare_xliffs":
+        return {"old": cached("old.xlf", lambda path: generate_xliff(path, units, scripts=scripts, **options)),
+                "new": cached("new.xlf", lambda path: generate_xliff(path, units, scripts=scripts, variant=1,
+                                                                     **options))}
+    if operation == "feedback":
+        return {"source": cached("fr.xlf", lambda path: generate_xliff(path, units, scripts=scripts, **options)),
+                "english": cached("en_US.xlf", lambda path: generate_xliff(path, units, "en_US", seed=2,
+                                                                           **options))}
+    if operation == "create_package":
+        # One .objectTranslation file holds 20 fields, so "units" counts fields across all files
+        objects = max(1, units // (20 * 4))
+        object_folder = os.path.join(folder, "objectTranslations")
+        if not os.path.isdir(object_folder):
+            generate_object_translations(object_folder, objects)
+        return {"files": sorted(os.path.join(object_folder, name) for name in os.listdir(object_folder))}
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+# Function to run one operation on prepared inputs; returns the number of units processed
+def run_operation(operation, inputs, output_folder):
+    if operation == "xliff_to_excel":
+        wb, _ = main.xliff_to_excel(inputs["xliff"], write_only=True)
+        wb.save(os.path.join(output_folder, "output.xlsx"))
+        return None
+    if operation == "excel_to_xliff":
+        main.convert_excel_sheet(inputs["workbook"], "fr", output_folder)
+        return None
+    if operation == "compare_xliffs":
+        counts = main.compare_xliff_files(inputs["old"], inputs["new"], os.path.join(output_folder, "compare.xlsx"))
+        return sum(counts.values())
+    if operation == "feedback":
+        main.create_feedback_file(inputs["source"], os.path.join(output_folder, "feedback.xlsx"), inputs["english"])
+        return None
+    if operation == "create_package":
+        main.build_deployment_packages(inputs["files"], output_folder)
+        return None
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+# Function run in a fresh process, so peak RSS and wall time belong to this one measurement
+def measure_operation(operation, inputs, units, connection):
+    logging.getLogger().setLevel(logging.WARNING)
+    try:
+        with tempfile.TemporaryDirectory() as output_folder:
+            start = time.perf_counter()
+            processed = run_operation(operation, inputs, output_folder)
+            wall_time = time.perf_counter() - start
+        processed = processed or units
+        connection.send({
+            "operation": operation,
+            "units": processed,
+            "wall_time": round(wall_time, 4),
+            "units_per_second": round(processed / wall_time, 1) if wall_time else None,
+            "peak_rss_mb": round(main.peak_rss_mb(), 1) if main.peak_rss_mb() is not None else None,
+        })
+    except Exception as e:
+        connection.send({"operation": operation, "units": units, "error": str(e)})
+    finally:
+        connection.close()
+
+
+# Function to run the benchmark matrix and collect the results
+def run_benchmarks(operations, sizes, work_dir, scripts, repeat=1, **generator_options):
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for units in sizes:
+        for operation in operations:
+            inputs = prepare_inputs(operation, units, work_dir, scripts, **generator_options)
+            for run in range(repeat):
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(target=measure_operation, args=(operation, inputs, units, sender))
+                process.start()
+                sender.close()
+                result = receiver.recv()
+                process.join()
+                result["size"] = units
+                result["run"] = run + 1
+                results.append(result)
+                print(format_result(result), flush=True)
+    return results
+
+
+# Function to format one result as a line of the console table
+def format_result(result):
+    if "error" in result:
+        return f"{result['operation']:<16} {result['size']:>9} units  ERROR: {result['error']}"
+    rss = f"{result['peak_rss_mb']:>8.1f} MB" if result["peak_rss_mb"] is not None else "     n/a"
+    return (f"{result['operation']:<16} {result['size']:>9} units  {result['wall_time']:>9.3f} s  "
+            f"{result['units_per_second']:>11.0f} units/s  {rss}")
+
+
+def main_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the XLIFF/Excel conversions on generated inputs.")
+    parser.add_argument("--operations", default=",".join(benchmark_operations),
+                        help=f"Comma-separated operations to run (default: {','.join(benchmark_operations)})")
+    parser.add_argument("--sizes", default="1000,100000,1000000",
+                        help="Comma-separated unit counts (default: 1000,100000,1000000)")
+    parser.add_argument("--scripts", default="latin",
+                        help=f"Comma-separated scripts for target text ({','.join(script_words)})")
+    parser.add_argument("--text-length", type=int, default=30,
+                        help="Approximate length of the generated source and target texts (default: 30)")
+    parser.add_argument("--note-ratio", type=float, default=0.3,
+                        help="Share of the generated units that have a note (default: 0.3)")
+    parser.add_argument("--empty-ratio", type=float, default=0.1,
+                        help="Share of the generated units with an empty target (default: 0.1)")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of runs per operation and size")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "export_xlf_benchmark"),
+                        help="Folder for the generated inputs, reused between runs")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="JSON file to write the results to")
+    args = parser.parse_args(argv)
+
+    operations = [operation.strip() for operation in args.operations.split(",") if operation.strip()]
+    unknown = set(operations) - set(benchmark_operations)
+    if unknown:
+        parser.error(f"Unknown operations: {', '.join(sorted(unknown))}")
+    sizes = [int(size) for size in args.sizes.split(",")]
+    scripts = tuple(script.strip() for script in args.scripts.split(","))
+    unknown = set(scripts) - set(script_words)
+    if unknown:
+        parser.error(f"Unknown scripts: {', '.join(sorted(unknown))}")
+    for name in ("note_ratio", "empty_ratio"):
+        if not 0 <= getattr(args, name) <= 1:
+            parser.error(f"--{name.replace('_', '-')} must be between 0 and 1")
+
+    results = run_benchmarks(operations, sizes, args.work_dir, scripts, args.repeat, text_length=args.text_length,
+                             note_ratio=args.note_ratio, empty_ratio=args.empty_ratio)
+
+    report = {
+        "version": main.version,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved at {args.output}")
+    return 1 if any("error" in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
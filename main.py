@@ -1,175 +1,1722 @@
 import os
 import openpyxl
 from xml.etree import ElementTree as ET
-from xml.dom import minidom
-from tkinter import filedialog, messagebox
-import tkinter as tk
+from xml.parsers import expat
 import logging
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
+from openpyxl.cell import WriteOnlyCell
 import re
 import zipfile
+import io
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import queue
+import threading
+import signal
+import argparse
+import glob
+import sys
+import hashlib
+import sqlite3
+import time
+import json
+import csv
+import pickle
+import zlib
+import difflib
+import tempfile
+from collections import OrderedDict, deque
+from itertools import islice
+from contextlib import contextmanager, nullcontext
+import functools
+import tracemalloc
+import cProfile
+import pstats
 
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Tkinter is imported inside the GUI functions only, so the command line interface starts fast
+# and works on machines without a display.
+
 # Global variable for output file path
 output_file_path = None
 target_language = None
 version = "Version 1.2"
 
+# Default location of the local translation memory store
+translation_memory_path = os.path.join(os.path.expanduser("~"), ".export_xlf", "translation_memory.sqlite")
+
+# Default location of the fuzzy-match index built from earlier XLIFF files
+fuzzy_index_path = os.path.join(os.path.expanduser("~"), ".export_xlf", "fuzzy_index.sqlite")
+
+# Folder of the on-disk parse cache; set it (or --parse-cache on the command line) to keep parsed XLIFF
+# files between runs. Without it, parsed files are only cached in memory for the current session.
+parse_cache_folder = os.environ.get("EXPORT_XLF_PARSE_CACHE")
+
+# Number of worker processes used for batch conversions
+batch_workers = max(1, (os.cpu_count() or 2) - 1)
+
+# Column layout shared by every XLIFF to Excel export
+excel_headers = ["ID", "Max Width", "Size Unit", "Source", "Target", "Note"]
+
+# Extra columns added to an export when empty targets get fuzzy-match suggestions
+fuzzy_match_headers = ["Fuzzy Match", "Fuzzy Score"]
+
+# Column layout of the XLIFF comparison report
+comparison_headers = ["ID", "Status", "Max Width", "Size Unit", "Old Source", "New Source", "Old Target",
+                      "New Target", "Note"]
+
+# Compact record for a single trans-unit as read from an XLIFF file
+TransUnit = namedtuple("TransUnit", ["id", "max_width", "size_unit", "source", "target", "note"])
+
+# Shared style objects, so styling a sheet doesn't create new Font/Alignment/Border objects for every cell
+thin_border = Border(left=Side(style='thin', color="D3D3D3"),
+                     right=Side(style='thin', color="D3D3D3"),
+                     top=Side(style='thin', color="D3D3D3"),
+                     bottom=Side(style='thin', color="D3D3D3"))
+header_font = Font(bold=True)
+header_fill = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
+header_alignment = Alignment(horizontal="center")
+body_alignment = Alignment(horizontal="left")
+
+# Names of the named styles registered on write-only workbooks
+header_style_name = "XLIFF Header"
+body_style_name = "XLIFF Body"
+
+
 # Function to style the Excel sheet
 def style_excel_sheet(ws):
-    header_font = Font(bold=True)
-    header_fill = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
-    thin_border = Border(left=Side(style='thin', color="D3D3D3"),
-                         right=Side(style='thin', color="D3D3D3"),
-                         top=Side(style='thin', color="D3D3D3"),
-                         bottom=Side(style='thin', color="D3D3D3"))
-
     for col in ws.columns:
         for cell in col:
             cell.border = thin_border
             if cell.row == 1:  # Apply header style
                 cell.font = header_font
                 cell.fill = header_fill
-                cell.alignment = Alignment(horizontal="center")
+                cell.alignment = header_alignment
             else:
-                cell.alignment = Alignment(horizontal="left")
+                cell.alignment = body_alignment
 
     ws.sheet_view.showGridLines = False
 
 
-# Refactored function to convert XLIFF to Excel without saving
-def xliff_to_excel(xliff_file):
-    try:
-        tree = ET.parse(xliff_file)
-        root = tree.getroot()
+# Function to create a write-only workbook with the header and body named styles registered.
+# Styles are applied while rows are appended, so there is no separate styling pass over the cells.
+def create_write_only_workbook():
+    wb = openpyxl.Workbook(write_only=True)
+    wb.add_named_style(NamedStyle(name=header_style_name, font=header_font, fill=header_fill,
+                                  border=thin_border, alignment=header_alignment))
+    wb.add_named_style(NamedStyle(name=body_style_name, border=thin_border, alignment=body_alignment))
+    return wb
+
+
+# Function to add a sheet to a write-only workbook with the same look as style_excel_sheet
+def create_write_only_sheet(wb, title):
+    ws = wb.create_sheet(title)
+    ws.sheet_view.showGridLines = False
+    return ws
+
+
+# Function to append a row of values to a write-only sheet using a shared named style
+def append_styled_row(ws, values, style_name=body_style_name):
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style_name
+        cells.append(cell)
+    ws.append(cells)
+
+
+# Function to read the peak resident set size of this process and its finished children, in MB
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)  # Windows only
+
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# Per-stage timing and memory instrumentation. Operations wrap their stages in instrumentation.stage(name) or
+# @timed_stage(name), and the inputs they stream in instrumentation.timed_iter(name, iterable), which only counts
+# the time spent producing the items. Nested stages are recorded as "outer/inner" and totalled per stage; a streamed
+# input is recorded under the stage that consumes it, and the report gives each stage's time without its children.
+# It is off unless a command line run asks for a timing report, so stages cost next to nothing by default.
+class Instrumentation:
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.stages = {}  # Stage path -> {"calls", "seconds", "cpu_seconds", "max_seconds", "peak_traced_bytes"}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def enable(self, trace_memory=False):
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    # The stages open on the current thread, as [path, peak traced bytes so far] entries
+    def open_stages(self):
+        if not hasattr(self.local, "stages"):
+            self.local.stages = []
+        return self.local.stages
+
+    def stage_path(self, name):
+        open_stages = self.open_stages()
+        return f"{open_stages[-1][0]}/{name}" if open_stages else name
+
+    def stage(self, name):
+        return self.measure(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def measure(self, name):
+        open_stages = self.open_stages()
+        entry = [self.stage_path(name), 0]
+        if self.trace_memory:
+            self.carry_peak(open_stages)
+        open_stages.append(entry)
+        start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            seconds, cpu_seconds = time.perf_counter() - start, time.process_time() - cpu_start
+            open_stages.pop()
+            peak = None
+            if self.trace_memory:
+                peak = max(entry[1], tracemalloc.get_traced_memory()[1])
+                self.carry_peak(open_stages, peak)
+            self.record(entry[0], 1, seconds, cpu_seconds, peak)
+
+    # tracemalloc has a single peak counter, so it is reset for each stage and the peak is carried to the outer one
+    @staticmethod
+    def carry_peak(open_stages, peak=0):
+        if open_stages:
+            open_stages[-1][1] = max(open_stages[-1][1], peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+    def timed_iter(self, name, iterable):
+        return self.measure_iter(name, iter(iterable)) if self.enabled else iterable
+
+    # Each item is timed as a child of the stage open when it is requested, which is the stage consuming the
+    # iterator. While an item is produced, the iterator is itself the open stage, so the inputs it streams from
+    # are recorded under it.
+    def measure_iter(self, name, iterator):
+        times = {}  # Stage path -> [seconds, cpu seconds]
+        try:
+            while True:
+                open_stages = self.open_stages()
+                entry = [self.stage_path(name), 0]
+                open_stages.append(entry)
+                start, cpu_start = time.perf_counter(), time.process_time()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    total = times.setdefault(entry[0], [0.0, 0.0])
+                    total[0] += time.perf_counter() - start
+                    total[1] += time.process_time() - cpu_start
+                    open_stages.pop()
+                    if open_stages:
+                        open_stages[-1][1] = max(open_stages[-1][1], entry[1])
+                yield item
+        finally:
+            for path, (seconds, cpu_seconds) in times.items():
+                self.record(path, 1, seconds, cpu_seconds)
+
+    def record(self, path, calls, seconds, cpu_seconds, peak_traced_bytes=None, max_seconds=None):
+        with self.lock:
+            stage = self.stages.setdefault(path, {"calls": 0, "seconds": 0.0, "cpu_seconds": 0.0, "max_seconds": 0.0,
+                                                  "peak_traced_bytes": None})
+            stage["calls"] += calls
+            stage["seconds"] += seconds
+            stage["cpu_seconds"] += cpu_seconds
+            stage["max_seconds"] = max(stage["max_seconds"], max_seconds or seconds)
+            if peak_traced_bytes is not None:
+                stage["peak_traced_bytes"] = max(stage["peak_traced_bytes"] or 0, peak_traced_bytes)
+
+    # Take the stages recorded so far, e.g. to send them from a worker process back to the parent
+    def take_stages(self):
+        with self.lock:
+            stages, self.stages = self.stages, {}
+        return stages
+
+    # Add the stages recorded in a worker process under the stage that is open in this one
+    def merge(self, stages):
+        prefix = self.stage_path("")
+        for path, stage in stages.items():
+            self.record(prefix + path, stage["calls"], stage["seconds"], stage["cpu_seconds"],
+                        stage["peak_traced_bytes"], stage["max_seconds"])
+
+    # Time of each stage without the stages nested in it
+    def self_seconds(self):
+        seconds = {path: stage["seconds"] for path, stage in self.stages.items()}
+        for path, stage in self.stages.items():
+            parent = path.rpartition("/")[0]
+            if parent in seconds:
+                seconds[parent] -= stage["seconds"]
+        return seconds
+
+    def report(self):
+        self_seconds = self.self_seconds()
+        return [{"stage": path,
+                 "calls": stage["calls"],
+                 "seconds": round(stage["seconds"], 4),
+                 "self_seconds": round(max(self_seconds[path], 0.0), 4),
+                 "cpu_seconds": round(stage["cpu_seconds"], 4),
+                 "max_seconds": round(stage["max_seconds"], 4),
+                 "peak_traced_mb": None if stage["peak_traced_bytes"] is None
+                 else round(stage["peak_traced_bytes"] / (1024 * 1024), 2)}
+                for path, stage in self.stages.items()]
+
+
+instrumentation = Instrumentation()
+
+
+# Decorator to record every call of a function as an instrumentation stage
+def timed_stage(name):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with instrumentation.stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Function to run a task in a worker process with the same instrumentation settings as the parent,
+# returning its result with the stages it recorded
+def run_instrumented_task(function, trace_memory, *args):
+    # A forked worker starts with a copy of the parent's stages, which belong to the parent
+    instrumentation.take_stages()
+    instrumentation.local.stages = []
+    instrumentation.enable(trace_memory)
+    return function(*args), instrumentation.take_stages()
+
+
+# Function to write the JSON timing report of a command line run, with the stages and the cProfile hot paths
+def write_timing_report(report_file, command, seconds, profiler=None, profile_file=None, hot_path_count=30):
+    report = {
+        "command": command,
+        "version": version,
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(time.time() - seconds)),
+        "seconds": round(seconds, 4),
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": instrumentation.report(),
+    }
+    if profiler:
+        stats = pstats.Stats(profiler)
+        if profile_file:
+            stats.dump_stats(profile_file)
+            report["profile"] = profile_file
+        hot_paths = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:hot_path_count]
+        report["hot_paths"] = [{"function": f"{file_name}:{line}({function_name})",
+                                "calls": calls,
+                                "own_seconds": round(own_seconds, 4),
+                                "cumulative_seconds": round(cumulative_seconds, 4)}
+                               for (file_name, line, function_name), (_, calls, own_seconds, cumulative_seconds, _)
+                               in hot_paths]
+
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    logging.info(f"Timing report saved at {report_file}")
+
+
+# Delimiters of the plain text table formats, by file extension
+text_table_delimiters = {".csv": ",", ".tsv": "\t"}
+
+# Extensions of the table formats that can stand in for an Excel workbook, with the excel_headers columns
+table_file_extensions = (".csv", ".tsv", ".parquet")
+
+
+# Function to import the optional pyarrow package, only needed for Parquet files
+def import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise RuntimeError("Parquet files need the optional pyarrow package (pip install pyarrow)") from None
+    return pyarrow
+
+
+# Function to stream rows to a table file picked by its extension: .csv, .tsv, .parquet or an Excel workbook.
+# CSV and TSV are written as UTF-8 with a byte order mark so Excel opens them with the right encoding;
+# Parquet columns are all stored as text, like the XLIFF attributes they come from.
+@timed_stage("save_table_rows")
+def save_table_rows(output_path, headers, rows, sheet_title="Sheet", extension=None, batch_size=50000):
+    extension = extension or os.path.splitext(output_path)[1].lower()
+    if extension in text_table_delimiters:
+        with open(output_path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f, delimiter=text_table_delimiters[extension])
+            writer.writerow(headers)
+            writer.writerows(rows)
+    elif extension == ".parquet":
+        pyarrow = import_pyarrow()
+        schema = pyarrow.schema([(header, pyarrow.string()) for header in headers])
+        with pyarrow.parquet.ParquetWriter(output_path, schema) as writer:
+            for batch in batched(rows, batch_size):
+                columns = [[None if value is None else str(value) for value in column] for column in zip(*batch)]
+                writer.write_table(pyarrow.Table.from_arrays(columns, schema=schema))
+    else:
+        wb = create_write_only_workbook()
+        ws = create_write_only_sheet(wb, sheet_title)
+        append_styled_row(ws, headers, header_style_name)
+        for row in rows:
+            append_styled_row(ws, row)
+        wb.save(output_path)
+    return output_path
+
+
+# Function to check if a file is a CSV, TSV or Parquet table instead of an Excel workbook
+def is_table_file(path):
+    return path.lower().endswith(table_file_extensions)
+
+
+# Function to get the target language of a table file from its name, the same way a sheet name is used.
+# The "Excel to xlf " prefix of the exported files is dropped, so "Excel to xlf fr.csv" is read as "fr".
+def table_file_language(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return name[len("Excel to xlf "):] if name.startswith("Excel to xlf ") else name
+
+
+# Function to check that a table file starts with the excel_headers columns; the Note column is optional
+def check_table_headers(headers, path):
+    headers = [str(header).strip() for header in headers[:len(excel_headers)]]
+    if headers != excel_headers and headers != excel_headers[:-1]:
+        raise ValueError(f"{os.path.basename(path)} must start with the columns {', '.join(excel_headers)}")
+
+
+# Function to stream the data rows of a CSV, TSV or Parquet file as tuples, like the rows of a read-only sheet.
+# Empty text cells are read as None, so the XLIFF output matches the one written for the same Excel sheet.
+def iter_table_rows(path, batch_size=50000):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".parquet":
+        pyarrow = import_pyarrow()
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        check_table_headers(parquet_file.schema_arrow.names, path)
+        for batch in parquet_file.iter_batches(batch_size):
+            yield from zip(*(column.to_pylist() for column in batch.columns))
+        return
+
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f, delimiter=text_table_delimiters[extension])
+        check_table_headers(next(reader, []), path)
+        for row in reader:
+            if row:  # Skip blank lines
+                yield tuple(value if value != "" else None for value in row)
+
+
+# Raised inside an operation when the user cancels the job it runs in
+class JobCancelled(Exception):
+    pass
+
+
+# Progress and cancellation handle for an operation running as a background job.
+# Operations call progress() as they go; it queues an event for the GUI and stops the job if it was cancelled.
+class Job:
+    report_interval = 1000  # Units between two progress events
+
+    def __init__(self):
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled()
+
+    def progress(self, done, total=None, message=""):
+        self.events.put(("progress", done, total, message))
+        self.check_cancelled()
+
+
+# Function to strip the namespace from an element tag
+def local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+# Function to read the attributes of the first <file> element without parsing the rest of the XLIFF
+def read_file_attributes(xliff_file):
+    with open(xliff_file, "rb") as f:
+        for _, elem in ET.iterparse(f, events=("start",)):
+            if local_name(elem.tag) == "file":
+                return dict(elem.attrib)
+    return {}
+
+
+# Function to stream the trans-units of an XLIFF file as compact records.
+# Each element is cleared and detached once it has been read, so memory stays flat whatever the file size.
+def iter_trans_units(xliff_file, job=None):
+    with open(xliff_file, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        unit_count = 0
+        open_elements = []
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                open_elements.append(elem)
+                continue
+
+            open_elements.pop()
+            if local_name(elem.tag) != "trans-unit":
+                continue
+
+            # Keep the text of the first child of each kind, like trans_unit.find(...) did
+            children = {}
+            for child in elem:
+                children.setdefault(local_name(child.tag), child.text)
+
+            yield TransUnit(
+                id=elem.get("id", ""),
+                max_width=elem.get("maxwidth", ""),
+                size_unit=elem.get("size-unit", ""),
+                source=children.get("source", ""),
+                target=children.get("target", ""),
+                note=children.get("note", ""),
+            )
+
+            elem.clear()
+            if open_elements:
+                open_elements[-1].remove(elem)
+
+            unit_count += 1
+            if job and unit_count % job.report_interval == 0:
+                job.progress(f.tell(), file_size, f"{unit_count} units parsed from {os.path.basename(xliff_file)}")
+
+
+# Compact column-oriented table of trans-units with an ID -> row index, shared by the operations that need
+# more than one pass over a file (diffing, joining, validation). Repeated attribute values are interned,
+# so a unit costs a few list slots instead of six openpyxl Cell objects.
+class TransUnitTable:
+    __slots__ = ("file_attributes", "ids", "max_widths", "size_units", "sources", "targets", "notes", "index",
+                 "hash_columns")
+
+    def __init__(self, file_attributes=None):
+        self.file_attributes = dict(file_attributes or {})
+        self.ids = []
+        self.max_widths = []
+        self.size_units = []
+        self.sources = []
+        self.targets = []
+        self.notes = []
+        self.index = {}  # ID -> row of its first occurrence
+        self.hash_columns = {}
+
+    @classmethod
+    def from_units(cls, units, file_attributes=None):
+        table = cls(file_attributes)
+        for unit in units:
+            table.append(unit)
+        return table
+
+    @classmethod
+    def from_xliff(cls, xliff_file, job=None):
+        return cls.from_units(iter_trans_units(xliff_file, job), read_file_attributes(xliff_file))
+
+    @classmethod
+    def from_columns(cls, file_attributes, ids, max_widths, size_units, sources, targets, notes):
+        table = cls(file_attributes)
+        table.ids, table.max_widths, table.size_units = ids, max_widths, size_units
+        table.sources, table.targets, table.notes = sources, targets, notes
+        for position, id_value in enumerate(ids):
+            table.index.setdefault(id_value, position)
+        return table
+
+    def columns(self):
+        return (self.file_attributes, self.ids, self.max_widths, self.size_units, self.sources, self.targets,
+                self.notes)
+
+    @property
+    def target_language(self):
+        return self.file_attributes.get("target-language", "translations")
+
+    def append(self, unit):
+        self.index.setdefault(unit.id, len(self.ids))
+        self.ids.append(unit.id)
+        self.max_widths.append(sys.intern(unit.max_width) if unit.max_width else unit.max_width)
+        self.size_units.append(sys.intern(unit.size_unit) if unit.size_unit else unit.size_unit)
+        self.sources.append(unit.source)
+        self.targets.append(unit.target)
+        self.notes.append(unit.note)
+        self.hash_columns.clear()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, id_value):
+        return id_value in self.index
+
+    def __iter__(self):
+        return map(TransUnit._make, zip(self.ids, self.max_widths, self.size_units, self.sources, self.targets,
+                                        self.notes))
+
+    def row(self, position):
+        return TransUnit(self.ids[position], self.max_widths[position], self.size_units[position],
+                         self.sources[position], self.targets[position], self.notes[position])
+
+    def get(self, id_value, default=None):
+        position = self.index.get(id_value)
+        return default if position is None else self.row(position)
+
+    # Content hashes of a text column ("sources" or "targets"), computed once and cached
+    def hashes(self, column):
+        if column not in self.hash_columns:
+            self.hash_columns[column] = [content_hash(text) for text in getattr(self, column)]
+        return self.hash_columns[column]
+
+    # Estimate of the memory used by the table, including the cached hash columns. The interned maxwidth and
+    # size-unit values are shared, so only their list slots are counted.
+    def estimated_bytes(self):
+        total = sys.getsizeof(self.index) + sys.getsizeof(self.max_widths) + sys.getsizeof(self.size_units)
+        for column in (self.ids, self.sources, self.targets, self.notes, *self.hash_columns.values()):
+            total += sys.getsizeof(column) + sum(map(sys.getsizeof, column))
+        return total
+
+
+# Function to compute the content hash of a whole file, read in chunks
+def file_content_hash(path, chunk_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Cache of parsed XLIFF files, so a file that is opened again in the same session isn't parsed again.
+# Tables are kept in memory in least recently used order, up to max_memory_bytes of estimated table size. Hash
+# columns that callers attach to a cached table are counted from the next time the cache is used.
+# With a folder, tables are also pickled to disk under their content hash, up to max_disk_bytes, and indexed by
+# path, size and mtime in SQLite. An unchanged file then loads without being parsed or even hashed, and a file
+# that was only touched or copied is still found by its content hash.
+# Cached tables are shared, so callers must not modify them.
+class ParseCache:
+    pickle_version = 1
+    # Worker processes turn this off: they see each file once, so keeping streamed tables only costs memory
+    remember_streams = True
+
+    def __init__(self, folder=None, max_memory_bytes=512 << 20, max_disk_bytes=4 << 30):
+        self.folder = folder
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.tables = OrderedDict()  # (path, size, mtime_ns) -> table
+        self.table_bytes = {}  # (path, size, mtime_ns) -> (hash column count, estimated table size)
+        self.memory_bytes = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def file_key(xliff_file):
+        stat = os.stat(xliff_file)
+        return os.path.realpath(xliff_file), stat.st_size, stat.st_mtime_ns
+
+    # Return the cached table of a file, or None if it has to be parsed.
+    # With remember=False, a table loaded from disk isn't added to the memory cache.
+    def get(self, xliff_file, remember=True):
+        key = self.file_key(xliff_file)
+        with self.lock:
+            self.trim()
+            table = self.tables.get(key)
+            if table is not None:
+                self.tables.move_to_end(key)
+                return table
+
+        table = self.load_from_disk(key) if self.folder else None
+        if table is not None and remember:
+            self.remember(key, table)
+        return table
+
+    # Return the table of a file, parsing it only if it isn't cached.
+    # With remember=False, as in worker processes that read each file once, the table isn't kept in memory.
+    def load(self, xliff_file, job=None, remember=True):
+        table = self.get(xliff_file, remember)
+        if table is None:
+            key = self.file_key(xliff_file)
+            table = TransUnitTable.from_xliff(xliff_file, job)
+            self.store(key, table, remember)
+        return table
+
+    # Check if a streamed file would be kept anywhere, in memory or on disk
+    def stores_streams(self):
+        return self.remember_streams or bool(self.folder)
+
+    # Stream the units of a file while building its table, and cache the table once the whole file is read.
+    # A stream that stops early, on an error or a cancelled job, caches nothing.
+    def stream(self, xliff_file, job=None):
+        key = self.file_key(xliff_file)
+        table = TransUnitTable(read_file_attributes(xliff_file))
+        for unit in iter_trans_units(xliff_file, job):
+            table.append(unit)
+            yield unit
+        self.store(key, table, self.remember_streams)
+
+    def store(self, key, table, remember=True):
+        if remember:
+            self.remember(key, table)
+        if self.folder:
+            self.save_to_disk(key, table)
+
+    def remember(self, key, table):
+        with self.lock:
+            if key in self.tables:
+                return
+            self.tables[key] = table
+            self.trim()
+
+    # Update the size of tables that got new hash columns, then drop the least recently used tables
+    # until the cache fits in max_memory_bytes. Must be called with the lock held.
+    def trim(self):
+        for key, table in self.tables.items():
+            hash_column_count, size = self.table_bytes.get(key, (None, 0))
+            if hash_column_count != len(table.hash_columns):
+                self.table_bytes[key] = (len(table.hash_columns), table.estimated_bytes())
+                self.memory_bytes += self.table_bytes[key][1] - size
+        while self.memory_bytes > self.max_memory_bytes:
+            old_key, _ = self.tables.popitem(last=False)
+            self.memory_bytes -= self.table_bytes.pop(old_key)[1]
+
+    def clear(self):
+        with self.lock:
+            self.tables.clear()
+            self.table_bytes.clear()
+            self.memory_bytes = 0
+
+    def connect(self):
+        os.makedirs(self.folder, exist_ok=True)
+        connection = sqlite3.connect(os.path.join(self.folder, "index.sqlite"), timeout=60)
+        connection.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tables (
+                content_hash TEXT PRIMARY KEY,
+                bytes INTEGER NOT NULL,
+                used REAL NOT NULL
+            );
+        """)
+        return connection
+
+    def pickle_path(self, content_hash):
+        return os.path.join(self.folder, f"{content_hash}.pickle")
+
+    # Find the content hash of a file from the index, hashing the file only if its size or mtime changed
+    def content_hash(self, connection, key):
+        path, size, mtime_ns = key
+        row = connection.execute("SELECT size, mtime_ns, content_hash FROM files WHERE path = ?", (path,)).fetchone()
+        if row and row[:2] == (size, mtime_ns):
+            return row[2]
+
+        content_hash = file_content_hash(path)
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (path, size, mtime_ns, content_hash))
+        return content_hash
+
+    def load_from_disk(self, key):
+        connection = self.connect()
+        try:
+            content_hash = self.content_hash(connection, key)
+            try:
+                with open(self.pickle_path(content_hash), "rb") as f:
+                    version, *columns = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+                return None
+            if version != self.pickle_version:
+                return None
+            with connection:
+                connection.execute("UPDATE tables SET used = ? WHERE content_hash = ?", (time.time(), content_hash))
+            return TransUnitTable.from_columns(*columns)
+        finally:
+            connection.close()
+
+    def save_to_disk(self, key, table):
+        connection = self.connect()
+        try:
+            content_hash = self.content_hash(connection, key)
+            pickle_path = self.pickle_path(content_hash)
+            temp_file_path = f"{pickle_path}.{os.getpid()}.tmp"
+            with open(temp_file_path, "wb") as f:
+                pickle.dump((self.pickle_version, *table.columns()), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file_path, pickle_path)
+
+            with connection:
+                connection.execute("INSERT OR REPLACE INTO tables VALUES (?, ?, ?)",
+                                   (content_hash, os.path.getsize(pickle_path), time.time()))
+                self.evict(connection)
+        except OSError as e:
+            logging.warning(f"Could not save the parse cache entry of {key[0]}: {e}")
+        finally:
+            connection.close()
+
+    # Delete the least recently used pickles until the store fits in max_disk_bytes
+    def evict(self, connection):
+        total_bytes = connection.execute("SELECT COALESCE(SUM(bytes), 0) FROM tables").fetchone()[0]
+        for content_hash, size in connection.execute("SELECT content_hash, bytes FROM tables ORDER BY used").fetchall():
+            if total_bytes <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(self.pickle_path(content_hash))
+            except FileNotFoundError:
+                pass
+            connection.execute("DELETE FROM tables WHERE content_hash = ?", (content_hash,))
+            connection.execute("DELETE FROM files WHERE content_hash = ?", (content_hash,))
+            total_bytes -= size
+
+
+parse_cache = ParseCache(parse_cache_folder)
+
+
+# Function to load an XLIFF file as a TransUnitTable through the parse cache.
+# Worker processes pass remember=False: they never see the file again, so keeping the table only costs memory.
+# The job is told the file is loaded either way, so a cache hit also moves the progress bar and can be cancelled.
+def load_trans_unit_table(xliff_file, job=None, remember=True):
+    table = parse_cache.load(xliff_file, job, remember)
+    if job:
+        job.progress(len(table), len(table), f"{len(table)} units loaded from {os.path.basename(xliff_file)}")
+    return table
+
+
+# Function to stream the units of a cached table with the same progress events and cancel checks as a parse
+def iter_cached_units(table, xliff_file, job=None):
+    for unit_count, unit in enumerate(table, 1):
+        if job and unit_count % job.report_interval == 0:
+            job.progress(unit_count, len(table), f"{unit_count} units read from {os.path.basename(xliff_file)}")
+        yield unit
+
+
+# Function to stream the trans-units of an XLIFF file, from the parse cache if it's already there.
+# Files that aren't cached are added once they have been read through, so a later operation on the same file
+# doesn't parse it again. Worker processes without a disk cache stream them without building a table.
+def cached_trans_units(xliff_file, job=None):
+    table = parse_cache.get(xliff_file, remember=parse_cache.remember_streams)
+    if table is not None:
+        return iter_cached_units(table, xliff_file, job)
+    return parse_cache.stream(xliff_file, job) if parse_cache.stores_streams() else iter_trans_units(xliff_file, job)
+
+
+# Function to cast a maxwidth attribute to an integer or float, or None if it's not a valid number
+def parse_max_width(max_width):
+    try:
+        return int(max_width) if max_width.isdigit() else float(max_width)
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+# Function to turn a trans-unit record into an Excel row matching excel_headers
+def trans_unit_row(unit):
+    return [unit.id, parse_max_width(unit.max_width), unit.size_unit, unit.source, unit.target, unit.note]
+
+
+# Function to compute a short content hash of a text value, used to detect changed units
+def content_hash(text):
+    return hashlib.blake2b((text or "").encode("utf-8"), digest_size=8).digest()
+
+
+# Function to split an iterable into lists of at most batch_size items
+def batched(iterable, batch_size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+# Function to check if a target is empty or still the "<>" placeholder
+def is_empty_target(target):
+    return target is None or str(target).strip() in ("", "<>")
+
+
+# Persistent local translation memory, indexed on (language, trans-unit id, source text hash).
+# Targets recorded from reviewed workbooks are marked approved and are never overwritten by unapproved ones.
+class TranslationMemory:
+    lookup_batch_size = 5000
+
+    def __init__(self, path=None):
+        self.path = path or translation_memory_path
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.path, timeout=60)
+        self.connection.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS units (
+                language TEXT NOT NULL,
+                unit_id TEXT NOT NULL,
+                source_hash BLOB NOT NULL,
+                target TEXT,
+                approved INTEGER NOT NULL DEFAULT 0,
+                updated REAL NOT NULL,
+                PRIMARY KEY (language, unit_id, source_hash)
+            ) WITHOUT ROWID;
+            CREATE TEMP TABLE IF NOT EXISTS lookup_keys (unit_id TEXT NOT NULL, source_hash BLOB NOT NULL);
+            CREATE TEMP TABLE IF NOT EXISTS pending_units (
+                language TEXT NOT NULL,
+                unit_id TEXT NOT NULL,
+                source_hash BLOB NOT NULL,
+                target TEXT,
+                approved INTEGER NOT NULL
+            );
+        """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    # Look up many (unit_id, source_hash) keys at once; returns {(unit_id, source_hash): (target, approved)}
+    def lookup(self, language, keys):
+        found = {}
+        with self.connection:
+            for batch in batched(keys, self.lookup_batch_size):
+                self.connection.execute("DELETE FROM lookup_keys")
+                self.connection.executemany("INSERT INTO lookup_keys VALUES (?, ?)", batch)
+                rows = self.connection.execute("""
+                    SELECT units.unit_id, units.source_hash, units.target, units.approved
+                    FROM lookup_keys
+                    JOIN units ON units.language = ? AND units.unit_id = lookup_keys.unit_id
+                              AND units.source_hash = lookup_keys.source_hash
+                """, (language,))
+                for unit_id, source_hash, target, approved in rows:
+                    found[(unit_id, source_hash)] = (target, bool(approved))
+        return found
+
+    # Queue (unit_id, source_hash, target) entries to be recorded by record_pending, once the export they
+    # belong to has been saved. Entries wait in a temporary table, so a large export doesn't hold them in memory.
+    def record_later(self, language, entries, approved=False):
+        with self.connection:
+            self.connection.executemany("INSERT INTO pending_units VALUES (?, ?, ?, ?, ?)",
+                                        ((language, unit_id, source_hash, target, int(approved))
+                                         for unit_id, source_hash, target in entries))
+
+    # Record all queued entries in one transaction
+    def record_pending(self):
+        with self.connection:
+            self.connection.execute("""
+                INSERT INTO units (language, unit_id, source_hash, target, approved, updated)
+                SELECT language, unit_id, source_hash, target, approved, ? FROM pending_units WHERE true
+                ON CONFLICT (language, unit_id, source_hash) DO UPDATE SET
+                    target = CASE WHEN units.approved AND NOT excluded.approved THEN units.target
+                                  ELSE excluded.target END,
+                    approved = MAX(units.approved, excluded.approved),
+                    updated = excluded.updated
+            """, (time.time(),))
+            self.connection.execute("DELETE FROM pending_units")
+
+    # Drop the queued entries of an export that failed or was cancelled
+    def discard_pending(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM pending_units")
+
+
+# Context manager around an export that uses the translation memory: the entries queued while it runs are
+# recorded when it completes and dropped when it fails, so units of an export that was never saved are
+# exported again by the next delta run
+@contextmanager
+def recording_translation_memory(translation_memory):
+    if not translation_memory:
+        yield
+        return
+    try:
+        yield
+    except BaseException:
+        translation_memory.discard_pending()
+        raise
+    translation_memory.record_pending()
+
+
+# Function to run streamed trans-units through the translation memory in batches.
+# Empty targets are pre-filled from approved translations of earlier cycles, every unit is queued to be recorded
+# once the export is saved (see recording_translation_memory), and with delta=True only units that are new or
+# changed since they were last recorded are kept.
+def apply_translation_memory(units, language, translation_memory, delta=False):
+    for batch in batched(units, TranslationMemory.lookup_batch_size):
+        keys = [(unit.id, content_hash(unit.source)) for unit in batch]
+        known = translation_memory.lookup(language, keys)
+
+        # Only write entries that are new or whose target changed
+        translation_memory.record_later(language, [key + (unit.target,) for key, unit in zip(keys, batch)
+                                                   if key not in known or known[key][0] != unit.target])
+
+        for key, unit in zip(keys, batch):
+            entry = known.get(key)
+            if entry is None:
+                yield unit
+                continue
+
+            known_target, approved = entry
+            if delta and (unit.target == known_target or (approved and is_empty_target(unit.target))):
+                continue
+            if approved and is_empty_target(unit.target):
+                unit = unit._replace(target=known_target)
+            yield unit
+
+
+# Function to pre-fill empty targets of reviewed sheet rows from the translation memory and queue
+# the reviewed targets to be recorded as approved
+def apply_translation_memory_to_rows(rows, language, translation_memory):
+    for batch in batched(rows, TranslationMemory.lookup_batch_size):
+        keys = [(str(row[0]), content_hash(str(row[3]) if row[3] is not None else "")) for row in batch]
+        known = translation_memory.lookup(language, keys)
+        translation_memory.record_later(language, [key + (row[4],) for key, row in zip(keys, batch)
+                                                   if not is_empty_target(row[4])], approved=True)
+
+        for key, row in zip(keys, batch):
+            entry = known.get(key)
+            if entry and entry[1] and is_empty_target(row[4]):
+                row = row[:4] + (entry[0],) + row[5:]
+            yield row
+
+
+# Persistent fuzzy-match index over the translated source/target pairs of earlier XLIFF files, one per language.
+# Each source is reduced to a MinHash signature of its character trigrams (one-permutation hashing, so a
+# signature costs one hash per trigram), and the signature is split into LSH bands stored as SQLite keys.
+# A lookup reads at most bucket_limit pairs per band, ranks them by the number of bands they share with the
+# query and only scores the best few, so very common labels can't make a lookup slow.
+# Files are indexed incrementally: a file whose content hash is already recorded is skipped, and pairs whose
+# source is already indexed only get their target updated.
+class FuzzyIndex:
+    signature_size = 32
+    band_rows = 4
+    bucket_limit = 100
+    candidate_limit = 10
+    batch_size = 5000
+    hash_multiplier = 0x9E3779B97F4A7C15
+
+    def __init__(self, path=None, min_score=70):
+        self.path = path or fuzzy_index_path
+        self.min_score = min_score
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.path, timeout=60)
+        self.connection.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA mmap_size = 1073741824;
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                language TEXT,
+                updated REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pairs (
+                id INTEGER PRIMARY KEY,
+                language TEXT NOT NULL,
+                source_hash BLOB NOT NULL,
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                updated REAL NOT NULL,
+                UNIQUE (language, source_hash)
+            );
+            CREATE TABLE IF NOT EXISTS bands (
+                band_key INTEGER NOT NULL,
+                pair_id INTEGER NOT NULL,
+                PRIMARY KEY (band_key, pair_id)
+            ) WITHOUT ROWID;
+            CREATE TEMP TABLE IF NOT EXISTS lookup_hashes (source_hash BLOB NOT NULL);
+        """)
+        band_lookups = " UNION ALL ".join(
+            f"SELECT * FROM (SELECT pair_id FROM bands WHERE band_key = ? LIMIT {self.bucket_limit})"
+            for _ in range(self.signature_size // self.band_rows))
+        self.lookup_sql = f"""
+            SELECT pairs.source, pairs.target
+            FROM (SELECT pair_id, COUNT(*) AS shared_bands FROM ({band_lookups})
+                  GROUP BY pair_id ORDER BY shared_bands DESC LIMIT {self.candidate_limit}) AS candidates
+            JOIN pairs ON pairs.id = candidates.pair_id AND pairs.language = ?
+        """
+        self.suggestions = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    # Compute the LSH band keys of a source text for a language, as signed 64-bit SQLite integers
+    @classmethod
+    def band_keys(cls, language, text):
+        text = f" {' '.join(text.lower().split())} "
+        size = cls.signature_size
+        bins = [None] * size
+        for position in range(max(1, len(text) - 2)):
+            value = zlib.crc32(text[position:position + 3].encode("utf-8")) * cls.hash_multiplier & 0xFFFFFFFFFFFFFFFF
+            slot, value = value % size, value // size
+            if bins[slot] is None or value < bins[slot]:
+                bins[slot] = value
+
+        # Fill each empty bin from a filled bin picked by hashing the bin number, so short texts don't end up
+        # with runs of identical bins that would make their bands far too common
+        signature = []
+        for slot in range(size):
+            attempt, filled_slot = 0, slot
+            while bins[filled_slot] is None:
+                attempt += 1
+                filled_slot = (((slot << 8 | attempt) * cls.hash_multiplier & 0xFFFFFFFFFFFFFFFF) >> 32) % size
+            signature.append(bins[filled_slot])
+
+        seed = zlib.crc32(language.encode("utf-8"))
+        keys = []
+        for band in range(0, size, cls.band_rows):
+            key = seed + band
+            for value in signature[band:band + cls.band_rows]:
+                key = ((key ^ value) * cls.hash_multiplier) & 0xFFFFFFFFFFFFFFFF
+            keys.append(key - (1 << 64) if key >= 1 << 63 else key)
+        return keys
+
+    # Add the translated units of an XLIFF file; returns the number of new pairs, or None if it was already indexed
+    def add_file(self, xliff_file, job=None):
+        path = os.path.realpath(xliff_file)
+        file_hash = file_content_hash(xliff_file)
+        known = self.connection.execute("SELECT content_hash FROM files WHERE path = ?", (path,)).fetchone()
+        if known and known[0] == file_hash:
+            return None
+
+        language = read_file_attributes(xliff_file).get("target-language", "translations")
+        added = self.add_pairs(language, ((unit.source, unit.target) for unit in cached_trans_units(xliff_file, job)
+                                          if unit.source and not is_empty_target(unit.target)))
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                                    (path, file_hash, language, time.time()))
+        self.suggestions.clear()
+        return added
+
+    # Add (source, target) pairs of a language; a source that is already indexed keeps the latest target
+    def add_pairs(self, language, pairs):
+        added = 0
+        now = time.time()
+        for batch in batched(pairs, self.batch_size):
+            targets = {content_hash(source): (source, target) for source, target in batch}
+            with self.connection:
+                self.connection.execute("DELETE FROM lookup_hashes")
+                self.connection.executemany("INSERT INTO lookup_hashes VALUES (?)", ((key,) for key in targets))
+                existing = {source_hash for source_hash, in self.connection.execute("""
+                    SELECT pairs.source_hash FROM lookup_hashes
+                    JOIN pairs ON pairs.language = ? AND pairs.source_hash = lookup_hashes.source_hash
+                """, (language,))}
+
+                self.connection.executemany(
+                    "UPDATE pairs SET target = ?, updated = ? WHERE language = ? AND source_hash = ?",
+                    ((targets[key][1], now, language, key) for key in existing))
+                bands = []
+                for source_hash, (source, target) in targets.items():
+                    if source_hash in existing:
+                        continue
+                    pair_id = self.connection.execute(
+                        "INSERT INTO pairs (language, source_hash, source, target, updated) VALUES (?, ?, ?, ?, ?)",
+                        (language, source_hash, source, target, now)).lastrowid
+                    bands.extend((key, pair_id) for key in self.band_keys(language, source))
+                    added += 1
+                self.connection.executemany("INSERT OR IGNORE INTO bands VALUES (?, ?)", bands)
+        return added
+
+    # Find the most similar indexed source of a language; returns (target, score in percent) or None.
+    # Suggestions are kept for the session, since exports repeat the same sources many times.
+    def suggest(self, language, source):
+        cache_key = (language, source)
+        if cache_key in self.suggestions:
+            return self.suggestions[cache_key]
+
+        # The query is the cached second sequence of the matcher; the cheap upper bounds skip most candidates
+        best, best_ratio = None, (self.min_score - 0.5) / 100
+        matcher = difflib.SequenceMatcher(None, b=source, autojunk=False)
+        candidates = self.connection.execute(self.lookup_sql, self.band_keys(language, source) + [language])
+        for candidate_source, candidate_target in candidates:
+            matcher.set_seq1(candidate_source)
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio and (best is None or ratio > best_ratio):
+                best, best_ratio = (candidate_target, round(ratio * 100)), ratio
+
+        if len(self.suggestions) >= 100000:
+            self.suggestions.clear()
+        self.suggestions[cache_key] = best
+        return best
+
+
+# Function to add the best fuzzy match and its score to every Excel row whose target is empty
+def apply_fuzzy_matches(rows, language, fuzzy_index):
+    for row in rows:
+        match = fuzzy_index.suggest(language, row[3]) if row[3] and is_empty_target(row[4]) else None
+        yield list(row) + list(match or (None, None))
+
+
+# Function to get the headers and rows of an export, with the fuzzy-match columns if a fuzzy index is given
+def fuzzy_match_rows(rows, language, fuzzy_index=None):
+    if not fuzzy_index:
+        return excel_headers, rows
+    return excel_headers + fuzzy_match_headers, instrumentation.timed_iter(
+        "fuzzy match", apply_fuzzy_matches(rows, language, fuzzy_index))
+
+
+# Refactored function to convert XLIFF to Excel without saving.
+# With write_only=True the workbook is streamed and styled row by row; it can only be saved, not edited.
+# With a translation memory, empty targets are pre-filled and delta=True keeps only new or changed units;
+# run it and save the workbook inside recording_translation_memory so the units are recorded once saved.
+# With a fuzzy index, the best match for each remaining empty target is added in the fuzzy_match_headers columns.
+@timed_stage("xliff_to_excel")
+def xliff_to_excel(xliff_file, write_only=False, translation_memory=None, delta=False, job=None, fuzzy_index=None):
+    try:
+        # Extract target-language value
+        target_language = read_file_attributes(xliff_file).get("target-language", "translations")
+
+        units = instrumentation.timed_iter("parse", cached_trans_units(xliff_file, job))
+        if translation_memory:
+            units = instrumentation.timed_iter("translation memory", apply_translation_memory(
+                units, target_language, translation_memory, delta))
+        headers, rows = fuzzy_match_rows(map(trans_unit_row, units), target_language, fuzzy_index)
+
+        if write_only:
+            wb = create_write_only_workbook()
+            ws = create_write_only_sheet(wb, target_language)
+            append_styled_row(ws, headers, header_style_name)
+            with instrumentation.stage("build rows"):
+                for row in rows:
+                    append_styled_row(ws, row)
+            return wb, target_language
+
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = target_language  # Set the worksheet title to the target-language
+
+        # Create headers
+        ws.append(headers)
+
+        # Add data to the sheet, one streamed trans-unit at a time
+        with instrumentation.stage("build rows"):
+            for row in rows:
+                ws.append(row)
+
+        # Apply styling to the worksheet
+        with instrumentation.stage("style sheet"):
+            style_excel_sheet(ws)
+
+        return wb, target_language
+
+    except JobCancelled:
+        raise
+    except Exception as e:
+        logging.error(f"An error occurred during the XLIFF to Excel conversion: {e}")
+        print(f"An error occurred during the XLIFF to Excel conversion: {e}")
+        raise
+
+
+# Function to convert XLIFF to a CSV, TSV or Parquet file with the same columns as the Excel export
+@timed_stage("xliff_to_table")
+def xliff_to_table(xliff_file, output_path, translation_memory=None, delta=False, job=None, extension=None,
+                   fuzzy_index=None):
+    target_language = read_file_attributes(xliff_file).get("target-language", "translations")
+    units = instrumentation.timed_iter("parse", cached_trans_units(xliff_file, job))
+    if translation_memory:
+        units = instrumentation.timed_iter("translation memory", apply_translation_memory(
+            units, target_language, translation_memory, delta))
+
+    headers, rows = fuzzy_match_rows(map(trans_unit_row, units), target_language, fuzzy_index)
+    save_table_rows(output_path, headers, rows, target_language, extension)
+    return output_path, target_language
+
+
+# Characters that are not allowed in an XML 1.0 document
+invalid_xml_chars = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+# Function to escape an attribute value the same way the old minidom pretty-print did
+def escape_xml_attribute(value):
+    if invalid_xml_chars.search(value):
+        raise ValueError(f"Value contains characters that are not allowed in XML: {value!r}")
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace("\"", "&quot;").replace(">", "&gt;")
+
+
+# Function to escape element text; line breaks are normalized like the parser in the old minidom round trip did
+def escape_xml_text(text):
+    return escape_xml_attribute(text.replace("\r\n", "\n").replace("\r", "\n"))
+
+
+# Streaming XLIFF writer. Trans-units are written to the file as they come, indented exactly like
+# minidom's toprettyxml(indent="    ") output, so files stay byte-compatible with earlier versions.
+# The output is written to a temporary file and only moved into place once it is complete.
+class XliffWriter:
+    indent = "    "
+
+    def __init__(self, output_file_path, file_attributes, xliff_version="1.2"):
+        self.output_file_path = output_file_path
+        self.file_attributes = file_attributes
+        self.xliff_version = xliff_version
+        self.unit_count = 0
+        self.temp_file_path = f"{output_file_path}.{os.getpid()}.tmp"
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.temp_file_path, "w", encoding="utf-8")
+        self.file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.file.write(f'<xliff version="{escape_xml_attribute(self.xliff_version)}">\n')
+        self.file.write(f"{self.indent}<file{self.format_attributes(self.file_attributes)}>\n")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                if self.unit_count:
+                    self.file.write(f"{self.indent * 2}</body>\n")
+                else:
+                    self.file.write(f"{self.indent * 2}<body/>\n")
+                self.file.write(f"{self.indent}</file>\n</xliff>\n")
+        finally:
+            self.file.close()
+
+        if exc_type is None:
+            os.replace(self.temp_file_path, self.output_file_path)
+        else:
+            os.remove(self.temp_file_path)
+
+    @staticmethod
+    def format_attributes(attributes):
+        return "".join(f' {name}="{escape_xml_attribute(value)}"' for name, value in attributes.items())
+
+    # Write one trans-unit; elements is a list of (tag, text) pairs for source, target and note
+    def write_trans_unit(self, attributes, elements):
+        if not self.unit_count:
+            self.file.write(f"{self.indent * 2}<body>\n")
+        self.unit_count += 1
+
+        lines = [f"{self.indent * 3}<trans-unit{self.format_attributes(attributes)}>"]
+        for tag, text in elements:
+            if text:
+                lines.append(f"{self.indent * 4}<{tag}>{escape_xml_text(text)}</{tag}>")
+            else:
+                lines.append(f"{self.indent * 4}<{tag}/>")
+        lines.append(f"{self.indent * 3}</trans-unit>\n")
+        self.file.write("\n".join(lines))
+
+
+# Function to write the data rows of one sheet to an XLIFF file
+@timed_stage("write_xliff")
+def sheet_rows_to_xliff(rows, sheet_name, output_file_path, job=None):
+    file_attributes = {
+        "original": "Salesforce",
+        "source-language": "en_US",
+        "target-language": sheet_name,
+        "translation-type": "metadata",
+        "datatype": "xml"
+    }
+
+    with XliffWriter(output_file_path, file_attributes) as writer:
+        seen_ids = set()  # To keep track of seen Ids and avoid duplicates
+        for row_count, row in enumerate(instrumentation.timed_iter("read rows", rows), 1):
+            if job and row_count % job.report_interval == 0:
+                job.progress(row_count, None, f"{row_count} rows converted from sheet {sheet_name}")
+            if len(row) < 5:
+                row = tuple(row) + (None,) * (5 - len(row))  # Read-only sheets may return short rows
+            id_value = str(row[0])  # Assuming the ID is in the first column
+            if id_value not in seen_ids:  # Check if the ID is already processed
+                seen_ids.add(id_value)  # Mark this ID as seen
+                target_text = str(row[4]) if row[4] else "<>"  # Set "<>" if Target is None or empty
+                elements = [("source", f"{str(row[3])}"), ("target", target_text)]
+                if len(row) > 5 and row[5]:
+                    elements.append(("note", f"{str(row[5])}"))
+
+                writer.write_trans_unit({"id": id_value, "maxwidth": str(row[1]), "size_unit": str(row[2])},
+                                        elements)
+
+    return writer.unit_count
+
+
+# Function to list the sheet names of a workbook; a CSV, TSV or Parquet file has one sheet named after its language
+def list_sheet_names(excel_file):
+    if is_table_file(excel_file):
+        return [table_file_language(excel_file)]
+    wb = openpyxl.load_workbook(excel_file, read_only=True)
+    sheet_names = wb.sheetnames
+    wb.close()
+    return sheet_names
+
+
+# Function to stream (sheet name, data rows) for every sheet of a workbook, opened read-only,
+# or for the single sheet of a CSV, TSV or Parquet file
+def iter_sheet_rows(excel_file):
+    if is_table_file(excel_file):
+        yield table_file_language(excel_file), iter_table_rows(excel_file)
+        return
+
+    wb = openpyxl.load_workbook(excel_file, read_only=True)
+    try:
+        for sheet_name in wb.sheetnames:
+            yield sheet_name, wb[sheet_name].iter_rows(min_row=2, values_only=True)
+    finally:
+        wb.close()
+
+
+# Function to convert Excel to XLIFF.
+# Each sheet is saved as <output_folder>/<sheet>_output.xlf, or at output_file_paths[sheet] if a folder isn't given;
+# sheets without a path are skipped.
+# CSV, TSV and Parquet files with the excel_headers columns are converted like a workbook with one sheet.
+# Reviewed targets are recorded as approved in the translation memory, if one is given.
+@timed_stage("excel_to_xliff")
+def excel_to_xliff(excel_file, output_folder=None, translation_memory=None, output_file_paths=None, job=None):
+    try:
+        for sheet_name, rows in iter_sheet_rows(excel_file):
+            if output_folder:
+                os.makedirs(output_folder, exist_ok=True)
+                output_file_path = os.path.join(output_folder, f"{sheet_name}_output.xlf")
+            else:
+                output_file_path = (output_file_paths or {}).get(sheet_name)
+
+            if not output_file_path:
+                logging.info(f"No output file for sheet {sheet_name}, skipped.")
+                print(f"No output file for sheet {sheet_name}, skipped.")
+                continue
+
+            if translation_memory:
+                rows = apply_translation_memory_to_rows(rows, sheet_name, translation_memory)
+
+            with recording_translation_memory(translation_memory):
+                sheet_rows_to_xliff(rows, sheet_name, output_file_path, job)
+            logging.info(f"File saved successfully at {output_file_path}")
+            print(f"File saved successfully at {output_file_path}")
+
+        logging.info("Conversion complete.")
+        print("Conversion complete.")
+    except JobCancelled:
+        raise
+    except Exception as e:
+        logging.error(f"An error occurred during the conversion: {e}")
+        print(f"An error occurred during the conversion: {e}")
+        raise
+
+
+# Function to convert one sheet of a workbook, opened read-only, to <output_folder>/<sheet>_output.xlf
+@timed_stage("convert_excel_sheet")
+def convert_excel_sheet(excel_file, sheet_name, output_folder, translation_memory_file=None):
+    if is_table_file(excel_file):
+        wb = None
+        rows = iter_table_rows(excel_file)
+    else:
+        with instrumentation.stage("load workbook"):
+            wb = openpyxl.load_workbook(excel_file, read_only=True)
+        rows = wb[sheet_name].iter_rows(min_row=2, values_only=True)
+    translation_memory = TranslationMemory(translation_memory_file) if translation_memory_file else None
+    try:
+        if translation_memory:
+            rows = apply_translation_memory_to_rows(rows, sheet_name, translation_memory)
+
+        output_file_path = os.path.join(output_folder, f"{sheet_name}_output.xlf")
+        with recording_translation_memory(translation_memory):
+            sheet_rows_to_xliff(rows, sheet_name, output_file_path)
+        return output_file_path
+    finally:
+        if wb:
+            wb.close()
+        if translation_memory:
+            translation_memory.close()
+
+
+# Function to convert every sheet of a workbook to XLIFF in parallel worker processes, without save dialogs
+def batch_excel_to_xliff(excel_file, output_folder, max_workers=None, job=None,
+                         translation_memory_file=None):
+    sheet_names = list_sheet_names(excel_file)
+    os.makedirs(output_folder, exist_ok=True)
+    tasks = {sheet_name: (excel_file, sheet_name, output_folder, translation_memory_file)
+             for sheet_name in sheet_names}
+    results, errors = run_in_process_pool(convert_excel_sheet, tasks, max_workers, job)
+    for output_file_path in results.values():
+        logging.info(f"File saved successfully at {output_file_path}")
+    return results, errors
+
+
+# Function to read the reviewed targets of a workbook, CSV, TSV or Parquet file as an ID -> target map.
+# The sheet named after the language is used, or the only sheet; empty and "<>" targets are left out and,
+# like excel_to_xliff, the first row of a repeated ID wins.
+def read_reviewed_targets(review_file, language=None):
+    sheet_names = list_sheet_names(review_file)
+    if language in sheet_names:
+        wanted_sheet = language
+    elif len(sheet_names) == 1:
+        wanted_sheet = sheet_names[0]
+    else:
+        raise ValueError(f"{os.path.basename(review_file)} has no sheet named '{language}'")
+
+    targets = {}
+    for sheet_name, rows in iter_sheet_rows(review_file):
+        if sheet_name != wanted_sheet:
+            continue
+        for row in rows:
+            if len(row) < 5 or row[0] is None or is_empty_target(row[4]):
+                continue
+            targets.setdefault(str(row[0]), str(row[4]))
+    return targets
+
+
+# Function to find the end of the tag that starts at position start, skipping '>' inside quoted attribute values
+def find_tag_end(data, start):
+    quote = None
+    for position in range(start + 1, len(data)):
+        char = data[position]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in b"\"'":
+            quote = char
+        elif char == ord(">"):
+            return position + 1
+    raise ValueError(f"Unterminated tag at byte {start}")
+
+
+# Streaming merge of reviewed targets into an XLIFF file. The file is parsed with expat and copied byte for byte;
+# only the content of the <target> elements whose text changed is replaced, and a <target> is added after
+# </source> for units that had none. Attributes, namespaces, notes and formatting all pass through unchanged.
+# Only the trans-unit being parsed is buffered, so memory doesn't grow with the file size.
+class XliffTargetMerger:
+    def __init__(self, targets):
+        self.targets = targets
+        self.buffer = bytearray()
+        self.buffer_start = 0  # Byte offset of buffer[0] in the file
+        self.edits = deque()  # (start, end, replacement) byte ranges of the file, in file order
+        self.encoding = "utf-8"
+        self.last_position = 0
+        self.unit = None
+        self.counts = {"updated": 0, "added": 0, "unchanged": 0}
+        self.matched_ids = set()
+
+    def raw(self, start, end=None):
+        return bytes(self.buffer[start - self.buffer_start:None if end is None else end - self.buffer_start])
+
+    def tag_end(self, start):
+        return self.buffer_start + find_tag_end(self.buffer, start - self.buffer_start)
+
+    def xml_declaration(self, version, encoding, standalone):
+        if encoding:
+            if encoding.lower().replace("_", "-").startswith("utf-16"):
+                raise ValueError("UTF-16 encoded XLIFF files can't be merged")
+            self.encoding = encoding
+
+    def start_element(self, name, attributes):
+        position = self.last_position = self.parser.CurrentByteIndex
+        tag = name.rsplit(":", 1)[-1]
+        unit = self.unit
+        if tag == "trans-unit":
+            self.unit = {"start": position, "id": attributes.get("id"), "source_start": None, "source_end": None,
+                         "prefix": name[:-len(tag)], "target": None, "depth": 0}
+        elif unit is None:
+            return
+        elif unit["depth"]:
+            unit["depth"] += 1
+            unit["target"]["children"] = True
+        elif tag == "source" and unit["source_start"] is None:
+            unit["source_start"] = position
+            unit["prefix"] = name[:-len(tag)]
+        elif tag == "target" and unit["target"] is None:
+            tag_end = self.tag_end(position)
+            unit["target"] = {"name": name, "start": position, "tag_end": tag_end, "text": [], "first_text": None,
+                              "children": False, "self_closing": self.raw(tag_end - 2, tag_end) == b"/>"}
+            unit["depth"] = 1
+
+    def end_element(self, name):
+        position = self.last_position = self.parser.CurrentByteIndex
+        unit = self.unit
+        if unit is None:
+            return
+        tag = name.rsplit(":", 1)[-1]
+        if unit["depth"]:
+            unit["depth"] -= 1
+            if not unit["depth"]:
+                unit["target"]["end"] = position
+            return
+        if tag == "source" and unit["source_end"] is None:
+            unit["source_end"] = self.tag_end(position)
+        elif tag == "trans-unit":
+            self.merge_unit(unit, position)
+            self.unit = None
+
+    def character_data(self, data):
+        unit = self.unit
+        if unit and unit["depth"]:
+            target = unit["target"]
+            if not target["children"]:
+                target["first_text"] = (target["first_text"] or "") + data
+            target["text"].append(data)
+
+    def encode(self, text):
+        return escape_xml_text(text).encode(self.encoding, "xmlcharrefreplace")
+
+    def merge_unit(self, unit, end_tag_position):
+        new_text = self.targets.get(unit["id"])
+        if new_text is None:
+            return
+        self.matched_ids.add(unit["id"])
+        new_text = new_text.replace("\r\n", "\n").replace("\r", "\n")
+        target = unit["target"]
+
+        if target is None:
+            # Add the target after </source>, indented like the <source> element and with the same namespace prefix
+            if unit["source_end"] is not None:
+                indent = self.raw(unit["start"], unit["source_start"])
+                indent = indent[len(indent.rstrip(b" \t\r\n")):]
+                insert_at = unit["source_end"]
+            else:
+                indent, insert_at = b"", end_tag_position
+            prefix = unit["prefix"].encode(self.encoding)
+            self.edits.append((insert_at, insert_at, indent + b"<" + prefix + b"target>" + self.encode(new_text)
+                               + b"</" + prefix + b"target>"))
+            self.counts["added"] += 1
+            return
+
+        # An exported target only holds the text before the first inline element, so that text counts as unchanged
+        text = "".join(target["text"])
+        if new_text == text or (target["children"] and new_text == (target["first_text"] or "")):
+            self.counts["unchanged"] += 1
+            return
+
+        if target["self_closing"]:
+            start_tag = self.raw(target["start"], target["tag_end"] - 2).rstrip() + b">"
+            end_tag = f"</{target['name']}>".encode(self.encoding)
+            self.edits.append((target["start"], target["tag_end"], start_tag + self.encode(new_text) + end_tag))
+        else:
+            self.edits.append((target["tag_end"], target["end"], self.encode(new_text)))
+        self.counts["updated"] += 1
+
+    # Write the buffered bytes up to the given file offset, applying the edits that end before it
+    def flush(self, output, up_to):
+        cursor = self.buffer_start
+        while self.edits and self.edits[0][1] <= up_to:
+            start, end, replacement = self.edits.popleft()
+            output.write(self.raw(cursor, start))
+            output.write(replacement)
+            cursor = end
+        output.write(self.raw(cursor, up_to))
+        del self.buffer[:up_to - self.buffer_start]
+        self.buffer_start = up_to
+
+    def merge(self, input_file, output, chunk_size=1 << 20, job=None):
+        self.parser = expat.ParserCreate()
+        self.parser.XmlDeclHandler = self.xml_declaration
+        self.parser.StartElementHandler = self.start_element
+        self.parser.EndElementHandler = self.end_element
+        self.parser.CharacterDataHandler = self.character_data
+        self.parser.buffer_text = True
+
+        file_size = os.fstat(input_file.fileno()).st_size
+        while True:
+            chunk = input_file.read(chunk_size)
+            self.buffer += chunk
+            self.parser.Parse(chunk, not chunk)
+            if not chunk:
+                break
+            # Everything before the unit being parsed (or the last reported tag) is final
+            self.flush(output, self.unit["start"] if self.unit else self.last_position)
+            if job:
+                job.progress(input_file.tell(), file_size, "Merging reviewed targets...")
+        self.flush(output, self.buffer_start + len(self.buffer))
+        return self.counts
 
-        # Extract target-language value
-        target_language = root.find(".//file").attrib.get("target-language", "translations")
 
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = target_language  # Set the worksheet title to the target-language
+# Function to write a copy of an XLIFF file with the given ID -> target map merged in; returns the merger
+def write_merged_xliff(xliff_file, targets, output_file_path, job=None):
+    merger = XliffTargetMerger(targets)
+    temp_file_path = f"{output_file_path}.{os.getpid()}.tmp"
+    try:
+        with open(xliff_file, "rb") as input_file, open(temp_file_path, "wb") as output:
+            merger.merge(input_file, output, job=job)
+    except BaseException:
+        os.remove(temp_file_path)
+        raise
+    os.replace(temp_file_path, output_file_path)
+    return merger
 
-        # Create headers
-        ws.append(["ID", "Max Width", "Size Unit", "Source", "Target", "Note"])
-
-        # Add data to the sheet
-        for file_element in root.findall("file"):
-            for trans_unit in file_element.find("body").findall("trans-unit"):
-                id_value = trans_unit.get("id", "")
-                max_width = trans_unit.get("maxwidth", "")
-                size_unit = trans_unit.get("size-unit", "")
-                source_text = trans_unit.find("source").text if trans_unit.find("source") is not None else ""
-                target_text = trans_unit.find("target").text if trans_unit.find("target") is not None else ""
-                note_text = trans_unit.find("note").text if trans_unit.find("note") is not None else ""
-
-                # Cast max_width to an integer or float if it's a number
-                try:
-                    max_width = int(max_width) if max_width.isdigit() else float(max_width)
-                except (ValueError, TypeError):
-                    max_width = None  # If it's not a valid number, keep it as None
 
-                ws.append([id_value, max_width, size_unit, source_text, target_text, note_text])
+# Function to merge the reviewed targets of a workbook, CSV, TSV or Parquet file into the original XLIFF file.
+# Returns the number of targets updated, added and unchanged, and the reviewed IDs that aren't in the XLIFF.
+@timed_stage("merge_reviewed_file")
+def merge_reviewed_file(xliff_file, review_file, output_file_path, sheet_name=None, job=None):
+    with instrumentation.stage("read reviewed targets"):
+        language = sheet_name or read_file_attributes(xliff_file).get("target-language")
+        targets = read_reviewed_targets(review_file, language)
 
-        # Apply styling to the worksheet
-        style_excel_sheet(ws)
+    merger = write_merged_xliff(xliff_file, targets, output_file_path, job)
+    counts = merger.counts
 
-        return wb, target_language
+    unknown_ids = [id_value for id_value in targets if id_value not in merger.matched_ids]
+    logging.info(f"Merged {os.path.basename(review_file)} into {output_file_path}: {counts['updated']} updated, "
+                 f"{counts['added']} added, {counts['unchanged']} unchanged, {len(unknown_ids)} IDs not in the XLIFF")
+    return dict(counts, unknown_ids=unknown_ids)
 
-    except Exception as e:
-        logging.error(f"An error occurred during the XLIFF to Excel conversion: {e}")
-        print(f"An error occurred during the XLIFF to Excel conversion: {e}")
-        raise
 
+# Function to select an Excel file and convert it to XLIFF
+def select_excel_to_xliff(root):
+    from tkinter import filedialog, messagebox
 
+    excel_file_path = filedialog.askopenfilename(
+        title="Select Excel File",
+        filetypes=[("Excel files", "*.xlsx;*.xls"), ("CSV, TSV and Parquet files", "*.csv;*.tsv;*.parquet")]
+    )
+    if excel_file_path:
+        logging.info("Excel file selected.")
+        print("Excel file selected.")
 
-# Function to convert Excel to XLIFF
-def excel_to_xliff(excel_file):
-    try:
-        wb = openpyxl.load_workbook(excel_file)
-        logging.info("Excel workbook loaded successfully.")
+        sheet_names = list_sheet_names(excel_file_path)
 
-        for sheet_name in wb.sheetnames:
-            sheet = wb[sheet_name]
-
-            root = ET.Element("xliff", version="1.2")
-            file_attributes = {
-                "original": "Salesforce",
-                "source-language": "en_US",
-                "target-language": sheet_name,
-                "translation-type": "metadata",
-                "datatype": "xml"
-            }
-            file_element = ET.SubElement(root, "file", **file_attributes)
-            body_element = ET.SubElement(file_element, "body")
-
-            seen_ids = set()  # To keep track of seen Ids and avoid duplicates
-            for row in sheet.iter_rows(min_row=2, values_only=True):
-                id_value = str(row[0])  # Assuming the ID is in the first column
-                if id_value not in seen_ids:  # Check if the ID is already processed
-                    seen_ids.add(id_value)  # Mark this ID as seen
-                    trans_unit_element = ET.SubElement(body_element, "trans-unit", id=id_value, maxwidth=str(row[1]),
-                                                       size_unit=str(row[2]))
-                    source_element = ET.SubElement(trans_unit_element, "source")
-                    source_element.text = f"{str(row[3])}"
-                    target_element = ET.SubElement(trans_unit_element, "target")
-                    target_text = str(row[4]) if row[4] else "<>"  # Set "<>" if Target is None or empty
-                    target_element.text = target_text
-
-                    if len(row) > 5 and row[5]:
-                        note_element = ET.SubElement(trans_unit_element, "note")
-                        note_element.text = f"{str(row[5])}"
-
-            xml_declaration = '<?xml version="1.0" encoding="UTF-8"?>\n'
-            xml_string = minidom.parseString(ET.tostring(root)).toprettyxml(indent="    ")
-            xml_string = xml_string.split('\n', 1)[1] if xml_string.startswith('<?xml') else xml_string
-
-            full_xml = xml_declaration + xml_string
+        # Workbooks with several sheets can be saved to one folder in a single batch, without a dialog per sheet
+        if len(sheet_names) > 1 and messagebox.askyesno(
+                "Multiple Sheets", f"The workbook has {len(sheet_names)} sheets. Save all of them as "
+                                   f"<sheet>_output.xlf files in one folder?"):
+            output_folder = filedialog.askdirectory(title="Select Folder for the XLIFF Files")
+            if not output_folder:
+                logging.info("No output folder selected. Exiting.")
+                return
+            run_job(root, "Converting Excel Sheets",
+                    lambda job: batch_excel_to_xliff(excel_file_path, output_folder, job=job),
+                    lambda result: show_batch_summary(result, "All sheets have been converted and saved."))
+            return
 
+        # Ask where to save each sheet here, since dialogs can only be opened from the mainloop
+        output_file_paths = {}
+        for sheet_name in sheet_names:
             output_file_path = filedialog.asksaveasfilename(
                 title="Save File As",
                 defaultextension=".xlf",
                 filetypes=[("XLIFF files", "*.xlf"), ("All Files", "*.*")],
                 initialfile=f"{sheet_name}_output.xlf"
             )
-
             if output_file_path:
-                with open(output_file_path, "w", encoding="utf-8") as f:
-                    f.write(full_xml)
-                logging.info(f"File saved successfully at {output_file_path}")
-                print(f"File saved successfully at {output_file_path}")
+                output_file_paths[sheet_name] = output_file_path
             else:
                 logging.info("File save operation was cancelled.")
                 print("File save operation was cancelled.")
+        if not output_file_paths:
+            return
 
-        logging.info("Conversion complete.")
-        print("Conversion complete.")
-    except Exception as e:
-        logging.error(f"An error occurred during the conversion: {e}")
-        print(f"An error occurred during the conversion: {e}")
-        raise
-
-
-# Function to select an Excel file and convert it to XLIFF
-def select_excel_to_xliff():
-    excel_file_path = filedialog.askopenfilename(
-        title="Select Excel File",
-        filetypes=[("Excel files", "*.xlsx;*.xls"), ]
-    )
-    if excel_file_path:
-        logging.info("Excel file selected.")
-        print("Excel file selected.")
-        excel_to_xliff(excel_file_path)
+        run_job(root, "Excel to XLIFF",
+                lambda job: excel_to_xliff(excel_file_path, output_file_paths=output_file_paths, job=job),
+                lambda result: messagebox.showinfo("Success", "The XLIFF files have been saved."))
     else:
         logging.info("No Excel file selected. Exiting.")
         print("No Excel file selected. Exiting.")
 
 
 # Function to handle single XLIFF to Excel conversion
-def select_xliff_to_excel():
+def select_xliff_to_excel(root):
+    from tkinter import filedialog
+
     xliff_file_path = filedialog.askopenfilename(
         title="Select XLIFF File",
         filetypes=[("XLIFF files", "*.xlf"), ("All Files", "*.*")]
@@ -178,38 +1725,420 @@ def select_xliff_to_excel():
         logging.info("XLIFF file selected.")
         print("XLIFF file selected.")
 
-        try:
-            wb, target_language = xliff_to_excel(xliff_file_path)
+        # Set default output file name using target-language
+        target_language = read_file_attributes(xliff_file_path).get("target-language", "translations")
+        default_output_filename = f"Excel to xlf {target_language}.xlsx"
+        output_file_path = filedialog.asksaveasfilename(
+            title="Save Excel File As",
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"), ("TSV files", "*.tsv"),
+                       ("Parquet files", "*.parquet"), ("All Files", "*.*")],
+            initialfile=default_output_filename
+        )
 
-            # Set default output file name using target-language
-            default_output_filename = f"Excel to xlf {target_language}.xlsx"
-            output_file_path = filedialog.asksaveasfilename(
-                title="Save Excel File As",
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All Files", "*.*")],
-                initialfile=default_output_filename
-            )
+        if not output_file_path:
+            logging.info("File save operation was cancelled.")
+            print("File save operation was cancelled.")
+            return
 
-            if output_file_path:
-                wb.save(output_file_path)
-                logging.info(f"XLIFF converted to Excel and saved at {output_file_path}")
-                print(f"XLIFF converted to Excel and saved at {output_file_path}")
-            else:
-                logging.info("File save operation was cancelled.")
-                print("File save operation was cancelled.")
+        def convert(job):
+            if is_table_file(output_file_path):
+                return xliff_to_table(xliff_file_path, output_file_path, job=job)[0]
+            wb, _ = xliff_to_excel(xliff_file_path, write_only=True, job=job)
+            job.progress(0, None, "Saving the Excel file...")
+            wb.save(output_file_path)
+            return output_file_path
 
-        except Exception as e:
-            logging.error(f"An error occurred during the XLIFF to Excel conversion: {e}")
-            print(f"An error occurred during the XLIFF to Excel conversion: {e}")
-            raise
+        def converted(output_file_path):
+            logging.info(f"XLIFF converted to Excel and saved at {output_file_path}")
+            print(f"XLIFF converted to Excel and saved at {output_file_path}")
+
+        run_job(root, "XLIFF to Excel", convert, converted)
 
     else:
         logging.info("No XLIFF file selected. Exiting.")
         print("No XLIFF file selected. Exiting.")
 
 
-# New function to handle multiple XLIFF to Excel conversion using the refactored function
-def multiple_xliff_to_excel():
+# Function to convert one XLIFF file and save it in the language folder of the base folder
+# The output_format "csv", "tsv" or "parquet" writes "Excel to xlf <lang>.<format>" instead of the workbook.
+@timed_stage("convert_xliff_file")
+def convert_xliff_file(xliff_file, base_folder, translation_memory_file=None, delta=False, output_format="xlsx",
+                       fuzzy_index_file=None, fuzzy_min_score=70):
+    translation_memory = TranslationMemory(translation_memory_file) if translation_memory_file else None
+    fuzzy_index = FuzzyIndex(fuzzy_index_file, fuzzy_min_score) if fuzzy_index_file else None
+    try:
+        with recording_translation_memory(translation_memory):
+            if output_format != "xlsx":
+                return save_language_table(xliff_file, base_folder, output_format, translation_memory, delta,
+                                           fuzzy_index)
+            wb, target_language = xliff_to_excel(xliff_file, True, translation_memory, delta,
+                                                 fuzzy_index=fuzzy_index)
+            return save_language_workbook(wb, target_language, base_folder)
+    finally:
+        if translation_memory:
+            translation_memory.close()
+        if fuzzy_index:
+            fuzzy_index.close()
+
+
+# Function to save a converted workbook as <base>/<target-language>/Excel to xlf <lang>.xlsx
+def save_language_workbook(wb, target_language, base_folder):
+    # Create a folder for the target language if it doesn't exist
+    folder_path = os.path.join(base_folder, target_language)
+    os.makedirs(folder_path, exist_ok=True)
+
+    # Save to a temporary name first, so two files with the same language never write the same file at once
+    output_file_path = os.path.join(folder_path, f"Excel to xlf {target_language}.xlsx")
+    temp_file_path = f"{output_file_path}.{os.getpid()}.tmp"
+    with instrumentation.stage("save workbook"):
+        wb.save(temp_file_path)
+    os.replace(temp_file_path, output_file_path)
+    return output_file_path
+
+
+# Function to convert an XLIFF file to <base>/<target-language>/Excel to xlf <lang>.<output_format>
+def save_language_table(xliff_file, base_folder, output_format, translation_memory=None, delta=False,
+                        fuzzy_index=None):
+    target_language = read_file_attributes(xliff_file).get("target-language", "translations")
+    folder_path = os.path.join(base_folder, target_language)
+    os.makedirs(folder_path, exist_ok=True)
+
+    output_file_path = os.path.join(folder_path, f"Excel to xlf {target_language}.{output_format}")
+    temp_file_path = f"{output_file_path}.{os.getpid()}.tmp"
+    xliff_to_table(xliff_file, temp_file_path, translation_memory, delta, extension=f".{output_format}",
+                   fuzzy_index=fuzzy_index)
+    os.replace(temp_file_path, output_file_path)
+    return output_file_path
+
+
+# Function to set up a worker process of a process pool
+def init_pool_worker():
+    parse_cache.remember_streams = False
+
+
+# Function to submit a task to a process pool, timed in the worker when instrumentation is enabled
+def submit_pool_task(executor, function, args):
+    if instrumentation.enabled:
+        return executor.submit(run_instrumented_task, function, instrumentation.trace_memory, *args)
+    return executor.submit(function, *args)
+
+
+# Function to get the result of a task submitted with submit_pool_task, merging the stages timed in the worker
+def pool_task_result(future):
+    if instrumentation.enabled:
+        result, stages = future.result()
+        instrumentation.merge(stages)
+        return result
+    return future.result()
+
+
+# Function to run a function over many tasks in a process pool and collect per-task results and errors.
+# tasks maps a key (usually an input path) to the argument tuple for that task.
+# With a job, a progress event is sent after each task and tasks that haven't started are dropped on cancel.
+def run_in_process_pool(function, tasks, max_workers=None, job=None):
+    results = {}
+    errors = {}
+    if not tasks:
+        return results, errors
+
+    with ProcessPoolExecutor(max_workers=min(max_workers or batch_workers, len(tasks)),
+                             initializer=init_pool_worker) as executor:
+        futures = {submit_pool_task(executor, function, args): key for key, args in tasks.items()}
+        pending = set(futures)
+        while pending:
+            finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in finished:
+                key = futures[future]
+                try:
+                    results[key] = pool_task_result(future)
+                except Exception as e:
+                    errors[key] = str(e)
+                    logging.error(f"An error occurred while processing {key}: {e}")
+                if job:
+                    done = len(results) + len(errors)
+                    job.events.put(("progress", done, len(futures),
+                                    f"{done} of {len(futures)} files done ({os.path.basename(str(key))})"))
+
+            if job and job.cancelled:
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise JobCancelled()
+
+    return results, errors
+
+
+# Function to convert many XLIFF files to Excel in parallel worker processes
+def batch_xliff_to_excel(xliff_files, base_folder, max_workers=None, job=None,
+                         translation_memory_file=None, delta=False, output_format="xlsx", fuzzy_index_file=None,
+                         fuzzy_min_score=70):
+    tasks = {xliff_file: (xliff_file, base_folder, translation_memory_file, delta, output_format, fuzzy_index_file,
+                          fuzzy_min_score)
+             for xliff_file in xliff_files}
+    results, errors = run_in_process_pool(convert_xliff_file, tasks, max_workers, job)
+    for output_file_path in results.values():
+        logging.info(f"XLIFF converted to Excel and saved at {output_file_path}")
+    return results, errors
+
+
+# Ways of splitting an XLIFF file into shards, and the default shard size of each in units or bytes
+shard_default_sizes = {"count": 50000, "bytes": 20 << 20, "prefix": None}
+
+# Suffix of the shard manifest written next to the shards, read back by reassemble_shards
+shard_manifest_suffix = "_shards.json"
+
+
+# Function to read a size such as "50000", "20M" or "1.5G"
+def parse_size(value):
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([kmg]?)b?\s*", str(value), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    return int(float(match.group(1)) * 1024 ** " kmg".index(match.group(2).lower() or " "))
+
+
+# Function to stream the trans-units of an XLIFF file with the name of the shard each one goes to.
+# "count" starts a new shard every size units, "bytes" every size bytes of unit text, and "prefix" groups
+# units by the part of their ID before the first "." (CustomField, CustomLabel, ...). The reassembler
+# calls it again on the original file, so both sides always agree on where a unit was sent.
+def iter_shard_units(xliff_file, mode, size=None, job=None):
+    shard_number, shard_used = 1, 0
+    for unit in cached_trans_units(xliff_file, job):
+        if mode == "prefix":
+            yield (unit.id.split(".", 1)[0] if "." in unit.id else "other"), unit
+            continue
+
+        unit_size = 1 if mode == "count" else sum(len(value.encode("utf-8")) for value in unit if value)
+        if shard_used and shard_used + unit_size > size:
+            shard_number += 1
+            shard_used = 0
+        shard_used += unit_size
+        yield f"{shard_number:03d}", unit
+
+
+# Function to stream the rows spilled to a shard file by split_xliff_file
+def read_spilled_rows(spill_path):
+    with open(spill_path, "rb") as f:
+        while True:
+            try:
+                yield from pickle.load(f)
+            except EOFError:
+                return
+
+
+# Function to write one shard workbook (or CSV, TSV or Parquet file) from its spilled rows
+@timed_stage("write_shard_file")
+def write_shard_file(spill_path, output_file_path, target_language):
+    temp_file_path = f"{output_file_path}.{os.getpid()}.tmp"
+    save_table_rows(temp_file_path, excel_headers, read_spilled_rows(spill_path), target_language,
+                    os.path.splitext(output_file_path)[1].lower())
+    os.replace(temp_file_path, output_file_path)
+    return output_file_path
+
+
+# Function to split an XLIFF file into shard workbooks, one per vendor, with a manifest to reassemble them.
+# The XLIFF is read once and the rows of each shard are spilled to a temporary file, so memory stays flat;
+# the shard workbooks are then written in parallel worker processes.
+@timed_stage("split_xliff_file")
+def split_xliff_file(xliff_file, output_folder, mode="count", size=None, output_format="xlsx", max_workers=None,
+                     job=None):
+    if mode not in shard_default_sizes:
+        raise ValueError(f"Unknown shard mode: {mode}")
+    size = size or shard_default_sizes[mode]
+    target_language = read_file_attributes(xliff_file).get("target-language", "translations")
+    stem = os.path.splitext(os.path.basename(xliff_file))[0]
+    os.makedirs(output_folder, exist_ok=True)
+
+    shards = {}
+    with tempfile.TemporaryDirectory(dir=output_folder) as spill_folder:
+        spill_files = {}
+        pending_rows = {}
+        try:
+            for shard_name, unit in instrumentation.timed_iter("parse", iter_shard_units(xliff_file, mode, size, job)):
+                if shard_name not in shards:
+                    safe_name = re.sub(r"[^\w.-]", "_", shard_name)
+                    shards[shard_name] = {"file": f"{stem}_shard_{safe_name}.{output_format}", "units": 0}
+                    spill_files[shard_name] = open(os.path.join(spill_folder, f"{len(spill_files)}.pickle"), "wb")
+                    pending_rows[shard_name] = []
+                shards[shard_name]["units"] += 1
+
+                rows = pending_rows[shard_name]
+                rows.append(trans_unit_row(unit))
+                if len(rows) >= 10000:
+                    pickle.dump(rows, spill_files[shard_name], pickle.HIGHEST_PROTOCOL)
+                    rows.clear()
+        finally:
+            for shard_name, spill_file in spill_files.items():
+                pickle.dump(pending_rows[shard_name], spill_file, pickle.HIGHEST_PROTOCOL)
+                spill_file.close()
+
+        tasks = {os.path.join(output_folder, shard["file"]): (spill_files[shard_name].name,
+                                                               os.path.join(output_folder, shard["file"]),
+                                                               target_language)
+                 for shard_name, shard in shards.items()}
+        results, errors = run_in_process_pool(write_shard_file, tasks, max_workers, job)
+
+    manifest_file = os.path.join(output_folder, f"{stem}{shard_manifest_suffix}")
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        json.dump({"xliff_file": os.path.abspath(xliff_file), "content_hash": file_content_hash(xliff_file),
+                   "target_language": target_language, "mode": mode, "size": size,
+                   "units": sum(shard["units"] for shard in shards.values()),
+                   "shards": [dict(shard, name=shard_name) for shard_name, shard in shards.items()]}, f, indent=2)
+    logging.info(f"{xliff_file} split into {len(shards)} shards in {output_folder}")
+    return manifest_file, results, errors
+
+
+# Function to merge the shards listed in a shard manifest back into one XLIFF file.
+# An ID -> (position, shard) index of the original file is rebuilt with the same split, and every returned row
+# is checked against it: IDs that aren't in the original, that belong to another shard or that repeat are
+# reported as extra, and units that no shard returned as missing. The merged file is the original with the
+# reviewed targets patched in, so units always stay in their original order.
+@timed_stage("reassemble_shards")
+def reassemble_shards(manifest_file, output_file_path, xliff_file=None, job=None):
+    with open(manifest_file, encoding="utf-8") as f:
+        manifest = json.load(f)
+    xliff_file = xliff_file or manifest["xliff_file"]
+    if file_content_hash(xliff_file) != manifest["content_hash"]:
+        raise ValueError(f"{os.path.basename(xliff_file)} has changed since it was split into shards")
+
+    with instrumentation.stage("index original"):
+        positions = {}
+        for position, (shard_name, unit) in enumerate(iter_shard_units(xliff_file, manifest["mode"],
+                                                                       manifest["size"], job)):
+            positions.setdefault(unit.id, (position, shard_name))
+
+    targets = {}
+    returned = set()
+    extra = []
+    missing_shards = []
+    shard_folder = os.path.dirname(os.path.abspath(manifest_file))
+    with instrumentation.stage("read shards"):
+        for shard in manifest["shards"]:
+            shard_file = os.path.join(shard_folder, shard["file"])
+            if not os.path.exists(shard_file):
+                missing_shards.append(shard["name"])
+                continue
+            returned.add(shard["name"])
+            for _, rows in iter_sheet_rows(shard_file):
+                for row_number, row in enumerate(rows, 2):
+                    if not row or row[0] is None:
+                        continue
+                    unit_id = str(row[0])
+                    entry = positions.get(unit_id)
+                    if entry is None:
+                        extra.append((shard["file"], row_number, unit_id, "not in the original XLIFF"))
+                    elif entry[1] != shard["name"]:
+                        extra.append((shard["file"], row_number, unit_id, f"belongs to shard {entry[1]}"))
+                    elif unit_id in targets:
+                        extra.append((shard["file"], row_number, unit_id, "repeated"))
+                    else:
+                        targets[unit_id] = None if len(row) < 5 or is_empty_target(row[4]) else str(row[4])
+
+    missing = sorted((entry[0], unit_id) for unit_id, entry in positions.items()
+                     if entry[1] in returned and unit_id not in targets)
+
+    merger = write_merged_xliff(xliff_file, {unit_id: target for unit_id, target in targets.items()
+                                             if target is not None}, output_file_path, job)
+    counts = merger.counts
+
+    logging.info(f"Reassembled {len(returned)} shards into {output_file_path}: {counts['updated']} updated, "
+                 f"{counts['added']} added, {len(missing)} missing, {len(extra)} extra")
+    return dict(counts, missing=[unit_id for _, unit_id in missing], extra=extra, missing_shards=missing_shards)
+
+
+# Function to build the final summary message of a batch run
+def format_batch_summary(results, errors, noun="files"):
+    summary = f"{len(results)} of {len(results) + len(errors)} {noun} processed successfully."
+    if errors:
+        summary += "\n\nErrors:\n" + "\n".join(f"{os.path.basename(key)}: {error}"
+                                             for key, error in sorted(errors.items()))
+    return summary
+
+
+# Function to run an operation as a background job with a progress window and a Cancel button.
+# target(job) runs on a worker thread; its progress events are polled from the mainloop with root.after,
+# and on_success(result) is called on the mainloop when it finishes.
+def run_job(root, title, target, on_success):
+    from tkinter import messagebox, ttk
+    import tkinter as tk
+
+    job = Job()
+
+    progress_window = tk.Toplevel(root)
+    progress_window.title(title)
+    progress_window.geometry("420x130")
+    progress_label = tk.Label(progress_window, text="Starting...")
+    progress_label.pack(pady=10)
+    progress_bar = ttk.Progressbar(progress_window, maximum=100, length=380)
+    progress_bar.pack(pady=5)
+
+    def cancel_job():
+        job.cancel()
+        cancel_button.config(state="disabled")
+        progress_label.config(text="Cancelling...")
+
+    cancel_button = tk.Button(progress_window, text="Cancel", command=cancel_job)
+    cancel_button.pack(pady=5)
+    progress_window.protocol("WM_DELETE_WINDOW", cancel_job)
+
+    def run_target():
+        try:
+            job.events.put(("done", target(job)))
+        except JobCancelled:
+            job.events.put(("cancelled",))
+        except Exception as e:
+            job.events.put(("failed", e))
+
+    def poll_events():
+        while True:
+            try:
+                event = job.events.get_nowait()
+            except queue.Empty:
+                break
+
+            if event[0] == "progress":
+                _, done, total, message = event
+                if total:
+                    progress_bar.config(mode="determinate", value=100 * done / total)
+                else:
+                    progress_bar.config(mode="indeterminate")
+                    progress_bar.step(5)
+                if not job.cancelled:
+                    progress_label.config(text=message)
+                continue
+
+            progress_window.destroy()
+            if event[0] == "done":
+                logging.info(f"{title} finished.")
+                on_success(event[1])
+            elif event[0] == "cancelled":
+                logging.info(f"{title} was cancelled.")
+                messagebox.showwarning("Cancelled", f"{title} was cancelled.")
+            else:
+                logging.error(f"An error occurred during {title}: {event[1]}")
+                messagebox.showerror("Error", f"An error occurred: {event[1]}")
+            return
+
+        root.after(100, poll_events)
+
+    threading.Thread(target=run_target, daemon=True).start()
+    root.after(100, poll_events)
+    return job
+
+
+# Function to show the summary of a batch run in a message box
+def show_batch_summary(results_and_errors, success_message, noun="files"):
+    from tkinter import messagebox
+
+    results, errors = results_and_errors
+    if errors:
+        messagebox.showwarning("Completed with errors", format_batch_summary(results, errors, noun))
+    else:
+        messagebox.showinfo("Success", success_message)
+
+
+# New function to handle multiple XLIFF to Excel conversion in a background process pool
+def multiple_xliff_to_excel(root):
+    from tkinter import filedialog
+
     xliff_files = filedialog.askopenfilenames(
         title="Select Multiple XLIFF Files",
         filetypes=[("XLIFF files", "*.xlf"), ("All Files", "*.*")]
@@ -225,32 +2154,187 @@ def multiple_xliff_to_excel():
         logging.info("No base folder selected. Exiting.")
         return
 
-    for xliff_file in xliff_files:
-        try:
-            # Use the refactored xliff_to_excel function to get the workbook and language
-            wb, target_language = xliff_to_excel(xliff_file)
+    run_job(root, "Converting XLIFF Files",
+            lambda job: batch_xliff_to_excel(xliff_files, base_folder, job=job),
+            lambda result: show_batch_summary(result, "All files have been processed and saved."))
 
-            # Create a folder for the target language if it doesn't exist
-            folder_path = os.path.join(base_folder, target_language)
-            os.makedirs(folder_path, exist_ok=True)
 
-            # Define the output file path for the Excel file in the respective folder
-            excel_filename = f"Excel to xlf {target_language}.xlsx"
-            output_file_path = os.path.join(folder_path, excel_filename)
+# Function to build the "Feedback for Length" formula for one row of the feedback workbook
+def feedback_length_formula(feedback_column, row_number):
+    feedback_cell = f"{feedback_column}{row_number}"
+    return (f'=IF({feedback_cell}="","",IF(LEN({feedback_cell})>B{row_number},"* The new '
+            f'translation is too long ("&LEN({feedback_cell})&") should be under '
+            f'"&B{row_number}&" chars","OK"))')
 
-            # Save the Excel file
-            wb.save(output_file_path)
-            logging.info(f"XLIFF converted to Excel and saved at {output_file_path}")
-            print(f"XLIFF converted to Excel and saved at {output_file_path}")
 
-        except Exception as e:
-            logging.error(f"An error occurred while processing {xliff_file}: {e}")
-            print(f"An error occurred while processing {xliff_file}: {e}")
+# Function to create the feedback workbook for a source language XLIFF in one streaming pass.
+# The English XLIFF, if given, is joined by ID; the plain source Excel file is only written if source_output_path is set.
+@timed_stage("create_feedback_file")
+def create_feedback_file(source_file_path, feedback_output_path, english_file_path=None, source_output_path=None,
+                         translation_memory=None, job=None):
+    target_language = read_file_attributes(source_file_path).get("target-language", "translations")
+    units = instrumentation.timed_iter("parse", cached_trans_units(source_file_path, job))
+    if translation_memory:
+        units = instrumentation.timed_iter("translation memory", apply_translation_memory(
+            units, target_language, translation_memory))
+
+    # Optional: Load the English file to join its Target values by ID, if available
+    english_table = None
+    if english_file_path:
+        logging.info("Extracting Target values from the English file...")
+        with instrumentation.stage("load english"):
+            english_table = load_trans_unit_table(english_file_path, job)
+
+    # If the English file is selected, add "Translated to English" before the feedback columns
+    if english_file_path:
+        feedback_headers = ["Translated to English", "Feedback By Customer", "Feedback for Length"]
+        feedback_column = "H"
+    else:
+        feedback_headers = ["Feedback By Customer", "Feedback for Length"]
+        feedback_column = "G"
+
+    feedback_wb = create_write_only_workbook()
+    feedback_ws = create_write_only_sheet(feedback_wb, target_language)
+    append_styled_row(feedback_ws, excel_headers + feedback_headers, header_style_name)
+
+    source_wb = None
+    if source_output_path:
+        source_wb = create_write_only_workbook()
+        source_ws = create_write_only_sheet(source_wb, target_language)
+        append_styled_row(source_ws, excel_headers, header_style_name)
+
+    logging.info("Converting source language file to the feedback workbook...")
+    with instrumentation.stage("build rows"):
+        for row_number, unit in enumerate(units, 2):
+            row = trans_unit_row(unit)
+            if source_wb:
+                append_styled_row(source_ws, row)
+
+            if english_table is not None:
+                english_unit = english_table.get(unit.id)
+                row.append(english_unit.target if english_unit else "")
+            row += [None, feedback_length_formula(feedback_column, row_number)]
+            append_styled_row(feedback_ws, row)
+
+    if job:
+        job.progress(0, None, "Saving the Excel files...")
+    if source_wb:
+        with instrumentation.stage("save workbook"):
+            source_wb.save(source_output_path)
+        logging.info(f"Source Excel file saved at {source_output_path}")
+
+    # Save the feedback Excel file
+    with instrumentation.stage("save workbook"):
+        feedback_wb.save(feedback_output_path)
+    logging.info(f"Source file updated with feedback saved at {feedback_output_path}")
+    return feedback_output_path
+
+
+# Column layout of the per-language report of rejected customer feedback
+feedback_rejection_headers = ["ID", "Max Width", "Size Unit", "Source", "Target", "Feedback", "Length", "Reason"]
+
+
+# Function to find the unit and "Feedback By Customer" columns of a feedback workbook from its header row,
+# so workbooks made with and without the "Translated to English" column are both read
+def feedback_columns(headers, path):
+    positions = {str(header).strip(): index for index, header in enumerate(headers) if header is not None}
+    missing = [name for name in excel_headers[:5] + ["Feedback By Customer"] if name not in positions]
+    if missing:
+        raise ValueError(f"{os.path.basename(path)} is not a feedback workbook, missing columns: {', '.join(missing)}")
+    return [positions[name] for name in excel_headers[:5]], positions["Feedback By Customer"]
+
+
+# Function to read the customer feedback of a feedback workbook, opened read-only.
+# The "Feedback for Length" formula only has a result once Excel has recalculated and saved the file, so the
+# length check is done again here against maxwidth and size-unit, the same way "validate" measures targets.
+# Returns the sheet (target language) name, the accepted rows by ID and the rejected rows.
+def read_customer_feedback(feedback_file):
+    wb = openpyxl.load_workbook(feedback_file, read_only=True)
+    try:
+        ws = wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        unit_columns, feedback_column = feedback_columns(next(rows, ()), feedback_file)
+        accepted, rejected = {}, []
+        seen_ids = set()
+        for row in rows:
+            if len(row) <= feedback_column or is_empty_target(row[feedback_column]) or row[unit_columns[0]] is None:
+                continue
+            unit_id, max_width, size_unit, source, target = (row[index] if index < len(row) else None
+                                                             for index in unit_columns)
+            unit_id = str(unit_id)
+            if unit_id in seen_ids:
+                continue  # Like the conversions, the first row of a repeated ID wins
+            seen_ids.add(unit_id)
+
+            feedback = str(row[feedback_column])
+            limit = parse_max_width("" if max_width is None else str(max_width))
+            length = measure_length(feedback, size_unit or "")
+            row = [unit_id, max_width, size_unit, source, target, feedback, length]
+            if limit is not None and length is not None and length > limit:
+                rejected.append(row + [f"Too long, should be at most {limit:g} {size_unit or 'char'}s"])
+            else:
+                accepted[unit_id] = row
+        return ws.title, accepted, rejected
+    finally:
+        wb.close()
+
+
+# Function to apply the accepted customer feedback of one feedback workbook as the new targets of the XLIFF file
+# with the same target-language. Writes <output>/<lang>/<XLIFF name>, and a <lang>_feedback_rejections.xlsx
+# report next to it for the feedback that was too long or whose ID isn't in the XLIFF.
+@timed_stage("apply_feedback_file")
+def apply_feedback_file(feedback_file, xliff_files_by_language, output_folder):
+    with instrumentation.stage("read feedback"):
+        language, accepted, rejected = read_customer_feedback(feedback_file)
+    if language not in xliff_files_by_language:
+        raise ValueError(f"No XLIFF file with target-language '{language}'")
+    xliff_file = xliff_files_by_language[language]
+
+    language_folder = os.path.join(output_folder, language)
+    os.makedirs(language_folder, exist_ok=True)
+    output_file_path = os.path.join(language_folder, os.path.basename(xliff_file))
+    merger = write_merged_xliff(xliff_file, {unit_id: row[5] for unit_id, row in accepted.items()}, output_file_path)
+    rejected.extend(row + ["ID not in the XLIFF"] for unit_id, row in accepted.items()
+                    if unit_id not in merger.matched_ids)
+
+    # Remove the report of an earlier run, so it isn't mistaken for this one
+    report_file = os.path.join(language_folder, f"{language}_feedback_rejections.xlsx")
+    if rejected:
+        save_table_rows(report_file, feedback_rejection_headers, rejected, language)
+    elif os.path.exists(report_file):
+        os.remove(report_file)
+
+    counts = merger.counts
+    logging.info(f"Feedback for '{language}' applied to {output_file_path}: {counts['updated'] + counts['added']} "
+                 f"targets changed, {counts['unchanged']} unchanged, {len(rejected)} rejected")
+    return {"language": language, "xliff_file": output_file_path, "changed": counts["updated"] + counts["added"],
+            "unchanged": counts["unchanged"], "rejected": len(rejected),
+            "report_file": report_file if rejected else None}
+
+
+# Function to apply many returned feedback workbooks in parallel worker processes, one workbook per task.
+# Each workbook is matched to the XLIFF file whose target-language is its sheet name.
+def batch_apply_feedback(feedback_files, xliff_files, output_folder, max_workers=None, job=None):
+    xliff_files_by_language = {}
+    errors = {}
+    for xliff_file in xliff_files:
+        language = read_file_attributes(xliff_file).get("target-language")
+        if language in xliff_files_by_language:
+            errors[xliff_file] = f"{os.path.basename(xliff_files_by_language[language])} already has " \
+                                 f"target-language '{language}'"
+        else:
+            xliff_files_by_language[language] = xliff_file
+
+    tasks = {feedback_file: (feedback_file, xliff_files_by_language, output_folder) for feedback_file in feedback_files}
+    results, task_errors = run_in_process_pool(apply_feedback_file, tasks, max_workers, job)
+    errors.update(task_errors)
+    return results, errors
 
-    logging.info("Multiple files processed successfully.")
-    messagebox.showinfo("Success", "All files have been processed and saved.")
 
 def select_two_files(root):
+    from tkinter import filedialog, messagebox
+    import tkinter as tk
+
     # Create a new window for selecting files
     select_window = tk.Toplevel(root)
     select_window.title("Select Source Language and Optional English Files")
@@ -295,88 +2379,35 @@ def select_two_files(root):
             return
 
         try:
-            # Convert source XLIFF to Excel and save it
-            logging.info("Converting source language file to Excel...")
-            wb, target_language = xliff_to_excel(source_file_path)
-
-            # Prompt the user to save the Excel file
-            output_file_path = filedialog.asksaveasfilename(
-                title="Save Source Language Excel File As",
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All Files", "*.*")],
-                initialfile=f"{target_language}_source.xlsx"
-            )
-
-            if output_file_path:
-                wb.save(output_file_path)
-                logging.info(f"Source Excel file saved at {output_file_path}")
-            else:
-                logging.info("File save operation was cancelled.")
-                return  # Exit if the user cancels the save operation
-
-            # Optional: Process the English file to extract Target values, if available
-            english_translation_map = {}
-            if english_file_path:
-                logging.info("Extracting Target values from the English file...")
-                tree = ET.parse(english_file_path)
-                root = tree.getroot()
-
-                for file_element in root.findall("file"):
-                    for trans_unit in file_element.find("body").findall("trans-unit"):
-                        id_value = trans_unit.get("id", "")
-                        target_text = trans_unit.find("target").text if trans_unit.find("target") is not None else ""
-                        english_translation_map[id_value] = target_text
-
-            # Load the previously saved source Excel file
-            logging.info(f"Loading the previously saved Excel file from {output_file_path}...")
-            wb = openpyxl.load_workbook(output_file_path)
-            ws = wb.active
-
-            # If the English file is selected, add "Translated to English" column
-            if english_file_path:
-                # Add columns "Feedback By Customer" and "Feedback for Length"
-                ws["H1"] = "Feedback By Customer"
-                ws["I1"] = "Feedback for Length"
-                ws["G1"] = "Translated to English"
-
-                for row in ws.iter_rows(min_row=2, max_col=6):  # Assuming data goes from column A to F
-                    id_value = str(row[0].value)  # Column A contains IDs
-                    english_translation = english_translation_map.get(id_value, "")
-                    ws[f"G{row[0].row}"] = english_translation  # Insert the English translation in column G
-
-                    # Insert the formula for "Feedback for Length" (Column I)
-                    feedback_formula = (f'=IF(H{row[0].row}="","",IF(LEN(H{row[0].row})>B{row[0].row},"* The new '
-                                        f'translation is too long ("&LEN(H{row[0].row})&") should be under '
-                                        f'"&B{row[0].row}&" chars","OK"))')
-                    ws[f"I{row[0].row}"] = feedback_formula
-            else:
-                ws["G1"] = "Feedback By Customer"
-                ws["H1"] = "Feedback for Length"
-                # Iterate over the rows of the source file and match IDs with English translations if available
-                for row in ws.iter_rows(min_row=2, max_col=6):  # Assuming data goes from column A to F
-                    feedback_formula = (f'=IF(G{row[0].row}="","",IF(LEN(G{row[0].row})>B{row[0].row},"* The new '
-                                        f'translation is too long ("&LEN(G{row[0].row})&") should be under "'
-                                        f'&B{row[0].row}&" chars","OK"))')
-                    ws[f"H{row[0].row}"] = feedback_formula
-
-            # Apply styling to the entire sheet, including the new columns
-            style_excel_sheet(ws)
+            target_language = read_file_attributes(source_file_path).get("target-language", "translations")
 
-            # Save the modified Excel file
+            # Prompt the user to save the feedback Excel file
             output_file_path = filedialog.asksaveasfilename(
                 title="Save Modified Excel File As",
                 defaultextension=".xlsx",
                 filetypes=[("Excel files", "*.xlsx"), ("All Files", "*.*")],
                 initialfile=f"{target_language}_with_Feedback.xlsx"
             )
-
-            if output_file_path:
-                wb.save(output_file_path)
-                logging.info(f"Source file updated with feedback saved at {output_file_path}")
-                messagebox.showinfo("Success", f"File saved successfully at {output_file_path}")
-            else:
+            if not output_file_path:
                 logging.info("File save operation was cancelled.")
                 print("File save operation was cancelled.")
+                return
+
+            # The plain source language Excel file is optional
+            source_output_path = None
+            if messagebox.askyesno("Source Excel File", "Do you also want to save the source language Excel file?"):
+                source_output_path = filedialog.asksaveasfilename(
+                    title="Save Source Language Excel File As",
+                    defaultextension=".xlsx",
+                    filetypes=[("Excel files", "*.xlsx"), ("All Files", "*.*")],
+                    initialfile=f"{target_language}_source.xlsx"
+                )
+
+            feedback_output_path = output_file_path
+            run_job(root, "Feedback File Automation",
+                    lambda job: create_feedback_file(source_file_path, feedback_output_path, english_file_path,
+                                                     source_output_path or None, job=job),
+                    lambda result: messagebox.showinfo("Success", f"File saved successfully at {result}"))
 
         except Exception as e:
             logging.error(f"An error occurred during the processing: {e}")
@@ -405,90 +2436,378 @@ def select_two_files(root):
     close_btn.pack(pady=10)
 
 
-def create_package(root):
-    # Hide the root window (if not already hidden)
-    root.withdraw()
+# Sections removed from .objectTranslation files before they are packaged
+sections_to_remove = ['fields', 'validationRules', 'webLinks', 'layouts', 'fieldSets']
+
+
+# Function to copy text from input_file to output while removing the given sections and the whitespace after them.
+# This is a single streaming pass equivalent to re.sub(rf'<{section}>.*?</{section}>\s*', '', ...) for each section;
+# only the section being removed is held in memory.
+def strip_sections(input_file, output, sections, chunk_size=1 << 20):
+    open_pattern = re.compile("<(" + "|".join(re.escape(section) for section in sections) + ")>")
+    whitespace_pattern = re.compile(r"\s*")
+    partial_tag_length = max(len(section) for section in sections) + 2  # Longest "<section>" minus one character
+
+    buffer = ""
+    eof = False
+
+    def read_more():
+        nonlocal buffer, eof
+        chunk = input_file.read(chunk_size)
+        if chunk:
+            buffer += chunk
+        else:
+            eof = True
+
+    read_more()
+    while True:
+        match = open_pattern.search(buffer)
+        if not match:
+            if eof:
+                output.write(buffer)
+                return
+            # Keep the tail, it may hold the start of an opening tag
+            keep_from = max(0, len(buffer) - partial_tag_length)
+            output.write(buffer[:keep_from])
+            buffer = buffer[keep_from:]
+            read_more()
+            continue
+
+        output.write(buffer[:match.start()])
+        buffer = buffer[match.start():]
+        open_tag = match.group(0)
+        close_tag = f"</{match.group(1)}>"
+
+        # Find the closing tag, reading more of the file if needed
+        search_from = len(open_tag)
+        close_position = buffer.find(close_tag, search_from)
+        while close_position < 0 and not eof:
+            search_from = max(search_from, len(buffer) - len(close_tag) + 1)
+            read_more()
+            close_position = buffer.find(close_tag, search_from)
+
+        if close_position < 0:
+            # Unclosed section, the regular expression wouldn't have matched it either
+            output.write(open_tag)
+            buffer = buffer[len(open_tag):]
+            continue
+
+        # Drop the section and the whitespace after it, which may continue into the next chunk
+        section_end = close_position + len(close_tag)
+        whitespace_end = whitespace_pattern.match(buffer, section_end).end()
+        while whitespace_end == len(buffer) and not eof:
+            read_more()
+            whitespace_end = whitespace_pattern.match(buffer, section_end).end()
+        buffer = buffer[whitespace_end:]
+
+
+# Function to build the package.xml content for the objects of one language
+def build_package_xml(language_code, object_api_names):
+    package_xml_content = '''<?xml version="1.0" encoding="UTF-8"?>
+    <Package xmlns="http://soap.sforce.com/2006/04/metadata">
+        <types>
+    '''
+    for api_name in sorted(object_api_names):
+        # Include the language code in each member entry as <API_NAME>-<language_code>
+        package_xml_content += f'        <members>{api_name}-{language_code}</members>\n'
+
+    package_xml_content += '''        <name>CustomObjectTranslation</name>
+        </types>
+        <version>57.0</version>
+    </Package>'''
+    return package_xml_content
+
+
+# Function to split an .objectTranslation file name into the object API name and the language code
+def parse_object_translation_name(input_file_path):
+    file_name = os.path.basename(input_file_path)
+    try:
+        object_api_name, language_code = file_name.split('-')
+    except ValueError:
+        raise ValueError(f"Expected a file name like <Object>-<language>.objectTranslation, got {file_name}")
+    return object_api_name, language_code.replace('.objectTranslation', '')
+
+
+# Name of the manifest of content hashes that incremental package builds keep in the output folder
+package_manifest_name = "package_manifest.json"
+
+
+# Function to get the path of the deployment package zip of one language
+def deployment_package_path(base_output_folder, language_code):
+    return os.path.join(base_output_folder, f"{language_code}_deployment_package.zip")
+
+
+# Function to delete the deployment package zip of one language, if there is one
+def remove_deployment_package(base_output_folder, language_code):
+    try:
+        os.remove(deployment_package_path(base_output_folder, language_code))
+    except FileNotFoundError:
+        pass
+
+
+# Function to build the deployment package zip of one language.
+# The stripped .objectTranslation files and package.xml are streamed straight into the zip, without temporary files.
+@timed_stage("build_language_package")
+def build_language_package(language_code, input_file_paths, base_output_folder):
+    object_api_names = {parse_object_translation_name(path)[0] for path in input_file_paths}
+    zip_file_path = deployment_package_path(base_output_folder, language_code)
+    temp_zip_file_path = f"{zip_file_path}.{os.getpid()}.tmp"
+
+    with zipfile.ZipFile(temp_zip_file_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        with zipf.open("unpackaged/package.xml", "w") as entry, io.TextIOWrapper(entry, encoding='utf-8') as output:
+            output.write(build_package_xml(language_code, object_api_names))
+
+        for input_file_path in sorted(input_file_paths, key=os.path.basename):
+            arcname = f"unpackaged/objectTranslations/{os.path.basename(input_file_path)}"
+            with open(input_file_path, 'r', encoding='utf-8') as file, \
+                    zipf.open(arcname, "w") as entry, io.TextIOWrapper(entry, encoding='utf-8') as output:
+                strip_sections(file, output, sections_to_remove)
+
+    os.replace(temp_zip_file_path, zip_file_path)
+    return zip_file_path
+
+
+# Function to package the objects of one language whose content hash differs from known_hashes
+# ({object API name: hash} of the last acknowledged deployment), with a package.xml that lists just those members.
+# With known_hashes=None every object is packaged. A language without changes gets no new zip.
+# Returns the zip path (or None) and the content hashes of the objects packaged.
+def build_language_package_changes(language_code, input_file_paths, base_output_folder, known_hashes=None):
+    packaged = {}
+    changed_paths = []
+    for input_file_path in input_file_paths:
+        object_api_name, _ = parse_object_translation_name(input_file_path)
+        with instrumentation.stage("hash"):
+            content_hash = file_content_hash(input_file_path)
+        if known_hashes is None or known_hashes.get(object_api_name) != content_hash:
+            packaged[object_api_name] = content_hash
+            changed_paths.append(input_file_path)
+
+    if not changed_paths:
+        return None, packaged
+    return build_language_package(language_code, changed_paths, base_output_folder), packaged
+
+
+# Function to read the package manifest of an output folder. "languages" holds the content hashes of the
+# objects acknowledged as deployed and "packaged" those of the objects in the zips built since, both as
+# {language: {object API name: content hash}}.
+# A manifest written with other sections_to_remove is ignored, since every stripped file would differ.
+def read_package_manifest(base_output_folder):
+    manifest = {"languages": {}, "packaged": {}}
+    try:
+        with open(os.path.join(base_output_folder, package_manifest_name), encoding="utf-8") as f:
+            saved = json.load(f)
+    except FileNotFoundError:
+        return manifest
+    except ValueError as e:
+        logging.warning(f"Ignoring the unreadable package manifest: {e}")
+        return manifest
+    if saved.get("sections") != sections_to_remove:
+        return manifest
+    manifest.update((key, saved.get(key, {})) for key in manifest)
+    return manifest
+
+
+# Function to save the package manifest of an output folder
+def write_package_manifest(base_output_folder, manifest):
+    manifest_path = os.path.join(base_output_folder, package_manifest_name)
+    temp_manifest_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(temp_manifest_path, "w", encoding="utf-8") as f:
+        json.dump(dict(manifest, sections=sections_to_remove), f, indent=2, sort_keys=True)
+    os.replace(temp_manifest_path, manifest_path)
+
+
+# Function to mark the packages last built into an output folder as deployed, so the next incremental run
+# only packages what changed since. The acknowledged zips are deleted, so a zip left in the folder is always
+# one that still has to be deployed. languages limits this to some languages; returns {language: object count}.
+def acknowledge_deployment_packages(base_output_folder, languages=None):
+    manifest = read_package_manifest(base_output_folder)
+    acknowledged = {}
+    for language_code in sorted(manifest["packaged"]):
+        if languages and language_code not in languages:
+            continue
+        packaged = manifest["packaged"].pop(language_code)
+        manifest["languages"].setdefault(language_code, {}).update(packaged)
+        acknowledged[language_code] = len(packaged)
+    write_package_manifest(base_output_folder, manifest)
+    for language_code in acknowledged:
+        remove_deployment_package(base_output_folder, language_code)
+    return acknowledged
+
+
+# Function to build one zipped deployment package per language from .objectTranslation files,
+# with the languages processed in parallel worker processes.
+# The content hashes of the packaged objects are kept in package_manifest.json in the output folder until the
+# packages are acknowledged as deployed (acknowledge_deployment_packages). With incremental=True, only the objects
+# that changed since the last acknowledged deployment are packaged, so a delta that was never deployed is built
+# again with the newer changes. Languages without changes are skipped and any zip left from an earlier run is
+# deleted, since it holds nothing that isn't deployed.
+# Returns the zip path of each language built, the errors, and the languages skipped as unchanged.
+@timed_stage("build_deployment_packages")
+def build_deployment_packages(input_file_paths, base_output_folder, max_workers=None, job=None, incremental=False):
+    # Dictionary to keep track of files for each language
+    language_files = {}
+    errors = {}
+    for input_file_path in input_file_paths:
+        try:
+            _, language_code = parse_object_translation_name(input_file_path)
+        except ValueError as e:
+            errors[input_file_path] = str(e)
+            logging.error(str(e))
+            continue
+        language_files.setdefault(language_code, []).append(input_file_path)
+
+    os.makedirs(base_output_folder, exist_ok=True)
+    manifest = read_package_manifest(base_output_folder)
+    tasks = {language_code: (language_code, paths, base_output_folder,
+                             manifest["languages"].get(language_code, {}) if incremental else None)
+             for language_code, paths in language_files.items()}
+    language_results, language_errors = run_in_process_pool(build_language_package_changes, tasks, max_workers, job)
+    errors.update(language_errors)
+
+    # The packaged entries of a language are only updated once its package has been built
+    results = {}
+    unchanged = []
+    for language_code, (zip_file_path, packaged) in sorted(language_results.items()):
+        if not zip_file_path:
+            unchanged.append(language_code)
+            manifest["packaged"].pop(language_code, None)
+            remove_deployment_package(base_output_folder, language_code)
+            message = f"No changes for language '{language_code}' since the last deployment, package skipped"
+        else:
+            results[language_code] = zip_file_path
+            manifest["packaged"][language_code] = packaged
+            if incremental:
+                message = f"Delta package for language '{language_code}' created with {len(packaged)} objects: " \
+                          f"{zip_file_path}"
+            else:
+                message = f"Deployment package for language '{language_code}' created: {zip_file_path}"
+        logging.info(message)
+        print(message)
+
+    write_package_manifest(base_output_folder, manifest)
+    return results, errors, unchanged
+
+
+# Function to build the summary of a package build: the batch summary, then the languages skipped as unchanged
+def format_package_summary(results, errors, unchanged):
+    summary = format_batch_summary(results, errors, "languages")
+    if unchanged:
+        summary += f"\n\nNo changes since the last deployment for: {', '.join(unchanged)}"
+    return summary
+
+
+def create_package(root):
+    from tkinter import filedialog, messagebox
+
+    # Ask the user to select multiple .objectTranslation files
+    input_file_paths = filedialog.askopenfilenames(title="Select .objectTranslation files",
+                                                   filetypes=[("Object Translation Files", "*.objectTranslation")])
+
+    # Ask the user to select the base folder to save zipped deployment packages
+    base_output_folder = filedialog.askdirectory(title="Select the base folder to save deployment packages")
+
+    if input_file_paths and base_output_folder:
+        # Once a folder has a manifest, the packages of the last run can be acknowledged as deployed and the new
+        # packages limited to the objects that changed since the last deployment
+        manifest = read_package_manifest(base_output_folder)
+        if manifest["packaged"] and messagebox.askyesno(
+                "Deployed Packages", f"Were the packages last built for {', '.join(sorted(manifest['packaged']))} "
+                                     f"deployed?"):
+            acknowledge_deployment_packages(base_output_folder)
+        incremental = os.path.exists(os.path.join(base_output_folder, package_manifest_name)) and \
+            messagebox.askyesno("Incremental Packages",
+                                "Only package the files that changed since the last deployment?")
+        def packaged(result):
+            results, errors, unchanged = result
+            if errors:
+                messagebox.showwarning("Completed with errors", format_package_summary(results, errors, unchanged))
+            elif unchanged:
+                messagebox.showinfo("Success", format_package_summary(results, errors, unchanged))
+            else:
+                messagebox.showinfo("Success", "All deployment packages have been created.")
+
+        run_job(root, "Creating Deployment Packages",
+                lambda job: build_deployment_packages(input_file_paths, base_output_folder, job=job,
+                                                      incremental=incremental),
+                packaged)
+    else:
+        print("File selection was cancelled.")
+
+
+# Function to diff two XLIFF files in one linear pass over the new file.
+# The old file is loaded into a TransUnitTable with per-unit content hashes; the new file is streamed.
+# Yields (status, old_unit, new_unit) in new file order, followed by the units removed from the old file.
+def diff_xliff_files(old_xliff_path, new_xliff_path, job=None):
+    with instrumentation.stage("load old"):
+        old_table = load_trans_unit_table(old_xliff_path, job)
+        old_source_hashes = old_table.hashes("sources")
+        old_target_hashes = old_table.hashes("targets")
+    matched = bytearray(len(old_table))
 
-    # Ask the user to select multiple .objectTranslation files
-    input_file_paths = filedialog.askopenfilenames(title="Select .objectTranslation files",
-                                                   filetypes=[("Object Translation Files", "*.objectTranslation")])
+    for unit in instrumentation.timed_iter("parse new", cached_trans_units(new_xliff_path, job)):
+        row = old_table.index.get(unit.id)
+        if row is None or matched[row]:
+            yield "Added", None, unit
+            continue
 
-    # Ask the user to select the base folder to save zipped deployment packages
-    base_output_folder = filedialog.askdirectory(title="Select the base folder to save deployment packages")
+        matched[row] = 1
+        old_unit = old_table.row(row)
+        if content_hash(unit.source) != old_source_hashes[row]:
+            yield "Source Changed", old_unit, unit
+        elif content_hash(unit.target) != old_target_hashes[row]:
+            yield "Target Changed", old_unit, unit
+        else:
+            yield "Unchanged", old_unit, unit
 
-    # Define sections to remove
-    sections_to_remove = ['fields', 'validationRules', 'webLinks', 'layouts', 'fieldSets']
+    for row in old_table.index.values():
+        if not matched[row]:
+            yield "Removed", old_table.row(row), None
 
-    # Dictionary to keep track of files for each language
-    language_files = {}
 
-    # Process each selected file
-    if input_file_paths and base_output_folder:
-        for input_file_path in input_file_paths:
-            # Read the input file content
-            with open(input_file_path, 'r', encoding='utf-8') as file:
-                file_content = file.read()
-
-            # Remove all specified sections and any resulting blank lines
-            for section in sections_to_remove:
-                file_content = re.sub(rf'<{section}>.*?</{section}>\s*', '', file_content, flags=re.DOTALL)
-
-            # Extract the object API name and language code from the filename
-            file_name = os.path.basename(input_file_path)
-            object_api_name, language_code = file_name.split('-')
-            language_code = language_code.replace('.objectTranslation', '')
-
-            # Organize files by language in a dictionary
-            if language_code not in language_files:
-                language_files[language_code] = set()
-            language_files[language_code].add(object_api_name)
-
-            # Define the language-specific "unpackaged/translations" folder
-            unpackaged_folder = os.path.join(base_output_folder, language_code, "unpackaged", "objectTranslations")
-            os.makedirs(unpackaged_folder, exist_ok=True)  # Create the folder if it doesn't exist
-
-            # Save the modified .objectTranslation file in the translations folder
-            modified_file_path = os.path.join(unpackaged_folder,
-                                              file_name.replace('.objectTranslation', '.objectTranslation'))
-            with open(modified_file_path, 'w', encoding='utf-8') as modified_file:
-                modified_file.write(file_content)
-
-        # For each language, create a package.xml and zip the contents within an "unpackaged" folder
-        for language_code, object_api_names in language_files.items():
-            # Generate package.xml for the current language
-            package_xml_content = '''<?xml version="1.0" encoding="UTF-8"?>
-    <Package xmlns="http://soap.sforce.com/2006/04/metadata">
-        <types>
-    '''
-            for api_name in sorted(object_api_names):
-                # Include the language code in each member entry as <API_NAME>-<language_code>
-                package_xml_content += f'        <members>{api_name}-{language_code}</members>\n'
+# Function to compare an old and a new XLIFF file and save the comparison workbook
+@timed_stage("compare_xliff_files")
+def compare_xliff_files(old_xliff_path, new_xliff_path, comparison_file, job=None):
+    comparison_wb = create_write_only_workbook()
+    comparison_ws = create_write_only_sheet(comparison_wb, "Comparison")
+    append_styled_row(comparison_ws, comparison_headers, header_style_name)
 
-            package_xml_content += '''        <name>CustomObjectTranslation</name>
-        </types>
-        <version>57.0</version>
-    </Package>'''
+    status_counts = {status: 0 for status in
+                     ("Added", "Removed", "Source Changed", "Target Changed", "Unchanged")}
+    for status, old_unit, new_unit in instrumentation.timed_iter("diff", diff_xliff_files(old_xliff_path,
+                                                                                          new_xliff_path, job)):
+        status_counts[status] += 1
+        unit = new_unit or old_unit
+        append_styled_row(comparison_ws, [
+            unit.id,
+            status,
+            parse_max_width(unit.max_width),
+            unit.size_unit,
+            old_unit.source if old_unit else None,
+            new_unit.source if new_unit else None,
+            old_unit.target if old_unit else None,
+            new_unit.target if new_unit else None,
+            unit.note,
+        ])
+
+    # Summary sheet with the number of units per status, placed first
+    summary_ws = comparison_wb.create_sheet("Summary", 0)
+    summary_ws.sheet_view.showGridLines = False
+    append_styled_row(summary_ws, ["Status", "Units"], header_style_name)
+    for status, count in status_counts.items():
+        append_styled_row(summary_ws, [status, count])
+
+    if job:
+        job.progress(0, None, "Saving the comparison file...")
+    with instrumentation.stage("save workbook"):
+        comparison_wb.save(comparison_file)
+    logging.info(f"Comparison file saved at {comparison_file}")
+    return status_counts
 
-            # Save the package.xml in the "unpackaged" folder for the language
-            package_xml_path = os.path.join(base_output_folder, language_code, "unpackaged", "package.xml")
-            with open(package_xml_path, 'w', encoding='utf-8') as package_file:
-                package_file.write(package_xml_content)
-
-            # Zip the "unpackaged" folder for deployment
-            unpackaged_folder_path = os.path.join(base_output_folder, language_code, "unpackaged")
-            zip_file_path = os.path.join(base_output_folder, f"{language_code}_deployment_package.zip")
-            with zipfile.ZipFile(zip_file_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root_dir, _, files in os.walk(unpackaged_folder_path):
-                    for file in files:
-                        file_path = os.path.join(root_dir, file)
-                        zipf.write(file_path, os.path.relpath(file_path, os.path.join(base_output_folder, language_code)))
-
-            print(f"Deployment package for language '{language_code}' created: {zip_file_path}")
-    else:
-        print("File selection was cancelled.")
 
+def compare_xliffs(root):
+    from tkinter import filedialog, messagebox
+    import tkinter as tk
 
-def compare_xliffs():
     def select_old_xliff():
         nonlocal old_xliff_path
         old_xliff_path = filedialog.askopenfilename(
@@ -517,47 +2836,16 @@ def compare_xliffs():
             return
 
         try:
-            # Load XLIFFs into Excel workbooks
-            old_wb, _ = xliff_to_excel(old_xliff_path)
-            new_wb, _ = xliff_to_excel(new_xliff_path)
-
-            # Get the worksheets
-            old_ws = old_wb.active
-            new_ws = new_wb.active
-
-            # Create comparison data structures
-            old_ids = {row[0].value for row in old_ws.iter_rows(min_row=2, max_col=1)}
-            new_ids = {row[0].value for row in new_ws.iter_rows(min_row=2, max_col=1)}
-
-            # Add columns for comparison
-            old_ws["G1"] = "Deleted in New XLIFF"
-            for row in old_ws.iter_rows(min_row=2, max_row=old_ws.max_row, min_col=1, max_col=1):
-                id_value = row[0].value
-                old_ws[f"G{row[0].row}"] = "Deleted" if id_value not in new_ids else "Exists"
-
-            new_ws["G1"] = "Status in Old XLIFF"
-            for row in new_ws.iter_rows(min_row=2, max_row=new_ws.max_row, min_col=1, max_col=1):
-                id_value = row[0].value
-                new_ws[f"G{row[0].row}"] = "New" if id_value not in old_ids else "Exists"
-
-            # Save comparison result to a new file
             comparison_file = filedialog.asksaveasfilename(
                 title="Save Comparison File As",
                 defaultextension=".xlsx",
                 filetypes=[("Excel files", "*.xlsx"), ("All Files", "*.*")]
             )
             if comparison_file:
-                comparison_wb = openpyxl.Workbook()
-                old_sheet = comparison_wb.create_sheet("Old XLIFF", 0)
-                new_sheet = comparison_wb.create_sheet("New XLIFF", 1)
-
-                for row in old_ws.iter_rows(values_only=True):
-                    old_sheet.append(row)
-                for row in new_ws.iter_rows(values_only=True):
-                    new_sheet.append(row)
-
-                comparison_wb.save(comparison_file)
-                messagebox.showinfo("Success", f"Comparison file saved at {comparison_file}")
+                run_job(root, "Files Comparison",
+                        lambda job: compare_xliff_files(old_xliff_path, new_xliff_path, comparison_file, job),
+                        lambda status_counts: messagebox.showinfo("Success",
+                                                                  f"Comparison file saved at {comparison_file}"))
             else:
                 messagebox.showwarning("Cancelled", "Comparison file save was cancelled.")
 
@@ -590,23 +2878,772 @@ def compare_xliffs():
     compare_button.pack(pady=10)
 
 
+# Function to join XLIFF files of different target languages on trans-unit ID, loading each file as a table.
+# Units are kept in order of first appearance, with the maxwidth and source of the first file that has them.
+# Returns the language column names and a generator of rows: ID, Max Width, Source, then one target per language.
+@timed_stage("build_language_matrix")
+def build_language_matrix(xliff_files, job=None):
+    languages = []
+    tables = []
+    for xliff_file in xliff_files:
+        table = load_trans_unit_table(xliff_file, job)
+        language = table.target_language
+        if language in languages:
+            language = f"{language} ({os.path.basename(xliff_file)})"
+        languages.append(language)
+        tables.append(table)
 
+    def rows():
+        seen = set()
+        for first, table in enumerate(tables):
+            for unit_id, position in table.index.items():
+                if unit_id in seen:
+                    continue
+                seen.add(unit_id)
+                # The index holds the first occurrence of a duplicated ID; a unit missing from a file stays None
+                targets = [None] * first
+                for other in tables[first:]:
+                    other_position = other.index.get(unit_id)
+                    targets.append(None if other_position is None else other.targets[other_position] or "")
+                yield [unit_id, parse_max_width(table.max_widths[position]), table.sources[position], *targets]
+
+    return languages, rows()
+
+
+# Function to save the multi-language matrix of several XLIFF files as one sheet, CSV, TSV or Parquet file
+@timed_stage("save_language_matrix")
+def save_language_matrix(xliff_files, output_path, job=None):
+    languages, rows = build_language_matrix(xliff_files, job)
+    if job:
+        job.progress(0, None, "Saving the language matrix...")
+    save_table_rows(output_path, ["ID", "Max Width", "Source", *languages], rows, "Matrix")
+    logging.info(f"Language matrix of {len(languages)} files saved at {output_path}")
+    return output_path
+
+
+# Function to select the XLIFF files of several languages and save them as one matrix
+def language_matrix(root):
+    from tkinter import filedialog
+
+    xliff_files = filedialog.askopenfilenames(
+        title="Select XLIFF Files (One per Language)",
+        filetypes=[("XLIFF files", "*.xlf"), ("All Files", "*.*")]
+    )
+    if not xliff_files:
+        logging.info("No files selected. Exiting.")
+        return
+
+    output_path = filedialog.asksaveasfilename(
+        title="Save Language Matrix As",
+        defaultextension=".xlsx",
+        filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"), ("TSV files", "*.tsv"),
+                   ("Parquet files", "*.parquet"), ("All Files", "*.*")],
+        initialfile="Language matrix.xlsx"
+    )
+    if not output_path:
+        logging.info("File save operation was cancelled.")
+        return
+
+    def saved(output_path):
+        from tkinter import messagebox
+        messagebox.showinfo("Success", f"Language matrix saved at {output_path}")
+
+    run_job(root, "Language Matrix", lambda job: save_language_matrix(xliff_files, output_path, job), saved)
+
+
+# Function to select an original XLIFF file and a reviewed workbook, and merge the reviewed targets into a new XLIFF
+def merge_reviewed_xliff(root):
+    from tkinter import filedialog
+
+    xliff_file = filedialog.askopenfilename(
+        title="Select Original XLIFF File",
+        filetypes=[("XLIFF files", "*.xlf"), ("All Files", "*.*")]
+    )
+    if not xliff_file:
+        logging.info("No file selected. Exiting.")
+        return
+
+    review_file = filedialog.askopenfilename(
+        title="Select Reviewed Excel File",
+        filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"), ("TSV files", "*.tsv"),
+                   ("Parquet files", "*.parquet"), ("All Files", "*.*")]
+    )
+    if not review_file:
+        logging.info("No file selected. Exiting.")
+        return
+
+    output_file_path = filedialog.asksaveasfilename(
+        title="Save Merged XLIFF As",
+        defaultextension=".xlf",
+        filetypes=[("XLIFF files", "*.xlf"), ("All Files", "*.*")],
+        initialfile=f"{os.path.splitext(os.path.basename(xliff_file))[0]}_merged.xlf"
+    )
+    if not output_file_path:
+        logging.info("File save operation was cancelled.")
+        return
+
+    def merged(result):
+        from tkinter import messagebox
+        messagebox.showinfo("Success", f"{result['updated']} targets updated and {result['added']} added.\n"
+                                       f"{len(result['unknown_ids'])} reviewed IDs were not found in the XLIFF.\n"
+                                       f"Merged file saved at {output_file_path}")
+
+    run_job(root, "Merge Excel into XLIFF",
+            lambda job: merge_reviewed_file(xliff_file, review_file, output_file_path, job=job), merged)
+
+
+# Function to select returned feedback workbooks and their XLIFF files, and write the corrected XLIFF files
+def apply_feedback_workbooks(root):
+    from tkinter import filedialog
+
+    feedback_files = filedialog.askopenfilenames(
+        title="Select Returned Feedback Workbooks",
+        filetypes=[("Excel files", "*.xlsx"), ("All Files", "*.*")]
+    )
+    if not feedback_files:
+        logging.info("No files selected. Exiting.")
+        return
+
+    xliff_files = filedialog.askopenfilenames(
+        title="Select the XLIFF Files the Feedback Was Made From",
+        filetypes=[("XLIFF files", "*.xlf"), ("All Files", "*.*")]
+    )
+    if not xliff_files:
+        logging.info("No files selected. Exiting.")
+        return
+
+    output_folder = filedialog.askdirectory(title="Select Output Folder for the Corrected XLIFF Files")
+    if not output_folder:
+        logging.info("No output folder selected. Exiting.")
+        return
+
+    run_job(root, "Applying Feedback",
+            lambda job: batch_apply_feedback(feedback_files, xliff_files, output_folder, job=job),
+            lambda result: show_batch_summary(result, f"Corrected XLIFF files saved in {output_folder}"))
+
+
+# Exit status of the "validate" command: 0 when every target is filled in and fits its maxwidth,
+# 1 when a file could not be read, 3 when targets are too long and 4 when targets are only empty or "<>"
+validation_exit_codes = {"ok": 0, "error": 1, "too_long": 3, "untranslated": 4}
+
+validation_summary_headers = ["Language", "Files", "Units", "Translated", "Empty", "Placeholder", "Too Long",
+                              "Fill Rate"]
+validation_violation_headers = ["Language", "File", "ID", "Issue", "Max Width", "Size Unit", "Length", "Target"]
+
+
+# Function to measure a target in the given size-unit, or None if the unit can't be measured from the text
+def measure_length(text, size_unit):
+    if size_unit in ("", "char"):
+        return len(text)
+    if size_unit == "byte":
+        return len(text.encode("utf-8"))
+    return None
+
+
+# Function to check every target of an XLIFF file against its maxwidth and size-unit in column-wise passes.
+# Lengths are counted in characters, or in UTF-8 bytes when size-unit is "byte"; other units (e.g. pixel) are not
+# measured. Empty and "<>" targets are reported as untranslated instead of being measured.
+# It runs in worker processes that see each file once, so the table isn't kept in the parse cache.
+@timed_stage("validate_xliff_file")
+def validate_xliff_file(xliff_file):
+    with instrumentation.stage("load"):
+        table = load_trans_unit_table(xliff_file, remember=False)
+    targets = [target or "" for target in table.targets]
+    stripped = [target.strip() for target in targets]
+
+    # maxwidth and size-unit only take a handful of distinct values, so each one is parsed once
+    limits_by_value = {value: parse_max_width(value) for value in set(table.max_widths)}
+    limits = list(map(limits_by_value.get, table.max_widths))
+    if set(table.size_units) <= {"", "char"}:
+        lengths = list(map(len, targets))
+    else:
+        lengths = list(map(measure_length, targets, table.size_units))
+
+    violations = []
+    counts = {"Empty": 0, "Placeholder": 0, "Too Long": 0}
+    for row, (text, length, limit) in enumerate(zip(stripped, lengths, limits)):
+        if not text:
+            issue = "Empty"
+        elif text == "<>":
+            issue = "Placeholder"
+        elif limit is not None and length is not None and length > limit:
+            issue = "Too Long"
+        else:
+            continue
+        counts[issue] += 1
+        violations.append((table.ids[row], issue, limit, table.size_units[row], length, targets[row]))
+
+    return {
+        "file": xliff_file,
+        "language": table.target_language,
+        "units": len(table),
+        "empty": counts["Empty"],
+        "placeholder": counts["Placeholder"],
+        "too_long": counts["Too Long"],
+        "violations": violations,
+    }
+
+
+# Function to validate many XLIFF files in parallel worker processes and total the results per language
+def validate_xliff_files(xliff_files, max_workers=None, job=None):
+    tasks = {xliff_file: (xliff_file,) for xliff_file in xliff_files}
+    results, errors = run_in_process_pool(validate_xliff_file, tasks, max_workers, job)
+
+    languages = {}
+    for xliff_file in xliff_files:
+        if xliff_file not in results:
+            continue
+        result = results[xliff_file]
+        summary = languages.setdefault(result["language"], {"files": 0, "units": 0, "empty": 0, "placeholder": 0,
+                                                            "too_long": 0})
+        summary["files"] += 1
+        for key in ("units", "empty", "placeholder", "too_long"):
+            summary[key] += result[key]
+
+    for summary in languages.values():
+        translated = summary["units"] - summary["empty"] - summary["placeholder"]
+        summary["translated"] = translated
+        summary["fill_rate"] = round(translated / summary["units"], 4) if summary["units"] else 1.0
+
+    return results, errors, dict(sorted(languages.items()))
+
+
+# Function to pick the exit status of a validation run
+def validation_exit_code(languages, errors):
+    if errors:
+        return validation_exit_codes["error"]
+    if any(summary["too_long"] for summary in languages.values()):
+        return validation_exit_codes["too_long"]
+    if any(summary["empty"] or summary["placeholder"] for summary in languages.values()):
+        return validation_exit_codes["untranslated"]
+    return validation_exit_codes["ok"]
+
+
+# Function to save the validation report: a Summary sheet per language and a Violations sheet per unit
+@timed_stage("save_validation_report")
+def save_validation_report(results, languages, report_file):
+    report_wb = create_write_only_workbook()
+    summary_ws = create_write_only_sheet(report_wb, "Summary")
+    append_styled_row(summary_ws, validation_summary_headers, header_style_name)
+    for language, summary in languages.items():
+        append_styled_row(summary_ws, [language, summary["files"], summary["units"], summary["translated"],
+                                       summary["empty"], summary["placeholder"], summary["too_long"],
+                                       summary["fill_rate"]])
+
+    violations_ws = create_write_only_sheet(report_wb, "Violations")
+    append_styled_row(violations_ws, validation_violation_headers, header_style_name)
+    for result in results.values():
+        file_name = os.path.basename(result["file"])
+        for violation in result["violations"]:
+            append_styled_row(violations_ws, [result["language"], file_name, *violation])
+
+    report_wb.save(report_file)
+    logging.info(f"Validation report saved at {report_file}")
+    return report_file
+
+
+# Function to build the validation summary printed on the command line
+def format_validation_summary(languages, errors):
+    lines = [f"{'Language':<12}{'Units':>10}{'Fill Rate':>11}{'Empty':>9}{'<>':>9}{'Too Long':>10}"]
+    for language, summary in languages.items():
+        lines.append(f"{language:<12}{summary['units']:>10}{summary['fill_rate']:>11.1%}{summary['empty']:>9}"
+                     f"{summary['placeholder']:>9}{summary['too_long']:>10}")
+    if errors:
+        lines.append("\nErrors:\n" + "\n".join(f"{os.path.basename(key)}: {error}"
+                                               for key, error in sorted(errors.items())))
+    return "\n".join(lines)
+
+
+# Columns of the integrity scan report
+integrity_headers = ["File", "Sheet", "Location", "ID", "Issue", "Detail"]
+
+# One problem found by the integrity scanner; location is "line N" in an XLIFF file or "row N" in a sheet
+IntegrityIssue = namedtuple("IntegrityIssue", ["file", "sheet", "location", "id", "issue", "detail"])
+
+
+# Index of the IDs seen in one input, with the location and content hash of their first occurrence.
+# Entries are kept in a dict until spill_threshold is reached, then moved to a temporary on-disk SQLite database,
+# so memory stays bounded on inputs of any size. IDs are checked in batches, like translation memory lookups.
+class IdIndex:
+    def __init__(self, spill_threshold=500000):
+        self.spill_threshold = spill_threshold
+        self.entries = {}  # ID -> (location, content hash)
+        self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    # Add a batch of (id, location, content hash) entries.
+    # Returns (id, location, content hash, first location, first content hash) for each ID that was seen before.
+    def add_batch(self, batch):
+        spilled = {}
+        if self.connection:
+            spilled = self.lookup_spilled([entry[0] for entry in batch if entry[0] not in self.entries])
+
+        repeated = []
+        for id_value, location, hash_value in batch:
+            first = self.entries.get(id_value) or spilled.get(id_value)
+            if first:
+                repeated.append((id_value, location, hash_value) + first)
+            else:
+                self.entries[id_value] = (location, hash_value)
+
+        if len(self.entries) >= self.spill_threshold:
+            self.spill()
+        return repeated
+
+    def spill(self):
+        if not self.connection:
+            # An empty file name gives a private temporary database that SQLite deletes on close
+            self.connection = sqlite3.connect("")
+            self.connection.executescript("""
+                PRAGMA journal_mode = OFF;
+                PRAGMA synchronous = OFF;
+                CREATE TABLE ids (id TEXT PRIMARY KEY, location INTEGER NOT NULL, hash BLOB NOT NULL) WITHOUT ROWID;
+                CREATE TEMP TABLE lookup_ids (id TEXT NOT NULL);
+            """)
+        with self.connection:
+            self.connection.executemany("INSERT OR IGNORE INTO ids VALUES (?, ?, ?)",
+                                        ((id_value, location, hash_value)
+                                         for id_value, (location, hash_value) in self.entries.items()))
+        self.entries.clear()
+
+    def lookup_spilled(self, ids):
+        found = {}
+        if not ids:
+            return found
+        with self.connection:
+            self.connection.execute("DELETE FROM lookup_ids")
+            self.connection.executemany("INSERT INTO lookup_ids VALUES (?)", ((id_value,) for id_value in ids))
+            rows = self.connection.execute("SELECT ids.id, ids.location, ids.hash FROM lookup_ids "
+                                           "JOIN ids ON ids.id = lookup_ids.id")
+            for id_value, location, hash_value in rows:
+                found[id_value] = (location, hash_value)
+        return found
+
+
+# Function to turn the repeated IDs returned by IdIndex.add_batch into duplicate issues
+def duplicate_issues(repeated, file_name, sheet_name, unit, first_unit, action):
+    for id_value, location, hash_value, first_location, first_hash in repeated:
+        if hash_value == first_hash:
+            yield IntegrityIssue(file_name, sheet_name, f"{unit} {location}", id_value, "Duplicate ID",
+                                 f"Same as {first_unit} {first_location}; {action}")
+        else:
+            yield IntegrityIssue(file_name, sheet_name, f"{unit} {location}", id_value, "Conflicting Duplicate",
+                                 f"Source or target differs from {first_unit} {first_location}; {action}")
+
+
+# Function to stream an XLIFF file through expat and report its integrity issues with line numbers:
+# missing IDs and sources, non-numeric maxwidth values, units with repeated or nested elements,
+# duplicate and conflicting duplicate IDs, and XML that isn't well-formed.
+def scan_xliff_file(xliff_file, spill_threshold=500000, chunk_size=1 << 20, job=None):
+    file_name = os.path.basename(xliff_file)
+    parser = expat.ParserCreate(namespace_separator="}")
+    issues = []
+    batch = []
+    unit = None
+    text_parts = None
+
+    def issue(line, id_value, kind, detail=""):
+        issues.append(IntegrityIssue(file_name, "", f"line {line}", id_value, kind, detail))
+
+    def start_element(name, attributes):
+        nonlocal unit, text_parts
+        tag = local_name(name)
+        if tag == "trans-unit":
+            if unit is not None:
+                issue(parser.CurrentLineNumber, attributes.get("id", ""), "Malformed Unit",
+                      f"Nested inside the trans-unit at line {unit['line']}")
+            unit = {"line": parser.CurrentLineNumber, "id": attributes.get("id"),
+                    "maxwidth": attributes.get("maxwidth"), "source": [], "target": []}
+        elif unit is not None and text_parts is None and tag in ("source", "target"):
+            text_parts = []
+            unit[tag].append(text_parts)
+
+    def character_data(data):
+        if text_parts is not None:
+            text_parts.append(data)
+
+    def end_element(name):
+        nonlocal unit, text_parts
+        tag = local_name(name)
+        if tag in ("source", "target") and text_parts is not None and unit[tag] and unit[tag][-1] is text_parts:
+            text_parts = None
+        elif tag == "trans-unit" and unit is not None:
+            check_unit(unit)
+            unit = None
+
+    def check_unit(unit):
+        line, id_value = unit["line"], unit["id"]
+        if not id_value:
+            issue(line, "", "Missing ID", "The trans-unit has no id attribute")
+        for tag in ("source", "target"):
+            if len(unit[tag]) > 1:
+                issue(line, id_value or "", "Malformed Unit", f"{len(unit[tag])} <{tag}> elements")
+        source = "".join(unit["source"][0]) if unit["source"] else ""
+        target = "".join(unit["target"][0]) if unit["target"] else ""
+        if not source.strip():
+            issue(line, id_value or "", "Missing Source", "No <source> element" if not unit["source"]
+                  else "Empty <source>")
+        if unit["maxwidth"] is not None and parse_max_width(unit["maxwidth"]) is None:
+            issue(line, id_value or "", "Invalid Max Width", f"maxwidth=\"{unit['maxwidth']}\" is not a number")
+        if id_value:
+            batch.append((id_value, line, content_hash(f"{source}\x00{target}")))
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+    parser.buffer_text = True
+
+    with open(xliff_file, "rb") as f, IdIndex(spill_threshold) as index:
+        file_size = os.fstat(f.fileno()).st_size
+        while True:
+            chunk = f.read(chunk_size)
+            try:
+                parser.Parse(chunk, not chunk)
+            except expat.ExpatError as e:
+                issue(e.lineno, "", "Malformed XML", expat.errors.messages[e.code])
+                chunk = b""
+
+            yield from issues
+            issues.clear()
+            yield from duplicate_issues(index.add_batch(batch), file_name, "", "line", "line",
+                                        "only the first one is converted")
+            batch.clear()
+            if not chunk:
+                break
+            if job:
+                job.progress(f.tell(), file_size, f"Scanning {file_name}")
+
+
+# Function to check the rows of one sheet, numbered from row 2 under the header, before they are converted
+# to XLIFF. Reports the cells that would be written as "None", non-numeric maxwidth values and the
+# duplicate IDs that the conversion drops.
+def scan_sheet_rows(rows, file_name, sheet_name, spill_threshold=500000, batch_size=5000):
+    with IdIndex(spill_threshold) as index:
+        for rows_batch in batched(enumerate(rows, 2), batch_size):
+            ids = []
+            for row_number, row in rows_batch:
+                row = tuple(row) + (None,) * (5 - len(row))
+                location = f"row {row_number}"
+                if all(value is None or str(value).strip() == "" for value in row):
+                    yield IntegrityIssue(file_name, sheet_name, location, "", "Empty Row",
+                                         "Converted to a trans-unit with the ID \"None\"")
+                    continue
+
+                id_value = "" if row[0] is None else str(row[0])
+                if not id_value.strip():
+                    yield IntegrityIssue(file_name, sheet_name, location, "", "Missing ID",
+                                         "Converted with the ID \"None\"")
+                if row[3] is None or not str(row[3]).strip():
+                    yield IntegrityIssue(file_name, sheet_name, location, id_value, "Missing Source",
+                                         "Converted with the source \"None\"" if row[3] is None else "Empty source")
+                if row[1] is None:
+                    yield IntegrityIssue(file_name, sheet_name, location, id_value, "Missing Max Width",
+                                         "Converted with maxwidth=\"None\"")
+                elif parse_max_width(str(row[1])) is None:
+                    yield IntegrityIssue(file_name, sheet_name, location, id_value, "Invalid Max Width",
+                                         f"\"{row[1]}\" is not a number")
+                if id_value.strip():
+                    ids.append((id_value, row_number, content_hash(f"{row[3]}\x00{row[4]}")))
+
+            yield from duplicate_issues(index.add_batch(ids), file_name, sheet_name, "row", "row",
+                                        "dropped by the conversion")
+
+
+# Function to scan an XLIFF file, or every sheet of an Excel, CSV, TSV or Parquet file
+def scan_input_file(input_file, spill_threshold=500000, job=None):
+    if input_file.lower().endswith((".xlf", ".xliff")):
+        yield from scan_xliff_file(input_file, spill_threshold, job=job)
+        return
+
+    file_name = os.path.basename(input_file)
+    for sheet_name, rows in iter_sheet_rows(input_file):
+        yield from scan_sheet_rows(rows, file_name, sheet_name, spill_threshold)
+
+
+# Function to scan several inputs and stream the issues to a report file (.xlsx, .csv, .tsv or .parquet).
+# Returns the number of issues of each kind, and the files that couldn't be read.
+@timed_stage("scan_files")
+def scan_files(input_files, report_file=None, spill_threshold=500000, job=None):
+    issue_counts = {}
+    errors = {}
+
+    def issues():
+        for input_file in input_files:
+            try:
+                for issue in scan_input_file(input_file, spill_threshold, job):
+                    issue_counts[issue.issue] = issue_counts.get(issue.issue, 0) + 1
+                    yield issue
+            except JobCancelled:
+                raise
+            except Exception as e:
+                errors[input_file] = str(e)
+                logging.error(f"An error occurred while scanning {input_file}: {e}")
+
+    if report_file:
+        save_table_rows(report_file, integrity_headers, instrumentation.timed_iter("scan", issues()), "Integrity")
+        logging.info(f"Integrity report saved at {report_file}")
+    else:
+        for issue in instrumentation.timed_iter("scan", issues()):
+            print(f"{issue.file}{' ' + issue.sheet if issue.sheet else ''} {issue.location}: "
+                  f"{issue.issue} {issue.id!r} {issue.detail}")
+    return issue_counts, errors
+
+
+# Name of the file in the watch output folder that records the content hash of every file already processed
+watch_state_name = "watch_state.json"
+
+# Files picked up by the watch mode: XLIFF files are converted to Excel, .objectTranslation files packaged
+watch_file_extensions = (".xlf", ".xliff", ".objecttranslation")
+
+
+# Function to import the optional watchdog package, which gets file events from inotify (or the native API of
+# other platforms). Returns None when it isn't installed, and the watch mode polls the folders instead.
+def import_watchdog():
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        return None
+    return Observer, FileSystemEventHandler
+
+
+# Long-running watch mode: new and changed files in the input folders are converted (XLIFF to Excel) or packaged
+# (the deployment package of their language is rebuilt) without anyone clicking through the GUI.
+# A file is only picked up once its size and modification time haven't changed for settle_seconds, so files
+# that are still being copied are left alone. Tasks run in a process pool with at most max_workers of them in
+# flight, and never two at once for the same file or language. The content hash of every processed file is
+# saved in watch_state.json, so a restart only processes the files that changed while it was stopped.
+class FolderWatcher:
+    rescan_interval = 60  # Full rescans with the watchdog backend, in case events were dropped
+
+    def __init__(self, input_folders, output_folder, max_workers=None, settle_seconds=2.0, poll_interval=1.0,
+                 output_format="xlsx", translation_memory_file=None, fuzzy_index_file=None, fuzzy_min_score=70):
+        self.input_folders = [os.path.abspath(folder) for folder in input_folders]
+        self.excel_folder = os.path.join(output_folder, "Excel")
+        self.package_folder = os.path.join(output_folder, "Packages")
+        self.state_path = os.path.join(output_folder, watch_state_name)
+        self.max_workers = max_workers or batch_workers
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.conversion_options = (translation_memory_file, False, output_format, fuzzy_index_file, fuzzy_min_score)
+        os.makedirs(output_folder, exist_ok=True)
+        self.processed = self.read_state()
+        self.signatures = {}  # path -> ((size, mtime_ns), time the file was first seen with them)
+        self.handled = {}  # path -> (size, mtime_ns) of the version that was last processed or skipped
+        self.changed_paths = queue.Queue()
+        self.pending = {}  # task key -> {path: content hash} waiting for a free worker
+        self.running = {}  # future -> (task key, {path: content hash})
+        self.errors = {}
+        self.stop_event = threading.Event()
+
+    def read_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f).get("files", {})
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            logging.warning(f"Ignoring the unreadable watch state: {e}")
+            return {}
+
+    def write_state(self):
+        temp_state_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(temp_state_path, "w", encoding="utf-8") as f:
+            json.dump({"files": self.processed}, f, indent=2, sort_keys=True)
+        os.replace(temp_state_path, self.state_path)
+
+    @staticmethod
+    def is_watched(path):
+        name = os.path.basename(path)
+        return name.lower().endswith(watch_file_extensions) and not name.startswith((".", "~$"))
+
+    # Walk the input folders for watched files
+    def scan(self):
+        for input_folder in self.input_folders:
+            for folder, _, file_names in os.walk(input_folder):
+                for file_name in file_names:
+                    if self.is_watched(file_name):
+                        yield os.path.join(folder, file_name)
+
+    # Start a watchdog observer that queues the paths of file events, or return None to poll instead
+    def start_observer(self):
+        watchdog = import_watchdog()
+        if not watchdog:
+            return None
+        Observer, FileSystemEventHandler = watchdog
+        changed_paths = self.changed_paths
+
+        class ChangeHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if not event.is_directory:
+                    for path in (event.src_path, getattr(event, "dest_path", "")):
+                        if path and FolderWatcher.is_watched(path):
+                            changed_paths.put(os.fsdecode(path))
+
+        observer = Observer()
+        for input_folder in self.input_folders:
+            observer.schedule(ChangeHandler(), input_folder, recursive=True)
+        observer.start()
+        return observer
+
+    # Check if a file has settled: same size and modification time for settle_seconds, and not handled yet
+    def is_ready(self, path, now):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self.signatures.pop(path, None)
+            self.handled.pop(path, None)
+            return False
+
+        signature = (stat.st_size, stat.st_mtime_ns)
+        known = self.signatures.get(path)
+        if known is None or known[0] != signature:
+            self.signatures[path] = (signature, now)
+            return False
+        return self.handled.get(path) != signature and now - known[1] >= self.settle_seconds
+
+    def is_settled(self, path):
+        return path in self.signatures and self.handled.get(path) == self.signatures[path][0]
+
+    # Queue the settled files whose content changed since they were last processed
+    def queue_ready(self, paths):
+        for path in paths:
+            self.handled[path] = self.signatures[path][0]
+            try:
+                content_hash = file_content_hash(path)
+                if self.processed.get(path) == content_hash:
+                    continue
+                if path.lower().endswith(".objecttranslation"):
+                    key = ("package", parse_object_translation_name(path)[1])
+                else:
+                    key = ("xliff", path)
+            except (OSError, ValueError) as e:
+                self.errors[path] = str(e)
+                logging.error(f"Skipping {path}: {e}")
+                continue
+            self.pending.setdefault(key, {})[path] = content_hash
+            logging.info(f"Queued {path}")
+
+    # Function and arguments of a task; a package task covers every settled file of its language
+    def task(self, key):
+        kind, name = key
+        if kind == "xliff":
+            return convert_xliff_file, (name, self.excel_folder) + self.conversion_options
+
+        input_file_paths = []
+        for path in self.signatures:
+            if path.lower().endswith(".objecttranslation") and self.is_settled(path):
+                try:
+                    if parse_object_translation_name(path)[1] == name:
+                        input_file_paths.append(path)
+                except ValueError:
+                    continue
+        os.makedirs(self.package_folder, exist_ok=True)
+        return build_language_package, (name, sorted(input_file_paths), self.package_folder)
+
+    # Submit pending tasks while fewer than max_workers are running
+    def submit(self, executor):
+        running_keys = {key for key, _ in self.running.values()}
+        for key in list(self.pending):
+            if len(self.running) >= self.max_workers:
+                break
+            if key in running_keys:
+                continue  # Wait for the running task of the same file or language, so outputs stay in order
+            function, args = self.task(key)
+            self.running[submit_pool_task(executor, function, args)] = (key, self.pending.pop(key))
+            running_keys.add(key)
+
+    # Record the hashes of the tasks that finished, so they aren't processed again.
+    # With retry=True the files of a failed task are no longer marked as handled, so they are processed again
+    # once they have settled for another settle_seconds, even if they didn't change.
+    def collect(self, retry=True):
+        for future in [future for future in self.running if future.done()]:
+            key, hashes = self.running.pop(future)
+            try:
+                output_path = pool_task_result(future)
+            except Exception as e:
+                now = time.monotonic()
+                for path in hashes:
+                    self.errors[path] = str(e)
+                    if retry and path in self.signatures:
+                        self.handled.pop(path, None)
+                        self.signatures[path] = (self.signatures[path][0], now)
+                logging.error(f"An error occurred while processing {key[1]}: {e}")
+                continue
+            self.processed.update(hashes)
+            for path in hashes:
+                self.errors.pop(path, None)
+            self.write_state()
+            message = f"{'Converted' if key[0] == 'xliff' else 'Packaged'} {', '.join(hashes)} -> {output_path}"
+            logging.info(message)
+            print(message)
+
+    def stop(self):
+        self.stop_event.set()
+
+    # Watch until stop() is called. With once=True, return as soon as every file present has been processed;
+    # failed files are then left in errors instead of being retried.
+    def run(self, once=False):
+        observer = self.start_observer()
+        logging.info(f"Watching {', '.join(self.input_folders)} "
+                     f"({'file events' if observer else f'polling every {self.poll_interval:g}s'})")
+        last_scan = None
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_pool_worker) as executor:
+                while not self.stop_event.is_set():
+                    now = time.monotonic()
+                    paths = set()
+                    while not self.changed_paths.empty():
+                        paths.add(self.changed_paths.get_nowait())
+                    if observer is None or last_scan is None or now - last_scan >= self.rescan_interval:
+                        paths.update(self.scan())
+                        last_scan = now
+                    paths.update(path for path in self.signatures if not self.is_settled(path))
+
+                    self.queue_ready([path for path in sorted(paths) if self.is_ready(path, now)])
+                    self.submit(executor)
+                    if self.running:
+                        wait(list(self.running), timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                        self.collect(retry=not once)
+                    elif once and not self.pending and all(map(self.is_settled, self.signatures)):
+                        break
+                    else:
+                        self.stop_event.wait(self.poll_interval)
+        finally:
+            if observer:
+                observer.stop()
+                observer.join()
+
+
+# Function to start the Tkinter GUI
+def run_gui():
+    import tkinter as tk
 
-# GUI update to add the new button
-if __name__ == "__main__":
     root = tk.Tk()
     root.title("Excel to XLIFF Converter")
-    root.geometry("300x320")
+    root.geometry("300x470")
     btn_width = 30
 
-    btn_excel_to_xliff = tk.Button(root, text="Excel to XLIFF", command=select_excel_to_xliff, width=btn_width)
+    btn_excel_to_xliff = tk.Button(root, text="Excel to XLIFF", command=lambda: select_excel_to_xliff(root),
+                                   width=btn_width)
     btn_excel_to_xliff.pack(pady=10)
 
-    btn_xliff_to_excel = tk.Button(root, text="XLIFF to Excel", command=select_xliff_to_excel, width=btn_width)
+    btn_xliff_to_excel = tk.Button(root, text="XLIFF to Excel", command=lambda: select_xliff_to_excel(root),
+                                   width=btn_width)
     btn_xliff_to_excel.pack(pady=10)
 
-    btn_multiple_xliff_to_excel = tk.Button(root, text="Multiple Files XLIFF to Excel", command=multiple_xliff_to_excel,
-                                            width=btn_width)
+    btn_multiple_xliff_to_excel = tk.Button(root, text="Multiple Files XLIFF to Excel",
+                                            command=lambda: multiple_xliff_to_excel(root), width=btn_width)
     btn_multiple_xliff_to_excel.pack(pady=10)
 
     btn_select_files = tk.Button(root, text="Feedback file automation", command=lambda: select_two_files(root),
@@ -617,10 +3654,473 @@ if __name__ == "__main__":
                                    , width=btn_width)
     btn_create_package.pack(pady=10)
 
-    btn_compare_files = tk.Button(root, text="Files Comparison", command=compare_xliffs, width=btn_width)
+    btn_compare_files = tk.Button(root, text="Files Comparison", command=lambda: compare_xliffs(root),
+                                  width=btn_width)
     btn_compare_files.pack(pady=10)
 
+    btn_language_matrix = tk.Button(root, text="Language Matrix", command=lambda: language_matrix(root),
+                                    width=btn_width)
+    btn_language_matrix.pack(pady=10)
+
+    btn_merge_reviewed = tk.Button(root, text="Merge Excel into XLIFF", command=lambda: merge_reviewed_xliff(root),
+                                   width=btn_width)
+    btn_merge_reviewed.pack(pady=10)
+
+    btn_apply_feedback = tk.Button(root, text="Apply Feedback Workbooks",
+                                   command=lambda: apply_feedback_workbooks(root), width=btn_width)
+    btn_apply_feedback.pack(pady=10)
+
     lbl_version = tk.Label(root, text=f"{version}")
     lbl_version.pack(pady=10)
 
     root.mainloop()
+
+
+# Function to expand files, directories and glob patterns given on the command line into a list of files
+def expand_input_paths(patterns, extensions):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(entry.path for entry in os.scandir(pattern)
+                                if entry.is_file() and entry.name.lower().endswith(extensions)))
+        elif any(char in pattern for char in "*?["):
+            paths.extend(sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path)))
+        else:
+            paths.append(pattern)
+
+    # Drop duplicates while keeping the order the inputs were given in
+    return list(dict.fromkeys(paths))
+
+
+# Command line handler for "excel-to-xliff"
+def cli_excel_to_xliff(args):
+    results, errors = {}, {}
+    for excel_file in expand_input_paths(args.inputs, (".xlsx", ".xlsm") + table_file_extensions):
+        try:
+            sheet_results, sheet_errors = batch_excel_to_xliff(excel_file, args.output, args.workers,
+                                                               translation_memory_file=args.tm)
+        except Exception as e:
+            errors[excel_file] = str(e)
+            continue
+        results.update((f"{excel_file}: {sheet_name}", path) for sheet_name, path in sheet_results.items())
+        errors.update((f"{excel_file}: {sheet_name}", error) for sheet_name, error in sheet_errors.items())
+
+    print(format_batch_summary(results, errors))
+    return 1 if errors else 0
+
+
+# Command line handler for "xliff-to-excel"
+def cli_xliff_to_excel(args):
+    translation_memory = TranslationMemory(args.tm) if args.tm else None
+    fuzzy_index = FuzzyIndex(args.fuzzy_index, args.min_score) if args.fuzzy_index else None
+    try:
+        with recording_translation_memory(translation_memory):
+            if args.output and is_table_file(args.output):
+                output_file_path, _ = xliff_to_table(args.input, args.output, translation_memory, args.delta,
+                                                     fuzzy_index=fuzzy_index)
+            else:
+                wb, target_language = xliff_to_excel(args.input, True, translation_memory, args.delta,
+                                                     fuzzy_index=fuzzy_index)
+                output_file_path = args.output or f"Excel to xlf {target_language}.xlsx"
+                with instrumentation.stage("save workbook"):
+                    wb.save(output_file_path)
+    finally:
+        if translation_memory:
+            translation_memory.close()
+        if fuzzy_index:
+            fuzzy_index.close()
+    logging.info(f"XLIFF converted to Excel and saved at {output_file_path}")
+    return 0
+
+
+# Command line handler for "batch"
+def cli_batch(args):
+    xliff_files = expand_input_paths(args.inputs, (".xlf", ".xliff"))
+    results, errors = batch_xliff_to_excel(xliff_files, args.output, args.workers,
+                                           translation_memory_file=args.tm, delta=args.delta,
+                                           output_format=args.format, fuzzy_index_file=args.fuzzy_index,
+                                           fuzzy_min_score=args.min_score)
+    print(format_batch_summary(results, errors))
+    return 1 if errors else 0
+
+
+# Command line handler for "feedback"
+def cli_feedback(args):
+    translation_memory = TranslationMemory(args.tm) if args.tm else None
+    try:
+        with recording_translation_memory(translation_memory):
+            create_feedback_file(args.source, args.output, args.english, args.source_output, translation_memory)
+    finally:
+        if translation_memory:
+            translation_memory.close()
+    return 0
+
+
+# Function to add the translation memory options to a subcommand
+def add_translation_memory_arguments(sub, delta=True):
+    sub.add_argument("--tm", metavar="PATH",
+                     help=f"Translation memory database to use (e.g. {translation_memory_path})")
+    if delta:
+        sub.add_argument("--delta", action="store_true",
+                         help="Only export units that are new or changed since the last run (requires --tm)")
+
+
+# Function to add the fuzzy-match options to a subcommand
+def add_fuzzy_index_arguments(sub):
+    sub.add_argument("--fuzzy-index", metavar="PATH",
+                     help=f"Fuzzy-match index to suggest translations for empty targets from "
+                          f"(e.g. {fuzzy_index_path})")
+    sub.add_argument("--min-score", type=int, default=70,
+                     help="Lowest similarity score, in percent, of a fuzzy-match suggestion (default: 70)")
+
+
+# Command line handler for "fuzzy-index"
+def cli_fuzzy_index(args):
+    xliff_files = expand_input_paths(args.inputs, (".xlf", ".xliff"))
+    if not xliff_files:
+        logging.error("No XLIFF files found.")
+        return 1
+
+    errors = {}
+    with FuzzyIndex(args.index) as fuzzy_index:
+        for xliff_file in xliff_files:
+            try:
+                added = fuzzy_index.add_file(xliff_file)
+            except Exception as e:
+                errors[xliff_file] = str(e)
+                logging.error(f"An error occurred while indexing {xliff_file}: {e}")
+                continue
+            print(f"{xliff_file}: " + ("unchanged" if added is None else f"{added} new pairs indexed"))
+    return 1 if errors else 0
+
+
+# Command line handler for "apply-feedback"
+def cli_apply_feedback(args):
+    feedback_files = expand_input_paths(args.feedback, (".xlsx", ".xlsm"))
+    xliff_files = expand_input_paths(args.xliff, (".xlf", ".xliff"))
+    results, errors = batch_apply_feedback(feedback_files, xliff_files, args.output, args.workers)
+    for result in sorted(results.values(), key=lambda result: result["language"]):
+        print(f"{result['language']}: {result['changed']} targets changed, {result['unchanged']} unchanged, "
+              f"{result['rejected']} rejected" + (f" ({result['report_file']})" if result["report_file"] else ""))
+    print(format_batch_summary(results, errors))
+    return 1 if errors else 0
+
+
+# Command line handler for "package"
+def cli_package(args):
+    input_file_paths = expand_input_paths(args.inputs, (".objecttranslation",))
+    if not input_file_paths:
+        logging.error("No .objectTranslation files found.")
+        return 1
+    results, errors, unchanged = build_deployment_packages(input_file_paths, args.output, args.workers,
+                                                           incremental=args.incremental)
+    print(format_package_summary(results, errors, unchanged))
+    return 1 if errors else 0
+
+
+# Command line handler for "acknowledge"
+def cli_acknowledge(args):
+    acknowledged = acknowledge_deployment_packages(args.output, args.languages)
+    for language_code, object_count in acknowledged.items():
+        print(f"{language_code}: {object_count} objects acknowledged as deployed")
+    if not acknowledged:
+        print("No packages waiting to be acknowledged.")
+    return 0
+
+
+# Command line handler for "compare"
+def cli_compare(args):
+    compare_xliff_files(args.old, args.new, args.output)
+    return 0
+
+
+# Command line handler for "merge"
+def cli_merge(args):
+    result = merge_reviewed_file(args.xliff, args.review, args.output, args.sheet)
+    print(f"{result['updated']} targets updated, {result['added']} added, {result['unchanged']} unchanged")
+    if result["unknown_ids"]:
+        print(f"{len(result['unknown_ids'])} reviewed IDs are not in {os.path.basename(args.xliff)}: "
+              f"{', '.join(result['unknown_ids'][:20])}{' ...' if len(result['unknown_ids']) > 20 else ''}")
+    return 0
+
+
+# Command line handler for "split"
+def cli_split(args):
+    size = parse_size(args.size) if args.size else None
+    manifest_file, results, errors = split_xliff_file(args.input, args.output, args.by, size, args.format,
+                                                      args.workers)
+    print(format_batch_summary(results, errors))
+    print(f"Shard manifest saved at {manifest_file}")
+    return 1 if errors else 0
+
+
+# Command line handler for "reassemble"; exits with 3 when units are missing or extra
+def cli_reassemble(args):
+    result = reassemble_shards(args.manifest, args.output, args.original)
+    print(f"{result['updated']} targets updated, {result['added']} added, {result['unchanged']} unchanged")
+    for shard_name in result["missing_shards"]:
+        print(f"Shard {shard_name} was not returned")
+    for unit_id in result["missing"]:
+        print(f"Missing: {unit_id!r}")
+    for shard_file, row_number, unit_id, reason in result["extra"]:
+        print(f"Extra: {shard_file} row {row_number}: {unit_id!r} {reason}")
+    return 3 if result["missing"] or result["extra"] or result["missing_shards"] else 0
+
+
+# Command line handler for "watch"; runs until it is interrupted, or with --once until every file is processed
+def cli_watch(args):
+    watcher = FolderWatcher(args.inputs, args.output, args.workers, args.settle, args.interval, args.format,
+                            args.tm, args.fuzzy_index, args.min_score)
+    signal.signal(signal.SIGTERM, lambda *_: watcher.stop())
+    try:
+        watcher.run(args.once)
+    except KeyboardInterrupt:
+        logging.info("Watch mode stopped.")
+    return 1 if args.once and watcher.errors else 0
+
+
+# Command line handler for "matrix"
+def cli_matrix(args):
+    xliff_files = expand_input_paths(args.inputs, (".xlf", ".xliff"))
+    if not xliff_files:
+        logging.error("No XLIFF files found.")
+        return 1
+    save_language_matrix(xliff_files, args.output)
+    return 0
+
+
+# Command line handler for "scan"
+def cli_scan(args):
+    input_files = expand_input_paths(args.inputs, (".xlf", ".xliff", ".xlsx", ".xlsm") + table_file_extensions)
+    if not input_files:
+        logging.error("No input files found.")
+        return 1
+
+    issue_counts, errors = scan_files(input_files, args.output, args.spill_threshold)
+    total = sum(issue_counts.values())
+    print(f"{total} issues found in {len(input_files)} files." + "".join(
+        f"\n  {issue}: {count}" for issue, count in sorted(issue_counts.items())))
+    if errors:
+        print("\nErrors:\n" + "\n".join(f"{os.path.basename(key)}: {error}" for key, error in sorted(errors.items())))
+
+    # Same exit status as "validate": 1 when a file couldn't be read, 3 when issues were found
+    return 1 if errors else 3 if total else 0
+
+
+# Command line handler for "validate"
+def cli_validate(args):
+    xliff_files = expand_input_paths(args.inputs, (".xlf", ".xliff"))
+    if not xliff_files:
+        logging.error("No XLIFF files found.")
+        return validation_exit_codes["error"]
+
+    results, errors, languages = validate_xliff_files(xliff_files, args.workers)
+    print(format_validation_summary(languages, errors))
+    if args.output:
+        save_validation_report(results, languages, args.output)
+
+    exit_code = validation_exit_code(languages, errors)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"exit_code": exit_code, "languages": languages, "errors": errors}, f, indent=2,
+                      ensure_ascii=False)
+    return exit_code
+
+
+# Function to build the command line parser with one subcommand per operation
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Convert between XLIFF and Excel, automate feedback files, compare XLIFFs and build "
+                    "deployment packages. Run without arguments to open the GUI."
+    )
+    parser.add_argument("--version", action="version", version=version)
+    parser.add_argument("--timing-report", metavar="PATH",
+                        help="Write the time, CPU time and calls of every stage of the run to a JSON file")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Also profile the run with cProfile: save the stats to PATH (.prof) and list the hot "
+                             "paths in the timing report")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also record the peak traced memory of every stage with tracemalloc (slower)")
+    parser.add_argument("--parse-cache", metavar="DIR", default=parse_cache_folder,
+                        help="Keep parsed XLIFF files in this folder so unchanged files aren't parsed again "
+                             "(default: $EXPORT_XLF_PARSE_CACHE)")
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+
+    sub = subparsers.add_parser("excel-to-xliff", help="Convert every sheet of Excel workbooks to XLIFF files")
+    sub.add_argument("inputs", nargs="+", help="Excel, CSV, TSV or Parquet files, directories or glob patterns")
+    sub.add_argument("-o", "--output", required=True, help="Folder for the <sheet>_output.xlf files")
+    sub.add_argument("-w", "--workers", type=int, default=None,
+                     help=f"Number of worker processes (default: {batch_workers})")
+    add_translation_memory_arguments(sub, delta=False)
+    sub.set_defaults(handler=cli_excel_to_xliff)
+
+    sub = subparsers.add_parser("xliff-to-excel", help="Convert one XLIFF file to an Excel workbook")
+    sub.add_argument("input", help="XLIFF file")
+    sub.add_argument("-o", "--output", help="Excel, CSV, TSV or Parquet file to write "
+                                            "(default: 'Excel to xlf <lang>.xlsx')")
+    add_translation_memory_arguments(sub)
+    add_fuzzy_index_arguments(sub)
+    sub.set_defaults(handler=cli_xliff_to_excel)
+
+    sub = subparsers.add_parser("batch", help="Convert multiple XLIFF files to Excel, one folder per language")
+    sub.add_argument("inputs", nargs="+", help="XLIFF files, directories or glob patterns")
+    sub.add_argument("-o", "--output", required=True, help="Base folder for the <lang>/Excel to xlf <lang>.xlsx files")
+    sub.add_argument("-w", "--workers", type=int, default=None,
+                     help=f"Number of worker processes (default: {batch_workers})")
+    sub.add_argument("-f", "--format", choices=["xlsx", "csv", "tsv", "parquet"], default="xlsx",
+                     help="Output format (default: xlsx)")
+    add_translation_memory_arguments(sub)
+    add_fuzzy_index_arguments(sub)
+    sub.set_defaults(handler=cli_batch)
+
+    sub = subparsers.add_parser("fuzzy-index", help="Add the translated units of XLIFF files to the fuzzy-match index")
+    sub.add_argument("inputs", nargs="+", help="XLIFF files, directories or glob patterns")
+    sub.add_argument("--index", metavar="PATH", help=f"Fuzzy-match index to update (default: {fuzzy_index_path})")
+    sub.set_defaults(handler=cli_fuzzy_index)
+
+    sub = subparsers.add_parser("feedback", help="Create a feedback workbook for a source language XLIFF")
+    sub.add_argument("source", help="Source language XLIFF file")
+    sub.add_argument("-e", "--english", help="Optional English XLIFF file with reference translations")
+    sub.add_argument("-o", "--output", required=True, help="Feedback Excel file to write")
+    sub.add_argument("--source-output", help="Also write the plain source language Excel file")
+    add_translation_memory_arguments(sub, delta=False)
+    sub.set_defaults(handler=cli_feedback)
+
+    sub = subparsers.add_parser("apply-feedback", help="Apply the customer feedback of returned feedback workbooks "
+                                                       "to their XLIFF files")
+    sub.add_argument("feedback", nargs="+", help="Feedback workbooks, directories or glob patterns")
+    sub.add_argument("--xliff", nargs="+", required=True,
+                     help="XLIFF files the feedback workbooks were made from, matched by target-language")
+    sub.add_argument("-o", "--output", required=True, help="Base folder for the corrected <lang>/ XLIFF files")
+    sub.add_argument("-w", "--workers", type=int, default=None,
+                     help=f"Number of worker processes (default: {batch_workers})")
+    sub.set_defaults(handler=cli_apply_feedback)
+
+    sub = subparsers.add_parser("package", help="Create deployment packages from .objectTranslation files")
+    sub.add_argument("inputs", nargs="+", help=".objectTranslation files, directories or glob patterns")
+    sub.add_argument("-o", "--output", required=True, help="Base folder for the deployment packages")
+    sub.add_argument("-w", "--workers", type=int, default=None,
+                     help=f"Number of worker processes (default: {batch_workers})")
+    sub.add_argument("--incremental", action="store_true",
+                     help=f"Only package the objects that changed since the last acknowledged deployment, "
+                          f"tracked in <output>/{package_manifest_name}")
+    sub.set_defaults(handler=cli_package)
+
+    sub = subparsers.add_parser("acknowledge", help="Mark the deployment packages last built into a folder as "
+                                                    "deployed, for the next incremental package run")
+    sub.add_argument("output", help="Base folder of the deployment packages")
+    sub.add_argument("-l", "--languages", nargs="+", metavar="LANG",
+                     help="Only acknowledge the packages of these languages (default: all)")
+    sub.set_defaults(handler=cli_acknowledge)
+
+    sub = subparsers.add_parser("compare", help="Compare an old and a new XLIFF file")
+    sub.add_argument("old", help="Old XLIFF file")
+    sub.add_argument("new", help="New XLIFF file")
+    sub.add_argument("-o", "--output", required=True, help="Comparison Excel file to write")
+    sub.set_defaults(handler=cli_compare)
+
+    sub = subparsers.add_parser("merge", help="Merge the targets of a reviewed workbook back into the original XLIFF")
+    sub.add_argument("xliff", help="Original XLIFF file")
+    sub.add_argument("review", help="Reviewed Excel, CSV, TSV or Parquet file")
+    sub.add_argument("-o", "--output", required=True, help="Merged XLIFF file to write")
+    sub.add_argument("--sheet", help="Sheet to read (default: the sheet named after the target language)")
+    sub.set_defaults(handler=cli_merge)
+
+    sub = subparsers.add_parser("split", help="Split an XLIFF file into shard workbooks by unit count, size or "
+                                              "ID prefix")
+    sub.add_argument("input", help="XLIFF file to split")
+    sub.add_argument("-o", "--output", required=True, help="Folder for the shards and the shard manifest")
+    sub.add_argument("--by", choices=list(shard_default_sizes), default="count",
+                     help="Split every --size units, every --size bytes of text, or by ID prefix (default: count)")
+    sub.add_argument("--size", help="Units or bytes per shard, e.g. 50000 or 20M (default: 50000 units, 20M bytes)")
+    sub.add_argument("-f", "--format", choices=["xlsx", "csv", "tsv", "parquet"], default="xlsx",
+                     help="Shard file format (default: xlsx)")
+    sub.add_argument("-w", "--workers", type=int, default=None,
+                     help=f"Number of worker processes (default: {batch_workers})")
+    sub.set_defaults(handler=cli_split)
+
+    sub = subparsers.add_parser("reassemble", help="Merge returned shards back into one XLIFF file")
+    sub.add_argument("manifest", help="Shard manifest written by split (<name>_shards.json)")
+    sub.add_argument("-o", "--output", required=True, help="Reassembled XLIFF file to write")
+    sub.add_argument("--original", help="Original XLIFF file, if it has moved since it was split")
+    sub.set_defaults(handler=cli_reassemble)
+
+    sub = subparsers.add_parser("watch", help="Watch folders and convert or package new and changed files "
+                                              "automatically")
+    sub.add_argument("inputs", nargs="+", help="Folders to watch for XLIFF and .objectTranslation files")
+    sub.add_argument("-o", "--output", required=True,
+                     help=f"Output folder for the Excel/ and Packages/ folders and {watch_state_name}")
+    sub.add_argument("-w", "--workers", type=int, default=None,
+                     help=f"Number of worker processes (default: {batch_workers})")
+    sub.add_argument("-f", "--format", choices=["xlsx", "csv", "tsv", "parquet"], default="xlsx",
+                     help="Output format of converted XLIFF files (default: xlsx)")
+    sub.add_argument("--settle", type=float, default=2.0,
+                     help="Seconds a file must stay unchanged before it is processed (default: 2)")
+    sub.add_argument("--interval", type=float, default=1.0, help="Seconds between checks (default: 1)")
+    sub.add_argument("--once", action="store_true", help="Process the files present now and exit")
+    add_translation_memory_arguments(sub, delta=False)
+    add_fuzzy_index_arguments(sub)
+    sub.set_defaults(handler=cli_watch)
+
+    sub = subparsers.add_parser("matrix", help="Join XLIFF files of several languages into one matrix by ID")
+    sub.add_argument("inputs", nargs="+", help="XLIFF files, directories or glob patterns, one per language")
+    sub.add_argument("-o", "--output", required=True, help="Matrix file to write (.xlsx, .csv, .tsv or .parquet)")
+    sub.set_defaults(handler=cli_matrix)
+
+    sub = subparsers.add_parser("scan", help="Report duplicate IDs, missing sources, invalid maxwidth values and "
+                                             "malformed units")
+    sub.add_argument("inputs", nargs="+", help="XLIFF, Excel, CSV, TSV or Parquet files, directories or glob patterns")
+    sub.add_argument("-o", "--output", help="Report file to write (.xlsx, .csv, .tsv or .parquet); "
+                                            "printed if not given")
+    sub.add_argument("--spill-threshold", type=int, default=500000,
+                     help="IDs kept in memory before the index moves to a temporary database (default: 500000)")
+    sub.set_defaults(handler=cli_scan)
+
+    sub = subparsers.add_parser("validate", help="Check targets against their maxwidth and flag untranslated units")
+    sub.add_argument("inputs", nargs="+", help="XLIFF files, directories or glob patterns")
+    sub.add_argument("-o", "--output", help="Excel report to write, with a Summary and a Violations sheet")
+    sub.add_argument("--json", metavar="PATH", help="Per-language summary and exit status as JSON")
+    sub.add_argument("-w", "--workers", type=int, default=None,
+                     help=f"Number of worker processes (default: {batch_workers})")
+    sub.set_defaults(handler=cli_validate)
+
+    return parser
+
+
+# Entry point: run a command line operation, or open the GUI when no command is given
+def main(argv=None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "delta", False) and not args.tm:
+        parser.error("--delta requires --tm")
+    if args.trace_memory and not (args.timing_report or args.profile):
+        parser.error("--trace-memory requires --timing-report or --profile")
+    if args.parse_cache:
+        # Worker processes read the folder from the environment
+        os.environ["EXPORT_XLF_PARSE_CACHE"] = parse_cache.folder = args.parse_cache
+    if not args.command:
+        run_gui()
+        return 0
+
+    timing_report = args.timing_report or (os.path.splitext(args.profile)[0] + ".json" if args.profile else None)
+    if timing_report:
+        instrumentation.enable(args.trace_memory)
+    profiler = cProfile.Profile() if args.profile else None
+    start = time.perf_counter()
+    try:
+        with instrumentation.stage(args.command):
+            if profiler:
+                return profiler.runcall(args.handler, args)
+            return args.handler(args)
+    except Exception as e:
+        logging.error(f"An error occurred while running '{args.command}': {e}")
+        return 1
+    finally:
+        if timing_report:
+            write_timing_report(timing_report, sys.argv[1:] if argv is None else list(argv),
+                                time.perf_counter() - start, profiler, args.profile)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+# Every test starts with an empty in-memory parse cache and no disk cache, whatever the environment says
+@pytest.fixture(autouse=True)
+def fresh_parse_cache(monkeypatch):
+    monkeypatch.setattr(main, "parse_cache", main.ParseCache())
@@ -0,0 +1,59 @@
+# Sample files and small file helpers shared by the tests
+
+
+# A hand-written XLIFF with the shapes the generators don't produce: a namespace, a self-closing target,
+# a unit without a target, inline markup, entities and CRLF line breaks
+tricky_xliff = (
+    '<?xml version="1.0" encoding="UTF-8"?>\r\n'
+    '<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" version="1.2">\r\n'
+    '  <file original="Salesforce" source-language="en_US" target-language="fr" datatype="xml">\r\n'
+    '    <body>\r\n'
+    '      <trans-unit id="CustomLabel.Greeting" maxwidth="40" size-unit="char">\r\n'
+    '        <source>Hello &amp; welcome</source>\r\n'
+    '        <target>Bonjour &amp; bienvenue</target>\r\n'
+    '        <note>Shown on the &lt;home&gt; page</note>\r\n'
+    '      </trans-unit>\r\n'
+    '      <trans-unit id="CustomLabel.Empty" maxwidth="20" size-unit="char">\r\n'
+    '        <source>Empty</source>\r\n'
+    '        <target/>\r\n'
+    '      </trans-unit>\r\n'
+    '      <trans-unit id="CustomLabel.Missing" maxwidth="20" size-unit="char">\r\n'
+    '        <source>Missing</source>\r\n'
+    '      </trans-unit>\r\n'
+    '      <trans-unit id="CustomLabel.Inline" maxwidth="80" size-unit="char">\r\n'
+    '        <source>Click <g id="1">here</g> now</source>\r\n'
+    '        <target>Cliquez <g id="1">ici</g> maintenant</target>\r\n'
+    '      </trans-unit>\r\n'
+    '    </body>\r\n'
+    '  </file>\r\n'
+    '</xliff>\r\n'
+)
+
+# The same file without the XLIFF namespace, as Salesforce exports it
+plain_xliff = tricky_xliff.replace(' xmlns="urn:oasis:names:tc:xliff:document:1.2"', "")
+
+
+# Function to build a small XLIFF file from (id, maxwidth, source, target) tuples; a target of None is left out
+def build_xliff(units, target_language="fr"):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<xliff version="1.2">',
+             f'    <file original="Salesforce" source-language="en_US" target-language="{target_language}" '
+             f'datatype="xml">', "        <body>"]
+    for unit_id, max_width, source, target in units:
+        lines.append(f'            <trans-unit id="{unit_id}" maxwidth="{max_width}" size-unit="char">')
+        lines.append(f"                <source>{source}</source>")
+        if target is not None:
+            lines.append(f"                <target>{target}</target>")
+        lines.append("            </trans-unit>")
+    lines += ["        </body>", "    </file>", "</xliff>", ""]
+    return "\n".join(lines)
+
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def write_text(path, text):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    return str(path)
@@ -0,0 +1,59 @@
+import openpyxl
+
+import main
+from samples import build_xliff, write_text
+
+
+old_units = [
+    ("CustomLabel.Same", 20, "Save", "Enregistrer"),
+    ("CustomLabel.Source", 20, "Close", "Fermer"),
+    ("CustomLabel.Target", 20, "Open", "Ouvrir"),
+    ("CustomLabel.Both", 20, "Edit", "Modifier"),
+    ("CustomLabel.Removed", 20, "Delete", "Supprimer"),
+    ("CustomLabel.Empty", 20, "New", None),
+]
+
+new_units = [
+    ("CustomLabel.Added", 20, "Clone", "Cloner"),
+    ("CustomLabel.Same", 20, "Save", "Enregistrer"),
+    ("CustomLabel.Source", 20, "Close all", "Fermer"),
+    ("CustomLabel.Target", 20, "Open", "Ouvrir le fichier"),
+    ("CustomLabel.Both", 20, "Edit all", "Tout modifier"),
+    ("CustomLabel.Empty", 20, "New", ""),
+]
+
+
+def test_diff_classifies_every_unit(tmp_path):
+    old_file = write_text(tmp_path / "old.xlf", build_xliff(old_units))
+    new_file = write_text(tmp_path / "new.xlf", build_xliff(new_units))
+
+    statuses = {(new_unit or old_unit).id: status for status, old_unit, new_unit in
+                main.diff_xliff_files(old_file, new_file)}
+
+    assert statuses == {
+        "CustomLabel.Added": "Added",
+        "CustomLabel.Same": "Unchanged",
+        "CustomLabel.Source": "Source Changed",
+        "CustomLabel.Target": "Target Changed",
+        # A changed source wins over a changed target
+        "CustomLabel.Both": "Source Changed",
+        "CustomLabel.Removed": "Removed",
+        # A missing target and an empty one hash the same
+        "CustomLabel.Empty": "Unchanged",
+    }
+
+
+def test_compare_counts_each_status_in_the_summary_sheet(tmp_path):
+    old_file = write_text(tmp_path / "old.xlf", build_xliff(old_units))
+    new_file = write_text(tmp_path / "new.xlf", build_xliff(new_units))
+    comparison_file = tmp_path / "comparison.xlsx"
+
+    status_counts = main.compare_xliff_files(old_file, new_file, str(comparison_file))
+
+    assert status_counts == {"Added": 1, "Removed": 1, "Source Changed": 2, "Target Changed": 1, "Unchanged": 2}
+    wb = openpyxl.load_workbook(comparison_file, read_only=True)
+    summary = dict(wb["Summary"].iter_rows(min_row=2, values_only=True))
+    rows = list(wb["Comparison"].iter_rows(min_row=2, values_only=True))
+    wb.close()
+    assert summary == status_counts
+    assert len(rows) == 7
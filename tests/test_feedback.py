@@ -0,0 +1,85 @@
+import os
+
+import openpyxl
+
+import main
+from samples import build_xliff, plain_xliff, read_bytes, write_text
+
+
+# Function to make the feedback workbook of an XLIFF file and fill in the customer's feedback by ID
+def returned_feedback(xliff_file, feedback_file, feedback, extra_rows=()):
+    main.create_feedback_file(xliff_file, str(feedback_file))
+    wb = openpyxl.load_workbook(feedback_file)
+    ws = wb.worksheets[0]
+    feedback_column = [cell.value for cell in ws[1]].index("Feedback By Customer")
+    for row in ws.iter_rows(min_row=2):
+        if row[0].value in feedback:
+            row[feedback_column].value = feedback[row[0].value]
+    for extra_row in extra_rows:
+        ws.append(extra_row)
+    wb.save(feedback_file)
+    return str(feedback_file)
+
+
+def test_accepted_feedback_is_patched_and_the_rest_reported(tmp_path):
+    xliff_file = write_text(tmp_path / "fr.xlf", plain_xliff)
+    feedback_file = returned_feedback(xliff_file, tmp_path / "fr_with_Feedback.xlsx", {
+        "CustomLabel.Greeting": "Salut & bienvenue",
+        "CustomLabel.Empty": "Une traduction beaucoup trop longue",
+    }, [("CustomLabel.Unknown", 20, "char", "Unknown", None, None, "Inconnu")])
+
+    language, accepted, rejected = main.read_customer_feedback(feedback_file)
+    assert language == "fr"
+    assert sorted(accepted) == ["CustomLabel.Greeting", "CustomLabel.Unknown"]
+    assert [(row[0], row[-1]) for row in rejected] == [("CustomLabel.Empty", "Too long, should be at most 20 chars")]
+
+    result = main.apply_feedback_file(feedback_file, {"fr": xliff_file}, str(tmp_path / "corrected"))
+
+    output_file_path = str(tmp_path / "corrected" / "fr" / "fr.xlf")
+    assert result == {"language": "fr", "xliff_file": output_file_path, "changed": 1, "unchanged": 0,
+                      "rejected": 2, "report_file": str(tmp_path / "corrected" / "fr" / "fr_feedback_rejections.xlsx")}
+    # Only the accepted target changes; everything else is copied byte for byte
+    assert read_bytes(output_file_path) == plain_xliff.replace(
+        "<target>Bonjour &amp; bienvenue</target>", "<target>Salut &amp; bienvenue</target>").encode("utf-8")
+
+    wb = openpyxl.load_workbook(result["report_file"], read_only=True)
+    report_rows = list(wb.worksheets[0].iter_rows(values_only=True))
+    wb.close()
+    assert list(report_rows[0]) == main.feedback_rejection_headers
+    assert [(row[0], row[5], row[-1]) for row in report_rows[1:]] == [
+        ("CustomLabel.Empty", "Une traduction beaucoup trop longue", "Too long, should be at most 20 chars"),
+        ("CustomLabel.Unknown", "Inconnu", "ID not in the XLIFF"),
+    ]
+
+
+def test_a_clean_run_removes_the_old_rejection_report(tmp_path):
+    xliff_file = write_text(tmp_path / "fr.xlf", plain_xliff)
+    output_folder = str(tmp_path / "corrected")
+    rejected_file = returned_feedback(xliff_file, tmp_path / "rejected.xlsx",
+                                      {"CustomLabel.Empty": "Une traduction beaucoup trop longue"})
+    accepted_file = returned_feedback(xliff_file, tmp_path / "accepted.xlsx", {"CustomLabel.Empty": "Vide"})
+
+    report_file = main.apply_feedback_file(rejected_file, {"fr": xliff_file}, output_folder)["report_file"]
+    assert os.path.exists(report_file)
+
+    result = main.apply_feedback_file(accepted_file, {"fr": xliff_file}, output_folder)
+    assert (result["changed"], result["rejected"], result["report_file"]) == (1, 0, None)
+    assert not os.path.exists(report_file)
+
+
+def test_batch_matches_feedback_workbooks_to_xliff_languages(tmp_path):
+    fr_file = write_text(tmp_path / "fr.xlf", build_xliff([("CustomLabel.Save", 20, "Save", "Sauver")]))
+    de_file = write_text(tmp_path / "de.xlf", build_xliff([("CustomLabel.Save", 20, "Save", "Sichern")], "de"))
+    other_fr_file = write_text(tmp_path / "fr_copy.xlf", build_xliff([("CustomLabel.Save", 20, "Save", "")]))
+    fr_feedback = returned_feedback(fr_file, tmp_path / "fr_with_Feedback.xlsx", {"CustomLabel.Save": "Enregistrer"})
+    de_feedback = returned_feedback(de_file, tmp_path / "de_with_Feedback.xlsx", {"CustomLabel.Save": "Speichern"})
+
+    results, errors = main.batch_apply_feedback([fr_feedback, de_feedback], [fr_file, other_fr_file],
+                                                str(tmp_path / "corrected"), max_workers=2)
+
+    assert list(results) == [fr_feedback]
+    assert results[fr_feedback]["changed"] == 1
+    assert {unit.id: unit.target for unit in main.iter_trans_units(results[fr_feedback]["xliff_file"])} == \
+        {"CustomLabel.Save": "Enregistrer"}
+    assert errors == {other_fr_file: "fr.xlf already has target-language 'fr'",
+                      de_feedback: "No XLIFF file with target-language 'de'"}
@@ -0,0 +1,55 @@
+import difflib
+
+import main
+from samples import build_xliff, write_text
+
+
+stored_pairs = [
+    ("Save the record before closing the window", "Enregistrez la fiche avant de fermer la fenêtre"),
+    ("Delete all selected attachments", "Supprimer toutes les pièces jointes sélectionnées"),
+    ("Account owner email address", "Adresse e-mail du propriétaire du compte"),
+]
+
+
+def test_near_duplicate_source_returns_the_stored_translation(tmp_path):
+    with main.FuzzyIndex(str(tmp_path / "fuzzy.sqlite")) as fuzzy_index:
+        assert fuzzy_index.add_pairs("fr", stored_pairs) == 3
+
+        query = "Save the record before closing this window"
+        target, score = fuzzy_index.suggest("fr", query)
+
+        assert target == stored_pairs[0][1]
+        assert score == round(difflib.SequenceMatcher(None, stored_pairs[0][0], query, autojunk=False).ratio() * 100)
+        assert score >= fuzzy_index.min_score
+        assert fuzzy_index.suggest("fr", stored_pairs[1][0]) == (stored_pairs[1][1], 100)
+
+
+def test_unrelated_source_returns_nothing(tmp_path):
+    with main.FuzzyIndex(str(tmp_path / "fuzzy.sqlite")) as fuzzy_index:
+        fuzzy_index.add_pairs("fr", stored_pairs)
+
+        assert fuzzy_index.suggest("fr", "Quarterly revenue forecast by region") is None
+        # Pairs are only matched within their language
+        assert fuzzy_index.suggest("de", stored_pairs[0][0]) is None
+
+
+def test_indexed_files_fill_empty_targets_of_an_export(tmp_path):
+    translated_file = write_text(tmp_path / "old_fr.xlf", build_xliff([
+        ("CustomLabel.Save", 60, stored_pairs[0][0], stored_pairs[0][1]),
+        ("CustomLabel.Untranslated", 60, "Account owner email address", None),
+    ]))
+    export_file = write_text(tmp_path / "fr.xlf", build_xliff([
+        ("CustomLabel.SaveAgain", 60, "Save the record before closing this window", None),
+        ("CustomLabel.Forecast", 60, "Quarterly revenue forecast by region", ""),
+    ]))
+
+    with main.FuzzyIndex(str(tmp_path / "fuzzy.sqlite")) as fuzzy_index:
+        # Only translated units are indexed, and a file that didn't change isn't indexed again
+        assert fuzzy_index.add_file(translated_file) == 1
+        assert fuzzy_index.add_file(translated_file) is None
+        wb, _ = main.xliff_to_excel(export_file, fuzzy_index=fuzzy_index)
+
+    rows = list(wb.active.iter_rows(values_only=True))
+    assert list(rows[0]) == main.excel_headers + main.fuzzy_match_headers
+    assert rows[1][len(main.excel_headers)] == stored_pairs[0][1]
+    assert rows[2][len(main.excel_headers):] == (None, None)
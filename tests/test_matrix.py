@@ -0,0 +1,24 @@
+import main
+from samples import build_xliff, write_text
+
+
+def test_matrix_joins_languages_on_the_unit_id(tmp_path):
+    fr_file = write_text(tmp_path / "fr.xlf", build_xliff([
+        ("CustomLabel.Save", 10, "Save", "Enregistrer"),
+        ("CustomLabel.Close", 20, "Close", None),
+        ("CustomLabel.Save", 10, "Save again", "Doublon"),
+    ]))
+    de_file = write_text(tmp_path / "de.xlf", build_xliff([
+        ("CustomLabel.Open", "", "Open", "Öffnen"),
+        ("CustomLabel.Save", 12, "Save all", "Speichern"),
+    ], "de"))
+    other_fr_file = write_text(tmp_path / "fr_ca.xlf", build_xliff([("CustomLabel.Close", 20, "Close", "Fermer")]))
+
+    languages, rows = main.build_language_matrix([fr_file, de_file, other_fr_file])
+
+    assert languages == ["fr", "de", "fr (fr_ca.xlf)"]
+    assert list(rows) == [
+        ["CustomLabel.Save", 10, "Save", "Enregistrer", "Speichern", None],
+        ["CustomLabel.Close", 20, "Close", "", None, "Fermer"],
+        ["CustomLabel.Open", None, "Open", None, "Öffnen", None],
+    ]
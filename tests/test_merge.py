@@ -0,0 +1,54 @@
+import openpyxl
+import pytest
+
+import benchmark
+import main
+from samples import read_bytes, tricky_xliff, write_text
+
+
+# Function to export an XLIFF file to a workbook the way the GUI and the command line do
+def export_workbook(xliff_file, output_file_path):
+    wb, _ = main.xliff_to_excel(str(xliff_file), write_only=True)
+    wb.save(str(output_file_path))
+    return str(output_file_path)
+
+
+@pytest.mark.parametrize("xliff_name", ["generated", "tricky"])
+def test_merge_without_changes_is_byte_identical(tmp_path, xliff_name):
+    if xliff_name == "generated":
+        xliff_file = benchmark.generate_xliff(str(tmp_path / "fr.xlf"), 2000, "fr", note_ratio=0.3, empty_ratio=0.1)
+    else:
+        xliff_file = write_text(tmp_path / "fr.xlf", tricky_xliff)
+    review_file = export_workbook(xliff_file, tmp_path / "review.xlsx")
+
+    output_file_path = tmp_path / "merged.xlf"
+    result = main.merge_reviewed_file(xliff_file, review_file, str(output_file_path))
+
+    assert read_bytes(output_file_path) == read_bytes(xliff_file)
+    assert result["updated"] == result["added"] == 0
+    assert result["unknown_ids"] == []
+
+
+def test_merge_patches_only_the_reviewed_targets(tmp_path):
+    xliff_file = write_text(tmp_path / "fr.xlf", tricky_xliff)
+    review_file = tmp_path / "review.xlsx"
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "fr"
+    ws.append(main.excel_headers)
+    ws.append(["CustomLabel.Greeting", 40, "char", "Hello & welcome", "Salut & bienvenue", None])
+    ws.append(["CustomLabel.Empty", 20, "char", "Empty", "Vide", None])
+    ws.append(["CustomLabel.Missing", 20, "char", "Missing", "Manquant", None])
+    ws.append(["CustomLabel.Unknown", 20, "char", "Unknown", "Inconnu", None])
+    wb.save(review_file)
+
+    output_file_path = tmp_path / "merged.xlf"
+    result = main.merge_reviewed_file(xliff_file, str(review_file), str(output_file_path))
+
+    merged = {unit.id: unit.target for unit in main.iter_trans_units(str(output_file_path))}
+    assert merged["CustomLabel.Greeting"] == "Salut & bienvenue"
+    assert merged["CustomLabel.Empty"] == "Vide"
+    assert merged["CustomLabel.Missing"] == "Manquant"
+    assert result["unknown_ids"] == ["CustomLabel.Unknown"]
+    # The untouched unit with inline markup is copied byte for byte
+    assert b'<target>Cliquez <g id="1">ici</g> maintenant</target>' in read_bytes(output_file_path)
@@ -0,0 +1,139 @@
+import io
+import os
+import random
+import re
+import zipfile
+
+import pytest
+
+import benchmark
+import main
+
+
+# The re.sub passes that create_package used before strip_sections replaced them
+def regex_strip_sections(text, sections):
+    for section in sections:
+        text = re.sub(rf'<{section}>.*?</{section}>\s*', '', text, flags=re.DOTALL)
+    return text
+
+
+sample_object_translations = [
+    # Sections nested in a kept section and in each other
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<CustomObjectTranslation xmlns="http://soap.sforce.com/2006/04/metadata">\n'
+    '    <caseValues>\n        <value>Compte</value>\n    </caseValues>\n'
+    '    <fields>\n        <label>Nom</label>\n        <name>Name__c</name>\n    </fields>\n'
+    '    <layouts>\n        <layout>Layout</layout>\n'
+    '        <sections>\n            <label>Informations</label>\n        </sections>\n'
+    '        <fields><label>Nested</label></fields>\n    </layouts>\n\n\n'
+    '    <recordTypes>\n        <fields>\n            <label>Inside a kept section</label>\n        </fields>\n'
+    '        <label>Type</label>\n    </recordTypes>\n'
+    '    <nameFieldLabel>Nom du compte</nameFieldLabel>\n'
+    '    <webLinks>\n        <label>Lien</label>\n        <name>Link1</name>\n    </webLinks>'
+    '    <startsWith>Consonant</startsWith>\n</CustomObjectTranslation>\n',
+    # Self-closing and empty sections, sections back to back and an unclosed one at the end
+    '<CustomObjectTranslation>\n'
+    '    <fields/>\n    <fieldSets></fieldSets>\n'
+    '    <validationRules><errorMessage>Requis</errorMessage></validationRules><fields>\n'
+    '        <label>Après</label>\n    </fields>\r\n\t\n'
+    '    <layouts/>\n    <label>Gardé</label>\n'
+    '    <fieldSets>\n        <label>Jeu</label>\n',
+    # No sections to remove
+    '<CustomObjectTranslation>\n    <nameFieldLabel>Nom</nameFieldLabel>\n</CustomObjectTranslation>\n',
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+@pytest.mark.parametrize("text", sample_object_translations)
+def test_strip_sections_matches_the_regex_passes(text, chunk_size):
+    output = io.StringIO()
+    main.strip_sections(io.StringIO(text), output, main.sections_to_remove, chunk_size)
+
+    assert output.getvalue() == regex_strip_sections(text, main.sections_to_remove)
+
+
+def test_strip_sections_matches_the_regex_passes_on_random_sections():
+    rng = random.Random(7)
+    tags = main.sections_to_remove + ["label", "recordTypes"]
+    for _ in range(300):
+        parts = []
+        for _ in range(rng.randint(1, 12)):
+            tag = rng.choice(tags)
+            parts.append(rng.choice([f"<{tag}>", f"</{tag}>", f"<{tag}/>", "text ", "\n  ", "\t"]))
+        text = "".join(parts)
+
+        output = io.StringIO()
+        main.strip_sections(io.StringIO(text), output, main.sections_to_remove, rng.choice([1, 3, 1 << 20]))
+        assert output.getvalue() == regex_strip_sections(text, main.sections_to_remove), text
+
+
+def test_strip_sections_matches_the_regex_passes_on_generated_files(tmp_path):
+    for input_file_path in benchmark.generate_object_translations(str(tmp_path), 2, ("fr",)):
+        with open(input_file_path, encoding="utf-8") as f:
+            text = f.read()
+        output = io.StringIO()
+        main.strip_sections(io.StringIO(text), output, main.sections_to_remove, 100)
+        assert output.getvalue() == regex_strip_sections(text, main.sections_to_remove)
+
+
+def zip_members(zip_file_path):
+    with zipfile.ZipFile(zip_file_path) as zipf:
+        return sorted(name for name in zipf.namelist() if name.endswith(".objectTranslation"))
+
+
+def test_incremental_packages_keep_undeployed_changes_until_acknowledged(tmp_path):
+    input_file_paths = benchmark.generate_object_translations(str(tmp_path / "objects"), 3, ("fr", "de"))
+    output_folder = str(tmp_path / "packages")
+    fr_zip = os.path.join(output_folder, "fr_deployment_package.zip")
+    de_zip = os.path.join(output_folder, "de_deployment_package.zip")
+
+    results, errors, unchanged = main.build_deployment_packages(input_file_paths, output_folder, max_workers=2)
+    assert results == {"de": de_zip, "fr": fr_zip}
+    assert main.acknowledge_deployment_packages(output_folder) == {"de": 3, "fr": 3}
+    # The acknowledged zips are deployed, so they are removed
+    assert not os.path.exists(fr_zip) and not os.path.exists(de_zip)
+
+    # Nothing changed since the deployment: no language is packaged
+    results, errors, unchanged = main.build_deployment_packages(input_file_paths, output_folder, max_workers=2,
+                                                                incremental=True)
+    assert (results, errors, unchanged) == ({}, {}, ["de", "fr"])
+    assert main.format_package_summary(results, errors, unchanged) == \
+        "0 of 0 languages processed successfully.\n\nNo changes since the last deployment for: de, fr"
+    assert not os.path.exists(fr_zip) and not os.path.exists(de_zip)
+
+    changed = [path for path in input_file_paths if path.endswith("Object0__c-fr.objectTranslation")][0]
+    with open(changed, "a", encoding="utf-8") as f:
+        f.write("<!-- changed -->\n")
+    results, _, unchanged = main.build_deployment_packages(input_file_paths, output_folder, max_workers=2,
+                                                           incremental=True)
+    assert (results, unchanged) == ({"fr": fr_zip}, ["de"])
+    assert zip_members(fr_zip) == ["unpackaged/objectTranslations/Object0__c-fr.objectTranslation"]
+
+    # The delta wasn't acknowledged, so a later change is packaged together with it
+    changed = [path for path in input_file_paths if path.endswith("Object1__c-fr.objectTranslation")][0]
+    with open(changed, "a", encoding="utf-8") as f:
+        f.write("<!-- changed -->\n")
+    main.build_deployment_packages(input_file_paths, output_folder, max_workers=2, incremental=True)
+    assert zip_members(fr_zip) == ["unpackaged/objectTranslations/Object0__c-fr.objectTranslation",
+                                   "unpackaged/objectTranslations/Object1__c-fr.objectTranslation"]
+
+    assert main.acknowledge_deployment_packages(output_folder) == {"fr": 2}
+    assert not os.path.exists(fr_zip)
+    results, _, unchanged = main.build_deployment_packages(input_file_paths, output_folder, max_workers=2,
+                                                           incremental=True)
+    assert (results, unchanged) == ({}, ["de", "fr"])
+    assert not os.path.exists(fr_zip)
+
+
+def test_unchanged_languages_drop_a_stale_zip(tmp_path):
+    input_file_paths = benchmark.generate_object_translations(str(tmp_path / "objects"), 2, ("fr",))
+    output_folder = str(tmp_path / "packages")
+    fr_zip = os.path.join(output_folder, "fr_deployment_package.zip")
+    main.build_deployment_packages(input_file_paths, output_folder, max_workers=1)
+    main.acknowledge_deployment_packages(output_folder)
+
+    # A zip left from before the acknowledgement holds nothing new to deploy
+    with open(fr_zip, "wb") as f:
+        f.write(b"stale")
+    assert main.main(["package", *input_file_paths, "-o", output_folder, "--incremental"]) == 0
+    assert not os.path.exists(fr_zip)
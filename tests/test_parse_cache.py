@@ -0,0 +1,99 @@
+import pytest
+
+import benchmark
+import main
+
+
+def progress_events(job):
+    events = []
+    while not job.events.empty():
+        events.append(job.events.get_nowait())
+    return events
+
+
+def test_cache_hits_report_progress(tmp_path):
+    xliff_file = benchmark.generate_xliff(str(tmp_path / "fr.xlf"), 250, "fr")
+    main.load_trans_unit_table(xliff_file)
+
+    job = main.Job()
+    job.report_interval = 100
+    assert len(list(main.cached_trans_units(xliff_file, job))) == 250
+    assert [event[1:3] for event in progress_events(job)] == [(100, 250), (200, 250)]
+
+    main.load_trans_unit_table(xliff_file, job)
+    assert [event[1:3] for event in progress_events(job)] == [(250, 250)]
+
+
+def test_cache_hits_can_be_cancelled(tmp_path):
+    xliff_file = benchmark.generate_xliff(str(tmp_path / "fr.xlf"), 250, "fr")
+    main.load_trans_unit_table(xliff_file)
+
+    job = main.Job()
+    job.report_interval = 100
+    job.cancel()
+    with pytest.raises(main.JobCancelled):
+        list(main.cached_trans_units(xliff_file, job))
+    with pytest.raises(main.JobCancelled):
+        main.load_trans_unit_table(xliff_file, job)
+
+
+@pytest.fixture
+def parsed_files(monkeypatch):
+    parsed = []
+    iter_trans_units = main.iter_trans_units
+
+    def counting_iter_trans_units(xliff_file, job=None):
+        parsed.append(xliff_file)
+        return iter_trans_units(xliff_file, job)
+
+    monkeypatch.setattr(main, "iter_trans_units", counting_iter_trans_units)
+    return parsed
+
+
+def test_export_then_compare_parses_each_file_once(tmp_path, parsed_files):
+    old_file = benchmark.generate_xliff(str(tmp_path / "old.xlf"), 50, "fr")
+    new_file = benchmark.generate_xliff(str(tmp_path / "new.xlf"), 60, "fr")
+
+    main.xliff_to_table(new_file, str(tmp_path / "fr.csv"))
+    status_counts = main.compare_xliff_files(old_file, new_file, str(tmp_path / "comparison.xlsx"))
+
+    assert sum(status_counts.values()) == 60
+    assert sorted(parsed_files) == [new_file, old_file]
+
+
+def test_a_stream_that_stops_early_is_not_cached(tmp_path, parsed_files):
+    xliff_file = benchmark.generate_xliff(str(tmp_path / "fr.xlf"), 50, "fr")
+
+    units = main.cached_trans_units(xliff_file)
+    next(units)
+    units.close()
+    assert main.parse_cache.get(xliff_file) is None
+
+    assert len(list(main.cached_trans_units(xliff_file))) == 50
+    assert len(main.parse_cache.get(xliff_file)) == 50
+    assert parsed_files == [xliff_file, xliff_file]
+
+
+def test_workers_stream_without_caching_or_hashing(tmp_path, monkeypatch):
+    xliff_file = benchmark.generate_xliff(str(tmp_path / "fr.xlf"), 50, "fr")
+    monkeypatch.setattr(main.parse_cache, "remember_streams", False)
+    monkeypatch.setattr(main, "file_content_hash", lambda path: pytest.fail("hashed a file that isn't cached"))
+
+    assert len(list(main.cached_trans_units(xliff_file))) == 50
+    assert main.parse_cache.tables == {}
+
+
+def test_workers_fill_the_disk_cache(tmp_path, monkeypatch, parsed_files):
+    xliff_file = benchmark.generate_xliff(str(tmp_path / "fr.xlf"), 50, "fr")
+    monkeypatch.setattr(main, "parse_cache", main.ParseCache(str(tmp_path / "cache")))
+    main.parse_cache.remember_streams = False
+    hashed = []
+    file_content_hash = main.file_content_hash
+    monkeypatch.setattr(main, "file_content_hash", lambda path: hashed.append(path) or file_content_hash(path))
+
+    units = list(main.cached_trans_units(xliff_file))
+
+    assert list(main.cached_trans_units(xliff_file)) == units
+    assert main.parse_cache.tables == {}
+    assert parsed_files == [xliff_file]
+    assert len(hashed) == 1
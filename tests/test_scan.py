@@ -0,0 +1,58 @@
+import main
+from samples import build_xliff, write_text
+
+
+def units_with_duplicates(count=40):
+    units = [(f"CustomLabel.Unit{number}", 20, f"Source {number}", f"Cible {number}") for number in range(count)]
+    # Repeats of units that are spilled to disk long before, and of one in the same batch
+    units.append(("CustomLabel.Unit1", 20, "Source 1", "Cible 1"))
+    units.append(("CustomLabel.Unit2", 20, "Source 2", "Autre cible"))
+    units.append((f"CustomLabel.Unit{count - 1}", 20, f"Source {count - 1}", f"Cible {count - 1}"))
+    return units
+
+
+def duplicates(issues):
+    return [(issue.location, issue.id, issue.issue) for issue in issues
+            if issue.issue in ("Duplicate ID", "Conflicting Duplicate")]
+
+
+def test_xliff_duplicates_are_found_after_the_index_spills(tmp_path):
+    xliff_file = write_text(tmp_path / "fr.xlf", build_xliff(units_with_duplicates()))
+
+    in_memory = list(main.scan_xliff_file(xliff_file))
+    spilled = list(main.scan_xliff_file(xliff_file, spill_threshold=3, chunk_size=256))
+
+    assert spilled == in_memory
+    assert duplicates(spilled) == [
+        ("line 165", "CustomLabel.Unit1", "Duplicate ID"),
+        ("line 169", "CustomLabel.Unit2", "Conflicting Duplicate"),
+        ("line 173", "CustomLabel.Unit39", "Duplicate ID"),
+    ]
+
+
+def test_sheet_duplicates_are_found_after_the_index_spills():
+    rows = [(unit_id, max_width, "char", source, target) for unit_id, max_width, source, target in
+            units_with_duplicates()]
+
+    in_memory = list(main.scan_sheet_rows(rows, "fr.xlsx", "fr"))
+    spilled = list(main.scan_sheet_rows(rows, "fr.xlsx", "fr", spill_threshold=3, batch_size=4))
+
+    assert spilled == in_memory
+    assert duplicates(spilled) == [
+        ("row 42", "CustomLabel.Unit1", "Duplicate ID"),
+        ("row 43", "CustomLabel.Unit2", "Conflicting Duplicate"),
+        ("row 44", "CustomLabel.Unit39", "Duplicate ID"),
+    ]
+
+
+def test_each_file_gets_its_own_index(tmp_path):
+    fr_file = write_text(tmp_path / "fr.xlf", build_xliff(units_with_duplicates()))
+    de_file = write_text(tmp_path / "de.xlf", build_xliff(units_with_duplicates(10), "de"))
+    report_file = tmp_path / "integrity.csv"
+
+    issue_counts, errors = main.scan_files([fr_file, de_file], str(report_file), spill_threshold=3)
+
+    # The IDs shared by the two languages are not duplicates; the repeats inside each file are
+    assert errors == {}
+    assert issue_counts == {"Duplicate ID": 4, "Conflicting Duplicate": 2}
+    assert main.main(["scan", fr_file, de_file, "--spill-threshold", "3"]) == 3
@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+import benchmark
+import main
+from samples import read_bytes
+
+
+@pytest.mark.parametrize("mode, size", [("count", 300), ("bytes", 64 << 10), ("prefix", None)])
+def test_split_then_reassemble_is_byte_identical(tmp_path, mode, size):
+    xliff_file = benchmark.generate_xliff(str(tmp_path / "fr.xlf"), 1500, "fr")
+    shard_folder = tmp_path / "shards"
+
+    manifest_file, _, errors = main.split_xliff_file(xliff_file, str(shard_folder), mode, size, max_workers=2)
+    assert not errors
+
+    output_file_path = tmp_path / "reassembled.xlf"
+    result = main.reassemble_shards(manifest_file, str(output_file_path))
+
+    assert read_bytes(output_file_path) == read_bytes(xliff_file)
+    assert result["missing"] == result["extra"] == result["missing_shards"] == []
+
+
+def test_reassemble_reports_missing_shards(tmp_path):
+    xliff_file = benchmark.generate_xliff(str(tmp_path / "fr.xlf"), 900, "fr")
+    manifest_file, results, _ = main.split_xliff_file(xliff_file, str(tmp_path / "shards"), "count", 300,
+                                                      max_workers=2)
+    os.remove(sorted(results)[0])
+
+    result = main.reassemble_shards(manifest_file, str(tmp_path / "reassembled.xlf"))
+
+    assert len(result["missing_shards"]) == 1
+    assert read_bytes(tmp_path / "reassembled.xlf") == read_bytes(xliff_file)
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+import main
+from samples import build_xliff, read_bytes, write_text
+
+
+# Text with the characters that need quoting in CSV and TSV cells
+awkward_units = [
+    ("CustomLabel.Comma", 40, "Save, then close", "Enregistrer, puis fermer"),
+    ("CustomLabel.Tab", 40, "Name\tValue", "Nom\tValeur"),
+    ("CustomLabel.Quotes", 40, 'Say "hello"', "Dites « bonjour » et \"salut\""),
+    ("CustomLabel.Newline", 80, "First line\nSecond line", "Première ligne\n\nDeuxième ligne"),
+    ("CustomLabel.Entities", 40, "Tom &amp; Jerry &lt;3", "Tom &amp; Jerry &lt;3"),
+    ("CustomLabel.Empty", 20, "Empty", None),
+]
+
+
+def excel_round_trip(xliff_file, tmp_path):
+    wb, target_language = main.xliff_to_excel(xliff_file)
+    excel_file = str(tmp_path / "workbook" / f"{target_language}.xlsx")
+    os.makedirs(os.path.dirname(excel_file))
+    wb.save(excel_file)
+    main.excel_to_xliff(excel_file, str(tmp_path / "workbook"))
+    return read_bytes(tmp_path / "workbook" / f"{target_language}_output.xlf")
+
+
+@pytest.mark.parametrize("extension", [".csv", ".tsv", ".parquet"])
+def test_table_files_round_trip_like_a_workbook(tmp_path, extension):
+    if extension == ".parquet":
+        pytest.importorskip("pyarrow")
+    xliff_file = write_text(tmp_path / "fr.xlf", build_xliff(awkward_units))
+    table_file = str(tmp_path / f"Excel to xlf fr{extension}")
+
+    assert main.xliff_to_table(xliff_file, table_file) == (table_file, "fr")
+    main.excel_to_xliff(table_file, str(tmp_path / "table"))
+    output_file = str(tmp_path / "table" / "fr_output.xlf")
+
+    # The empty target gets the same placeholder as in a workbook
+    assert [(unit.id, unit.max_width, unit.source, unit.target) for unit in main.iter_trans_units(output_file)] == \
+        [(unit.id, unit.max_width, unit.source, unit.target or "<>") for unit in main.iter_trans_units(xliff_file)]
+    assert read_bytes(output_file) == excel_round_trip(xliff_file, tmp_path)
+
+
+@pytest.mark.parametrize("extension", [".csv", ".tsv"])
+def test_table_files_read_back_the_saved_rows(tmp_path, extension):
+    rows = [(unit_id, str(max_width), "char", source, target, None) for unit_id, max_width, source, target in
+            awkward_units]
+    table_file = main.save_table_rows(str(tmp_path / f"fr{extension}"), main.excel_headers, rows)
+
+    # Empty cells come back as None, like the cells of a read-only sheet
+    assert list(main.iter_table_rows(table_file)) == [
+        tuple(value or None for value in row) for row in rows]
+
+
+def test_table_files_need_the_export_columns(tmp_path):
+    table_file = main.save_table_rows(str(tmp_path / "fr.csv"), ["ID", "Source"], [("CustomLabel.Save", "Save")])
+
+    with pytest.raises(ValueError, match="must start with the columns"):
+        list(main.iter_table_rows(table_file))
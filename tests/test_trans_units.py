@@ -0,0 +1,72 @@
+from xml.etree import ElementTree as ET
+
+import pytest
+
+import benchmark
+import main
+from samples import plain_xliff, tricky_xliff, write_text
+
+
+# The ET.parse reader that xliff_to_excel used before iter_trans_units replaced it. It only finds the units of
+# files without a namespace.
+def parse_trans_units(xliff_file):
+    root = ET.parse(xliff_file).getroot()
+    units = []
+    for file_element in root.findall("file"):
+        for trans_unit in file_element.find("body").findall("trans-unit"):
+            units.append(main.TransUnit(
+                id=trans_unit.get("id", ""),
+                max_width=trans_unit.get("maxwidth", ""),
+                size_unit=trans_unit.get("size-unit", ""),
+                source=trans_unit.find("source").text if trans_unit.find("source") is not None else "",
+                target=trans_unit.find("target").text if trans_unit.find("target") is not None else "",
+                note=trans_unit.find("note").text if trans_unit.find("note") is not None else "",
+            ))
+    return units
+
+
+def test_iter_trans_units_matches_the_old_reader(tmp_path):
+    xliff_file = write_text(tmp_path / "fr.xlf", plain_xliff)
+    namespaced_file = write_text(tmp_path / "fr_namespaced.xlf", tricky_xliff)
+
+    units = list(main.iter_trans_units(xliff_file))
+
+    assert units == parse_trans_units(xliff_file)
+    # The old reader finds nothing in a namespaced file; the new one reads it like the plain one
+    assert list(main.iter_trans_units(namespaced_file)) == units
+    assert [unit.id for unit in units] == ["CustomLabel.Greeting", "CustomLabel.Empty", "CustomLabel.Missing",
+                                           "CustomLabel.Inline"]
+
+
+def test_iter_trans_units_matches_the_old_reader_on_generated_files(tmp_path):
+    xliff_file = benchmark.generate_xliff(str(tmp_path / "fr.xlf"), 500, "fr", scripts=("latin", "cjk", "arabic"))
+
+    assert list(main.iter_trans_units(xliff_file)) == parse_trans_units(xliff_file)
+
+
+@pytest.mark.parametrize("text", [tricky_xliff, plain_xliff], ids=["namespaced", "plain"])
+def test_iter_trans_units_reads_every_unit_shape(tmp_path, text):
+    units = {unit.id: unit for unit in main.iter_trans_units(write_text(tmp_path / "fr.xlf", text))}
+
+    greeting = units["CustomLabel.Greeting"]
+    assert (greeting.max_width, greeting.size_unit) == ("40", "char")
+    assert (greeting.source, greeting.target) == ("Hello & welcome", "Bonjour & bienvenue")
+    assert greeting.note == "Shown on the <home> page"
+
+    # An empty <target/> has no text, and a unit without a target reads as an empty string
+    assert units["CustomLabel.Empty"].target is None
+    assert units["CustomLabel.Missing"].target == ""
+    assert units["CustomLabel.Missing"].note == ""
+
+    # Like find(...).text, only the text before the first inline element is read
+    assert units["CustomLabel.Inline"].source == "Click "
+    assert units["CustomLabel.Inline"].target == "Cliquez "
+
+
+def test_iter_trans_units_reports_progress(tmp_path):
+    xliff_file = benchmark.generate_xliff(str(tmp_path / "fr.xlf"), 250, "fr")
+    job = main.Job()
+    job.report_interval = 100
+
+    assert len(list(main.iter_trans_units(xliff_file, job))) == 250
+    assert job.events.qsize() == 2
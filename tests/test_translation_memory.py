@@ -0,0 +1,72 @@
+import gc
+
+import openpyxl
+import pytest
+
+import benchmark
+import main
+
+
+def data_row_count(workbook_file):
+    wb = openpyxl.load_workbook(workbook_file, read_only=True)
+    try:
+        return sum(1 for _ in wb.active.iter_rows(min_row=2))
+    finally:
+        wb.close()
+
+
+# openpyxl can't close the sheet of a write-only workbook whose save failed, and reports it when it's collected
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+def test_delta_export_after_failed_save_exports_the_units_again(tmp_path):
+    xliff_file = benchmark.generate_xliff(str(tmp_path / "fr.xlf"), 200, "fr")
+    translation_memory_file = str(tmp_path / "tm.sqlite")
+    delta_args = ["--tm", translation_memory_file, "--delta"]
+
+    # The save fails, so nothing may be recorded as exported
+    assert main.main(["xliff-to-excel", xliff_file, "-o", str(tmp_path / "missing" / "fr.xlsx")] + delta_args) == 1
+    # The unsaved write-only sheet complains when it's collected, so collect it while the warning is ignored
+    gc.collect()
+
+    assert main.main(["xliff-to-excel", xliff_file, "-o", str(tmp_path / "first.xlsx")] + delta_args) == 0
+    assert data_row_count(tmp_path / "first.xlsx") == 200
+
+    assert main.main(["xliff-to-excel", xliff_file, "-o", str(tmp_path / "second.xlsx")] + delta_args) == 0
+    assert data_row_count(tmp_path / "second.xlsx") == 0
+
+
+def test_delta_requires_a_translation_memory(tmp_path):
+    with pytest.raises(SystemExit):
+        main.main(["xliff-to-excel", "fr.xlf", "--delta"])
+
+
+def test_reviewed_targets_prefill_empty_targets_of_later_exports(tmp_path):
+    translation_memory = main.TranslationMemory(str(tmp_path / "tm.sqlite"))
+    try:
+        rows = [("CustomLabel.A", 20, "char", "Save", "Enregistrer", None),
+                ("CustomLabel.B", 20, "char", "Close", None, None)]
+        with main.recording_translation_memory(translation_memory):
+            assert list(main.apply_translation_memory_to_rows(iter(rows), "fr", translation_memory)) == rows
+
+        units = [main.TransUnit("CustomLabel.A", "20", "char", "Save", "", ""),
+                 main.TransUnit("CustomLabel.B", "20", "char", "Close", "", ""),
+                 main.TransUnit("CustomLabel.C", "20", "char", "Save", "", "")]
+        with main.recording_translation_memory(translation_memory):
+            targets = [unit.target for unit in main.apply_translation_memory(iter(units), "fr", translation_memory)]
+        # Only the approved target of the same ID and source is used; an empty reviewed target isn't recorded
+        assert targets == ["Enregistrer", "", ""]
+    finally:
+        translation_memory.close()
+
+
+def test_failed_export_records_nothing(tmp_path):
+    translation_memory = main.TranslationMemory(str(tmp_path / "tm.sqlite"))
+    try:
+        units = [main.TransUnit("CustomLabel.A", "20", "char", "Save", "Enregistrer", "")]
+        with pytest.raises(OSError):
+            with main.recording_translation_memory(translation_memory):
+                list(main.apply_translation_memory(iter(units), "fr", translation_memory))
+                raise OSError("disk full")
+
+        assert translation_memory.lookup("fr", [("CustomLabel.A", main.content_hash("Save"))]) == {}
+    finally:
+        translation_memory.close()
@@ -0,0 +1,79 @@
+import json
+
+import openpyxl
+import pytest
+
+import main
+from samples import build_xliff, write_text
+
+
+clean_units = [
+    ("CustomLabel.Save", 10, "Save", "Sauver"),
+    ("CustomLabel.Exact", 5, "Close", "Fermé"),
+    ("CustomLabel.NoLimit", "", "Open", "Ouvrir le fichier maintenant"),
+]
+
+
+def run_validate(tmp_path, *xliff_files):
+    json_file = tmp_path / "validation.json"
+    report_file = tmp_path / "validation.xlsx"
+    exit_code = main.main(["validate", *xliff_files, "-w", "2", "--json", str(json_file), "-o", str(report_file)])
+    with open(json_file, encoding="utf-8") as f:
+        summary = json.load(f)
+    wb = openpyxl.load_workbook(report_file, read_only=True)
+    violations = list(wb["Violations"].iter_rows(min_row=2, values_only=True))
+    wb.close()
+    return exit_code, summary, violations
+
+
+def test_clean_file_exits_with_zero(tmp_path):
+    xliff_file = write_text(tmp_path / "fr.xlf", build_xliff(clean_units))
+
+    exit_code, summary, violations = run_validate(tmp_path, xliff_file)
+
+    assert exit_code == 0 == summary["exit_code"]
+    assert summary["languages"]["fr"]["units"] == 3
+    assert summary["languages"]["fr"]["fill_rate"] == 1.0
+    assert violations == []
+
+
+@pytest.mark.parametrize("unit, issue, exit_code", [
+    (("CustomLabel.Long", 5, "Close", "Fermer la fenêtre"), "Too Long", 3),
+    (("CustomLabel.Empty", 20, "New", ""), "Empty", 4),
+    (("CustomLabel.Missing", 20, "New", None), "Empty", 4),
+    (("CustomLabel.Placeholder", 20, "New", " &lt;&gt; "), "Placeholder", 4),
+])
+def test_each_issue_is_reported_with_its_exit_code(tmp_path, unit, issue, exit_code):
+    xliff_file = write_text(tmp_path / "fr.xlf", build_xliff(clean_units + [unit]))
+
+    actual_exit_code, summary, violations = run_validate(tmp_path, xliff_file)
+
+    assert actual_exit_code == exit_code == summary["exit_code"]
+    assert [(row[2], row[3]) for row in violations] == [(unit[0], issue)]
+
+
+def test_too_long_wins_over_untranslated_across_languages(tmp_path):
+    fr_file = write_text(tmp_path / "fr.xlf", build_xliff(clean_units + [("CustomLabel.Empty", 20, "New", "")]))
+    de_file = write_text(tmp_path / "de.xlf", build_xliff([("CustomLabel.Long", 3, "Close", "Schließen")], "de"))
+
+    exit_code, summary, _ = run_validate(tmp_path, fr_file, de_file)
+
+    assert exit_code == 3
+    assert summary["languages"]["fr"]["empty"] == 1
+    assert summary["languages"]["de"]["too_long"] == 1
+
+
+def test_byte_size_unit_counts_utf8_bytes(tmp_path):
+    xliff_file = write_text(tmp_path / "fr.xlf", build_xliff(clean_units).replace(
+        'id="CustomLabel.Exact" maxwidth="5" size-unit="char"', 'id="CustomLabel.Exact" maxwidth="5" size-unit="byte"'))
+
+    result = main.validate_xliff_file(xliff_file)
+
+    assert [(violation[0], violation[1], violation[4]) for violation in result["violations"]] == \
+        [("CustomLabel.Exact", "Too Long", 6)]
+
+
+def test_unreadable_file_exits_with_one(tmp_path):
+    xliff_file = write_text(tmp_path / "fr.xlf", "<xliff><file>")
+
+    assert main.main(["validate", xliff_file]) == 1
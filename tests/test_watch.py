@@ -0,0 +1,53 @@
+import os
+import threading
+import time
+
+import benchmark
+import main
+
+
+def wait_for(condition, timeout=60):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+def test_failed_task_is_retried_on_a_later_poll(tmp_path):
+    input_folder = tmp_path / "drop"
+    input_folder.mkdir()
+    output_folder = tmp_path / "processed"
+    output_folder.mkdir()
+    xliff_file = benchmark.generate_xliff(str(input_folder / "fr.xlf"), 50, "fr")
+    # A file where the Excel folder should be makes the conversion fail until it's removed
+    blocker = output_folder / "Excel"
+    blocker.write_text("")
+
+    watcher = main.FolderWatcher([str(input_folder)], str(output_folder), max_workers=1, settle_seconds=0.1,
+                                 poll_interval=0.05)
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    try:
+        wait_for(lambda: xliff_file in watcher.errors)
+        assert xliff_file not in watcher.processed
+
+        os.remove(blocker)
+        wait_for(lambda: xliff_file in watcher.processed)
+    finally:
+        watcher.stop()
+        thread.join()
+
+    assert watcher.errors == {}
+    assert os.path.exists(output_folder / "Excel" / "fr" / "Excel to xlf fr.xlsx")
+
+
+def test_once_reports_a_failed_task_instead_of_retrying(tmp_path):
+    input_folder = tmp_path / "drop"
+    input_folder.mkdir()
+    output_folder = tmp_path / "processed"
+    output_folder.mkdir()
+    benchmark.generate_xliff(str(input_folder / "fr.xlf"), 50, "fr")
+    (output_folder / "Excel").write_text("")
+
+    assert main.main(["watch", str(input_folder), "-o", str(output_folder), "--once", "--settle", "0.1",
+                      "--interval", "0.05", "-w", "1"]) == 1
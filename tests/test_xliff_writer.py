@@ -0,0 +1,60 @@
+from xml.dom import minidom
+from xml.etree import ElementTree as ET
+
+import pytest
+
+import main
+
+
+# The minidom pretty-print round trip that excel_to_xliff used before XliffWriter replaced it
+def minidom_xliff(rows, sheet_name):
+    root = ET.Element("xliff", version="1.2")
+    file_element = ET.SubElement(root, "file", original="Salesforce", **{"source-language": "en_US",
+                                                                         "target-language": sheet_name,
+                                                                         "translation-type": "metadata",
+                                                                         "datatype": "xml"})
+    body_element = ET.SubElement(file_element, "body")
+    seen_ids = set()
+    for row in rows:
+        id_value = str(row[0])
+        if id_value in seen_ids:
+            continue
+        seen_ids.add(id_value)
+        trans_unit_element = ET.SubElement(body_element, "trans-unit", id=id_value, maxwidth=str(row[1]),
+                                           size_unit=str(row[2]))
+        ET.SubElement(trans_unit_element, "source").text = str(row[3])
+        ET.SubElement(trans_unit_element, "target").text = str(row[4]) if row[4] else "<>"
+        if len(row) > 5 and row[5]:
+            ET.SubElement(trans_unit_element, "note").text = str(row[5])
+
+    xml_string = minidom.parseString(ET.tostring(root)).toprettyxml(indent="    ")
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + xml_string.split("\n", 1)[1]
+
+
+@pytest.mark.parametrize("rows", [
+    [],
+    [
+        ("CustomLabel.A", 40, "char", "Save & close", "Enregistrer & fermer", None),
+        ("CustomLabel.B", 10.5, "byte", 'Say "hi" <now>', None, "A note > with 'quotes'"),
+        ("CustomLabel.A", 40, "char", "Duplicate", "Doublon", None),
+        ("CustomLabel.C", None, None, "Line one\r\nline two\rline three", "<>", "  "),
+        ("CustomLabel.D", 5, "char", "Ünïcödé 取引先", "Ünïcödé 取引先", "ملاحظة"),
+        (42, 0, "char", 3.5, 0, None),
+    ],
+])
+def test_xliff_writer_matches_minidom_output(tmp_path, rows):
+    output_file_path = tmp_path / "fr_output.xlf"
+    main.sheet_rows_to_xliff(iter(rows), "fr", str(output_file_path))
+
+    with open(output_file_path, encoding="utf-8", newline="") as f:
+        assert f.read() == minidom_xliff(rows, "fr")
+
+
+def test_xliff_writer_rejects_characters_not_allowed_in_xml(tmp_path):
+    output_file_path = tmp_path / "fr_output.xlf"
+    with pytest.raises(ValueError):
+        main.sheet_rows_to_xliff(iter([("CustomLabel.A", 10, "char", "Bell \x07", "Cloche", None)]), "fr",
+                                 str(output_file_path))
+
+    # The partial file is removed
+    assert list(tmp_path.iterdir()) == []